@@ -1,13 +1,9 @@
 import streamlit as st
 import warnings
-import os
 from dotenv import load_dotenv
-from janai import JanAI
+from janai import configured_projects
 from utils import JanAIUtils as utils
 
-# Assuming janai is already imported or defined somewhere in your code
-import janai
-
 load_dotenv()
 
 # Suppress future warnings
@@ -21,7 +17,7 @@ def main():
 
     st.write("# JanAI")
 
-    projects = {key: value for key, value in os.environ.items() if key.startswith('PROJECT_')}
+    projects = configured_projects()
 
     # Initialize selected_project in session state if not present
     if 'selected_project' not in st.session_state:
@@ -37,6 +33,7 @@ def main():
             index=list(projects.keys()).index(st.session_state.selected_project) if st.session_state.selected_project in projects else 0,
             on_change=lambda: st.session_state.janai.set_project(projects[st.session_state.selected_project])
         )
+        all_projects = st.toggle("All projects", help="Scan every configured project concurrently and show one combined inventory")
     
     with col_clear_project:
         if st.button('⚠️ ☢️ Clear Project ☢️⚠️'):
@@ -57,11 +54,14 @@ def main():
     if selected_project != st.session_state.selected_project:
         st.session_state.janai.set_project(projects[selected_project])
         st.session_state.selected_project = selected_project
-        st.session_state.vector_stores = st.session_state.janai.list_vector_stores()
-        st.session_state.files = st.session_state.janai.list_files()
-        st.session_state.assistants = st.session_state.janai.list_assistants()
+        st.session_state.update(utils.load_inventory())
         st.session_state.update_grid = True
-        
+
+    if all_projects:
+        utils.display_all_projects(projects)
+        return
+
+    utils.display_unfinished_jobs()
         
     assistant_grid, vector_store_grid, file_grid = st.columns(3)
     
@@ -80,16 +80,13 @@ def main():
                     selected_rows = st.session_state.grid_response['selected_rows']
                     if not selected_rows.empty:
                         deleted_ids = [row['id'] for index, row in selected_rows.iterrows() if 'id' in row]
-                        for row_id in deleted_ids:
-                            st.session_state.janai.delete_assistant(row_id)
-                        st.write("Deleted Vector Store IDs:", deleted_ids)
-                        utils.refresh_assistants()
+                        utils.bulk_delete('assistants', deleted_ids, "Assistant")
                     else:
                         st.write("No rows selected for deletion.")
     
         with button_col2:
             if st.button('Reload Assistants'):
-                st.session_state.assistants = st.session_state.janai.list_assistants(order='asc', limit=100)
+                st.session_state.assistants = utils.load_assistants()
                 st.session_state.update_grid = True
                         
         
@@ -106,15 +103,12 @@ def main():
                 selected_rows = st.session_state.grid_response['selected_rows']
                 if not selected_rows.empty:
                     deleted_ids = [row['id'] for index, row in selected_rows.iterrows() if 'id' in row]
-                    for row_id in deleted_ids:
-                        st.session_state.janai.delete_vector_store(row_id)
-                    st.write("Deleted Vector Store IDs:", deleted_ids)
-                    utils.refresh_vector_stores()
+                    utils.bulk_delete('vector_stores', deleted_ids, "Vector Store")
                 else:
                     st.write("No rows selected for deletion.")
         with col2:
             if st.button('Reload Vector Stores'):
-                st.session_state.files = st.session_state.janai.list_vector_stores()
+                st.session_state.vector_stores = utils.load_vector_stores()
                 st.session_state.update_grid = True
 
     
@@ -131,18 +125,16 @@ def main():
                 selected_rows = st.session_state.grid_response['selected_rows']
                 if not selected_rows.empty:
                     deleted_ids = [row['id'] for index, row in selected_rows.iterrows() if 'id' in row]
-                    for row_id in deleted_ids:
-                        st.session_state.janai.delete_file(row_id)
-                    st.write("Deleted Vector Store IDs:", deleted_ids)
-                    utils.refresh_files()
+                    utils.bulk_delete('files', deleted_ids, "File")
                 else:
                     st.write("No rows selected for deletion.")
         
         with col2:
             if st.button('Reload Files'):
-                st.session_state.files = st.session_state.janai.list_files()
+                st.session_state.files = utils.load_files()
                 st.session_state.update_grid = True
     
 if __name__ == '__main__':
     main()
+    utils.finish_profile()
     
\ No newline at end of file
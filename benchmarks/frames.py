@@ -0,0 +1,118 @@
+"""
+Micro-benchmark for the display frame builders of the files and vector stores grids.
+
+Compares the original row-wise construction (`JanAIUtils.convert` per object, then `pd.to_datetime(...).strftime`
+and `bytes_to_readable` once per row) with the column-wise builders `JanAIUtils.files_frame` and
+`JanAIUtils.vector_stores_frame`, on synthetic SDK objects. Results are printed as JSON in rows per second.
+
+Usage:
+    python benchmarks/frames.py [--rows 50000] [--repeat 3] [--output frames.json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from openai.types import FileObject
+from openai.types.beta import VectorStore
+from utils import JanAIUtils
+
+
+def make_files(count):
+    now = int(time.time())
+    return [
+        FileObject.construct(
+            id=f"file-{i:024d}",
+            object="file",
+            bytes=random.randint(0, 512 * 1024 ** 2),
+            created_at=now - random.randint(0, 365 * 86400),
+            filename=f"document-{i}.pdf",
+            purpose="assistants",
+            status="processed",
+        )
+        for i in range(count)
+    ]
+
+
+def make_vector_stores(count):
+    now = int(time.time())
+    return [
+        VectorStore.construct(
+            id=f"vs_{i:024d}",
+            object="vector_store",
+            name=f"store-{i}",
+            usage_bytes=random.randint(0, 1024 ** 3),
+            created_at=now - random.randint(0, 365 * 86400),
+            last_active_at=now - random.randint(0, 30 * 86400),
+            status="completed",
+            file_counts={"cancelled": 0, "completed": 3, "failed": 0, "in_progress": 0, "total": 3},
+            metadata={},
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_files_frame(files):
+    files_converted = [JanAIUtils.convert(file) for file in files]
+    for file in files_converted:
+        if 'created_at' in file:
+            utc_datetime = pd.to_datetime(file['created_at'], unit='s', utc=True)
+            file['created_at'] = utc_datetime.strftime('%d/%m/%Y %H:%M') + " UTC"
+        if 'bytes' in file:
+            file['bytes'] = JanAIUtils.bytes_to_readable(file['bytes'])
+    return pd.DataFrame(files_converted)
+
+
+def legacy_vector_stores_frame(vector_stores):
+    vs_converted = [JanAIUtils.convert(vector_store) for vector_store in vector_stores]
+    for vector_store in vs_converted:
+        for key in ['created_at', 'last_active_at']:
+            if key in vector_store:
+                utc_datetime = pd.to_datetime(vector_store[key], unit='s', utc=True)
+                vector_store[key] = utc_datetime.strftime('%d/%m/%Y %H:%M') + " UTC"
+    return pd.DataFrame([JanAIUtils.convert(vector_store) for vector_store in vector_stores])
+
+
+def rows_per_second(builder, objects, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        builder(objects)
+        best = min(best, time.perf_counter() - start)
+    return round(len(objects) / best)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000, help="number of synthetic objects per grid")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per builder; the fastest is reported")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    random.seed(0)
+    files = make_files(args.rows)
+    vector_stores = make_vector_stores(args.rows)
+    report = {"rows": args.rows, "rows_per_second": {}}
+    for name, legacy, builder, objects in [
+        ("files", legacy_files_frame, JanAIUtils.files_frame, files),
+        ("vector_stores", legacy_vector_stores_frame, JanAIUtils.vector_stores_frame, vector_stores),
+    ]:
+        before = rows_per_second(legacy, objects, args.repeat)
+        after = rows_per_second(builder, objects, args.repeat)
+        report["rows_per_second"][name] = {"row_wise": before, "column_wise": after, "speedup": round(after / before, 1)}
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
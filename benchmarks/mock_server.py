@@ -0,0 +1,320 @@
+"""
+Local synthetic stand-in for the OpenAI endpoints JanAI uses, for benchmarking without API quota.
+
+Serves files (including content downloads and the multipart Uploads API), vector stores (with their files and file
+batches) and assistants under `/v1`, with cursor pagination, seeded with synthetic objects. Latency, 429 responses and
+the advertised request rate limit can be injected. Every vector store file batch completes immediately.
+
+Usage:
+    python benchmarks/mock_server.py [--port 0] [--files 10000] [--vector-stores 500] [--assistants 200]
+                                     [--latency-ms 20] [--jitter-ms 5] [--rate-429 0.01] [--rpm 10000]
+
+The server prints `listening on http://127.0.0.1:<port>/v1` once it accepts requests; point `OPENAI_BASE_URL` at it.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Object type and ID prefix of each collection
+PREFIXES = {"files": "file-", "vector_stores": "vs_", "assistants": "asst_", "uploads": "upload_", "batches": "vsfb_"}
+
+
+class MockState:
+    """
+    MockState holds the synthetic objects of the mock server. Collections are dictionaries in creation order, so
+    listings only need to be reversed for the default newest-first order.
+    """
+
+    def __init__(self, files=0, vector_stores=0, assistants=0, seed=0):
+        self.lock = threading.Lock()
+        self.random = random.Random(seed)
+        self.clock = int(time.time()) - files - vector_stores - assistants
+        self.files = {}
+        self.vector_stores = {}
+        self.vector_store_files = {}
+        self.assistants = {}
+        self.uploads = {}
+        self.batches = {}
+        for i in range(files):
+            self.add_file(f"document-{i}.pdf", self.random.randint(1024, 8 * 1024 ** 2), "assistants")
+        file_ids = list(self.files)
+        for i in range(vector_stores):
+            vector_store = self.add_vector_store(f"store-{i}")
+            # Half of the files are spread over the vector stores; the rest are orphans
+            members = file_ids[i:len(file_ids) // 2:vector_stores]
+            self.vector_store_files[vector_store["id"]] = dict.fromkeys(members)
+            vector_store["file_counts"]["completed"] = vector_store["file_counts"]["total"] = len(members)
+        vector_store_ids = list(self.vector_stores)
+        for i in range(assistants):
+            self.add_assistant({
+                "name": f"assistant-{i}",
+                "model": "gpt-4o-mini",
+                "instructions": "You are a helpful assistant.",
+                "tool_resources": {"file_search": {"vector_store_ids": vector_store_ids[i:i + 1] if i % 2 == 0 else []}},
+            })
+
+    def new_id(self, collection):
+        return PREFIXES[collection] + uuid.uuid4().hex[:24]
+
+    def tick(self):
+        self.clock += 1
+        return self.clock
+
+    def add_file(self, filename, size, purpose):
+        file = {
+            "id": self.new_id("files"), "object": "file", "bytes": size, "created_at": self.tick(),
+            "filename": filename, "purpose": purpose, "status": "processed",
+        }
+        self.files[file["id"]] = file
+        return file
+
+    def add_vector_store(self, name, metadata=None):
+        created_at = self.tick()
+        vector_store = {
+            "id": self.new_id("vector_stores"), "object": "vector_store", "created_at": created_at, "name": name,
+            "usage_bytes": 0, "status": "completed", "last_active_at": created_at, "metadata": metadata or {},
+            "file_counts": {"in_progress": 0, "completed": 0, "failed": 0, "cancelled": 0, "total": 0},
+        }
+        self.vector_stores[vector_store["id"]] = vector_store
+        self.vector_store_files[vector_store["id"]] = {}
+        return vector_store
+
+    def add_assistant(self, params):
+        assistant = {
+            "id": self.new_id("assistants"), "object": "assistant", "created_at": self.tick(),
+            "name": None, "description": None, "model": "gpt-4o-mini", "instructions": None, "tools": [],
+            "tool_resources": {}, "metadata": {}, "temperature": 1.0, "top_p": 1.0, "response_format": "auto",
+        }
+        assistant.update({key: value for key, value in params.items() if value is not None and key in assistant})
+        self.assistants[assistant["id"]] = assistant
+        return assistant
+
+
+def page(objects, query):
+    """
+    Returns one page of a collection in the list response format, honouring `limit`, `after` and `order`.
+    """
+    limit = min(int(query.get("limit", ["20"])[0]), 100)
+    ids = list(objects)
+    if query.get("order", ["desc"])[0] == "desc":
+        ids.reverse()
+    start = 0
+    after = query.get("after", [None])[0]
+    if after is not None:
+        start = ids.index(after) + 1 if after in objects else len(ids)
+    window = [objects[object_id] for object_id in ids[start:start + limit]]
+    return {
+        "object": "list", "data": window, "has_more": start + limit < len(ids),
+        "first_id": window[0]["id"] if window else None, "last_id": window[-1]["id"] if window else None,
+    }
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None
+    options = None
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        rpm = self.options.rpm
+        self.send_header("x-ratelimit-limit-requests", str(rpm))
+        self.send_header("x-ratelimit-remaining-requests", str(rpm - 1))
+        self.send_header("x-ratelimit-reset-requests", f"{60 / rpm:.3f}s")
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def not_found(self):
+        self.send_json(404, {"error": {"message": f"No such object: {self.path}", "type": "invalid_request_error", "code": None}})
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(length) if length else b""
+
+    def handle_request(self, method):
+        body = self.read_body()
+        options = self.options
+        delay = max(0.0, random.gauss(options.latency_ms, options.jitter_ms)) / 1000
+        if delay:
+            time.sleep(delay)
+        if random.random() < options.rate_429:
+            self.send_json(429, {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                           headers={"retry-after-ms": str(options.retry_after_ms)})
+            return
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part][1:]
+        query = parse_qs(url.query)
+        try:
+            with self.state.lock:
+                status, response = self.route(method, parts, query, body)
+        except (KeyError, ValueError):
+            self.not_found()
+            return
+        if status == 200 and isinstance(response, bytes):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(response)))
+            self.end_headers()
+            self.wfile.write(response)
+            return
+        self.send_json(status, response)
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def do_DELETE(self):
+        self.handle_request("DELETE")
+
+    def route(self, method, parts, query, body):
+        state = self.state
+        params = json.loads(body) if body and self.headers.get("Content-Type", "").startswith("application/json") else {}
+        match method, parts:
+            case "GET", ["files"]:
+                files = state.files
+                purpose = query.get("purpose", [None])[0]
+                if purpose:
+                    files = {file_id: file for file_id, file in files.items() if file["purpose"] == purpose}
+                return 200, page(files, query)
+            case "POST", ["files"]:
+                filename = re.search(rb'filename="([^"]*)"', body)
+                purpose = re.search(rb'name="purpose"\r\n\r\n([^\r]*)', body)
+                return 200, state.add_file(
+                    filename.group(1).decode() if filename else "upload", len(body),
+                    purpose.group(1).decode() if purpose else "assistants",
+                )
+            case "GET", ["files", file_id]:
+                return 200, state.files[file_id]
+            case "GET", ["files", file_id, "content"]:
+                file = state.files[file_id]
+                if file["purpose"] == "assistants":
+                    return 400, {"error": {"message": "Not allowed to download files of purpose: assistants", "type": "invalid_request_error", "code": None}}
+                return 200, bytes(min(file["bytes"], 1024 ** 2))
+            case "DELETE", ["files", file_id]:
+                del state.files[file_id]
+                for members in state.vector_store_files.values():
+                    members.pop(file_id, None)
+                return 200, {"id": file_id, "object": "file", "deleted": True}
+            case "POST", ["uploads"]:
+                upload = {
+                    "id": state.new_id("uploads"), "object": "upload", "bytes": params["bytes"], "created_at": state.tick(),
+                    "filename": params["filename"], "purpose": params["purpose"], "status": "pending",
+                    "expires_at": state.clock + 3600, "file": None, "parts": {},
+                }
+                state.uploads[upload["id"]] = upload
+                return 200, {key: value for key, value in upload.items() if key != "parts"}
+            case "POST", ["uploads", upload_id, "parts"]:
+                upload = state.uploads[upload_id]
+                part = {"id": "part_" + uuid.uuid4().hex[:24], "object": "upload.part", "created_at": state.tick(), "upload_id": upload_id}
+                upload["parts"][part["id"]] = len(body)
+                return 200, part
+            case "POST", ["uploads", upload_id, "complete"]:
+                upload = state.uploads[upload_id]
+                upload["status"] = "completed"
+                upload["file"] = state.add_file(upload["filename"], upload["bytes"], upload["purpose"])
+                return 200, {key: value for key, value in upload.items() if key != "parts"}
+            case "POST", ["uploads", upload_id, "cancel"]:
+                upload = state.uploads[upload_id]
+                upload["status"] = "cancelled"
+                return 200, {key: value for key, value in upload.items() if key != "parts"}
+            case "GET", ["vector_stores"]:
+                return 200, page(state.vector_stores, query)
+            case "POST", ["vector_stores"]:
+                return 200, state.add_vector_store(params.get("name"), params.get("metadata"))
+            case "GET", ["vector_stores", vector_store_id]:
+                return 200, state.vector_stores[vector_store_id]
+            case "DELETE", ["vector_stores", vector_store_id]:
+                del state.vector_stores[vector_store_id]
+                del state.vector_store_files[vector_store_id]
+                return 200, {"id": vector_store_id, "object": "vector_store.deleted", "deleted": True}
+            case "GET", ["vector_stores", vector_store_id, "files"]:
+                members = {
+                    file_id: {"id": file_id, "object": "vector_store.file", "usage_bytes": 0, "created_at": state.files[file_id]["created_at"],
+                              "vector_store_id": vector_store_id, "status": "completed", "last_error": None}
+                    for file_id in state.vector_store_files[vector_store_id] if file_id in state.files
+                }
+                return 200, page(members, query)
+            case "POST", ["vector_stores", vector_store_id, "file_batches"]:
+                vector_store = state.vector_stores[vector_store_id]
+                file_ids = params["file_ids"]
+                state.vector_store_files[vector_store_id].update(dict.fromkeys(file_ids))
+                vector_store["file_counts"]["completed"] += len(file_ids)
+                vector_store["file_counts"]["total"] += len(file_ids)
+                batch = {
+                    "id": state.new_id("batches"), "object": "vector_store.files_batch", "created_at": state.tick(),
+                    "vector_store_id": vector_store_id, "status": "completed",
+                    "file_counts": {"in_progress": 0, "completed": len(file_ids), "failed": 0, "cancelled": 0, "total": len(file_ids)},
+                }
+                state.batches[batch["id"]] = batch
+                return 200, batch
+            case "GET", ["vector_stores", vector_store_id, "file_batches", batch_id]:
+                return 200, state.batches[batch_id]
+            case "GET", ["assistants"]:
+                return 200, page(state.assistants, query)
+            case "POST", ["assistants"]:
+                return 200, state.add_assistant(params)
+            case "GET", ["assistants", assistant_id]:
+                return 200, state.assistants[assistant_id]
+            case "POST", ["assistants", assistant_id]:
+                state.assistants[assistant_id].update({key: value for key, value in params.items() if value is not None})
+                return 200, state.assistants[assistant_id]
+            case "DELETE", ["assistants", assistant_id]:
+                del state.assistants[assistant_id]
+                return 200, {"id": assistant_id, "object": "assistant.deleted", "deleted": True}
+        raise KeyError(parts)
+
+
+def serve(options):
+    """
+    Starts the mock server in a background thread and returns it; its URL is `http://127.0.0.1:<server_port>/v1`.
+    """
+    state = MockState(options.files, options.vector_stores, options.assistants, seed=options.seed)
+    handler = type("Handler", (MockHandler,), {"state": state, "options": options})
+    server = ThreadingHTTPServer(("127.0.0.1", options.port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=0, help="port to listen on (0 picks a free port)")
+    parser.add_argument("--files", type=int, default=10000, help="number of seeded files")
+    parser.add_argument("--vector-stores", type=int, default=500, help="number of seeded vector stores")
+    parser.add_argument("--assistants", type=int, default=200, help="number of seeded assistants")
+    parser.add_argument("--latency-ms", type=float, default=20, help="mean injected latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=5, help="standard deviation of the injected latency")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests answered with a 429")
+    parser.add_argument("--retry-after-ms", type=int, default=50, help="retry-after-ms of injected 429s")
+    parser.add_argument("--rpm", type=int, default=100000, help="requests per minute advertised in rate limit headers")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic objects")
+    return parser
+
+
+def main():
+    options = parser().parse_args()
+    server = serve(options)
+    print(f"listening on http://127.0.0.1:{server.server_port}/v1", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+End-to-end benchmark suite for JanAI against a local synthetic stand-in for the OpenAI API.
+
+Starts `benchmarks/mock_server.py` in a separate process (so the server does not compete with the client for the GIL),
+seeded with the given object counts, injected latency and 429 rate, and drives JanAI against it:
+
+- listing every file, vector store and assistant page by page, and all three concurrently (`list_inventory`);
+- building the grid frames of the listed objects (`JanAIUtils.files_frame`, `vector_stores_frame`, `assistants_frame`);
+- uploading small files into a vector store (`ingest_files`) and one large file in parts (`upload_file`);
+- bulk deleting files (`bulk_delete_files`).
+
+Each stage reports its wall time and throughput, and the report ends with the per-operation API call counts, errors
+and p50/p90/p99 latencies recorded by `metrics.Metrics`. The JSON report can be compared across commits.
+
+Usage:
+    python benchmarks/run.py [--files 10000] [--vector-stores 500] [--assistants 200] [--latency-ms 20]
+                             [--rate-429 0.01] [--uploads 200] [--multipart-mb 64] [--deletes 2000]
+                             [--output bench.json]
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def start_server(args):
+    """
+    Starts the mock server and returns the process and its base URL.
+    """
+    command = [
+        sys.executable, os.path.join(ROOT, "benchmarks", "mock_server.py"),
+        "--files", str(args.files), "--vector-stores", str(args.vector_stores), "--assistants", str(args.assistants),
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms), "--rate-429", str(args.rate_429),
+        "--rpm", str(args.rpm),
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("listening on "):
+        process.kill()
+        raise RuntimeError("the mock server did not start")
+    return process, line.split()[-1]
+
+
+def stage(report, name, count, run):
+    """
+    Runs one benchmark stage, recording its wall time and throughput in objects per second.
+    """
+    start = time.perf_counter()
+    result = run()
+    seconds = time.perf_counter() - start
+    report["stages"][name] = {"objects": count(result), "seconds": round(seconds, 3), "per_second": round(count(result) / seconds, 1)}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=10000, help="number of files seeded in the mock")
+    parser.add_argument("--vector-stores", type=int, default=500, help="number of vector stores seeded in the mock")
+    parser.add_argument("--assistants", type=int, default=200, help="number of assistants seeded in the mock")
+    parser.add_argument("--latency-ms", type=float, default=20, help="mean latency the mock injects per request")
+    parser.add_argument("--jitter-ms", type=float, default=5, help="standard deviation of the injected latency")
+    parser.add_argument("--rate-429", type=float, default=0.01, help="fraction of requests the mock rejects with a 429")
+    parser.add_argument("--rpm", type=int, default=100000, help="request rate limit the mock advertises per minute")
+    parser.add_argument("--page-size", type=int, default=None, help="objects per list page (default: c.PAGE_SIZE)")
+    parser.add_argument("--uploads", type=int, default=200, help="number of small files to ingest into a vector store")
+    parser.add_argument("--upload-kb", type=int, default=16, help="size of each small file in KB")
+    parser.add_argument("--multipart-mb", type=int, default=64, help="size of the multipart upload in MB (0 to skip)")
+    parser.add_argument("--deletes", type=int, default=2000, help="number of files to bulk delete")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    process, base_url = start_server(args)
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "mock")
+    try:
+        import constants as c
+        from janai import JanAI
+        from metrics import Metrics
+        from utils import JanAIUtils
+
+        page_size = args.page_size or c.PAGE_SIZE
+        janai = JanAI()
+        report = {"config": {key: value for key, value in vars(args).items() if key != "output"}, "stages": {}}
+
+        files = stage(report, "list_files", len, lambda: janai.list_files(page_size=page_size))
+        vector_stores = stage(report, "list_vector_stores", len, lambda: janai.list_vector_stores(page_size=page_size))
+        assistants = stage(report, "list_assistants", len, lambda: list(janai.iter_assistants(page_size=page_size)))
+        stage(report, "list_inventory", lambda inventory: sum(map(len, inventory.values())), janai.list_inventory)
+
+        stage(report, "files_frame", len, lambda: JanAIUtils.files_frame(files))
+        stage(report, "vector_stores_frame", len, lambda: JanAIUtils.vector_stores_frame(vector_stores))
+        stage(report, "assistants_frame", len, lambda: JanAIUtils.assistants_frame(assistants))
+
+        if args.uploads:
+            vector_store = janai.create_vector_store("benchmark")
+            uploads = []
+            for i in range(args.uploads):
+                upload = io.BytesIO(os.urandom(args.upload_kb * 1024))
+                upload.name = f"upload-{i}.txt"
+                uploads.append(upload)
+            stage(report, "ingest_files", lambda result: len(result["files"]), lambda: janai.ingest_files(uploads, vector_store.id))
+        if args.multipart_mb:
+            large = io.BytesIO(os.urandom(args.multipart_mb * 1024 ** 2))
+            large.name = "large.bin"
+            stage(report, "upload_file_mb", lambda _: args.multipart_mb, lambda: janai.upload_file(large))
+
+        file_ids = [file.id for file in files[:args.deletes]]
+        stage(report, "bulk_delete_files", lambda result: len(result["deleted"]), lambda: janai.bulk_delete_files(file_ids))
+
+        report["api"] = [
+            {key: series[key] for key in ("operation", "calls", "errors", "mean_seconds", "p50_seconds", "p90_seconds", "p99_seconds")}
+            for series in Metrics.snapshot()
+        ]
+    finally:
+        process.terminate()
+        process.wait()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
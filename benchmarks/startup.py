@@ -0,0 +1,93 @@
+"""
+Startup-time benchmark for the JanAI app.
+
+Reports the cold import cost of the app modules and their heavy dependencies, each measured in a fresh interpreter,
+and the time of the first full render of a page through Streamlit's `AppTest` harness. Results are printed as JSON
+so they can be compared across commits.
+
+Usage:
+    python benchmarks/startup.py [--repeat 5] [--page Home.py] [--output startup.json]
+
+The first render talks to whatever API `OPENAI_API_KEY` / `OPENAI_BASE_URL` point to; without a key it measures
+the render up to the missing-key error.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules whose import cost is reported, app modules last
+MODULES = ["streamlit", "pandas", "st_aggrid", "openai", "constants", "inventory", "janai", "utils"]
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+RENDER_SNIPPET = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({page!r}, default_timeout={timeout})
+app.run()
+print(time.perf_counter() - start)
+"""
+
+
+def run_python(snippet):
+    """
+    Runs a snippet in a fresh interpreter from the repository root and returns the float it prints.
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", snippet], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 1),
+        "min_ms": round(min(samples) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="number of fresh interpreters per measurement")
+    parser.add_argument("--page", default="Home.py", help="page to render for the first-render measurement")
+    parser.add_argument("--timeout", type=float, default=60, help="first-render timeout in seconds")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    report = {"imports": {}, "first_render": None}
+    for module in MODULES:
+        try:
+            samples = [run_python(IMPORT_SNIPPET.format(module=module)) for _ in range(args.repeat)]
+        except subprocess.CalledProcessError as e:
+            report["imports"][module] = {"error": e.stderr.strip().splitlines()[-1]}
+            continue
+        report["imports"][module] = summarize(samples)
+
+    try:
+        samples = [run_python(RENDER_SNIPPET.format(page=args.page, timeout=args.timeout)) for _ in range(args.repeat)]
+        report["first_render"] = {"page": args.page, **summarize(samples)}
+    except subprocess.CalledProcessError as e:
+        report["first_render"] = {"page": args.page, "error": e.stderr.strip().splitlines()[-1]}
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,8 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
 # Column widths
 COL_WIDTHS = {
     'id': 70,
@@ -5,3 +10,96 @@ COL_WIDTHS = {
     'bytes': 20,
     'datetime': 40,
 }
+
+# Number of objects requested per page when listing (the API maximum is 100)
+PAGE_SIZE = 100
+
+# Maximum number of concurrent requests used by the bulk delete operations; the request scheduler lowers the effective
+# concurrency when the API throttles
+BULK_DELETE_WORKERS = 32
+
+# Directory for JanAI's local data (inventory cache, journals, ...)
+DATA_DIR = os.environ.get("JANAI_DATA_DIR", ".janai")
+
+# SQLite file holding the local inventory of files, vector stores and assistants
+CACHE_PATH = os.environ.get("JANAI_CACHE_PATH", os.path.join(DATA_DIR, "inventory.sqlite3"))
+
+# Seconds between full listings that reconcile the local inventory with deletions made elsewhere
+RECONCILE_INTERVAL = int(os.environ.get("JANAI_RECONCILE_INTERVAL", 3600))
+
+# Maximum number of concurrent listings when scanning every configured project
+SCAN_CONCURRENCY = int(os.environ.get("JANAI_SCAN_CONCURRENCY", 12))
+
+# Connection limits of the HTTP transport shared by every project's OpenAI client
+HTTP_MAX_CONNECTIONS = int(os.environ.get("JANAI_HTTP_MAX_CONNECTIONS", 64))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("JANAI_HTTP_MAX_KEEPALIVE_CONNECTIONS", 32))
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("JANAI_HTTP_KEEPALIVE_EXPIRY", 60))
+
+# Grids with more rows than this are paged in Python and only the visible window is sent to the browser
+GRID_PAGE_THRESHOLD = int(os.environ.get("JANAI_GRID_PAGE_THRESHOLD", 1000))
+GRID_PAGE_SIZES = [100, 250, 500, 1000]
+
+# Prefix of the hidden frame columns holding the raw values a formatted column is sorted by
+SORT_COLUMN_PREFIX = "_sort_"
+
+# Size of the chunks read when hashing uploaded files
+HASH_CHUNK_SIZE = 1024 ** 2
+
+# Files larger than this are uploaded in parts through the Uploads API instead of in a single request
+MULTIPART_THRESHOLD = int(os.environ.get("JANAI_MULTIPART_THRESHOLD", 32 * 1024 ** 2))
+
+# Size of each part of a multipart upload (the API maximum is 64 MB) and number of parts sent concurrently;
+# at most UPLOAD_PART_SIZE * UPLOAD_WORKERS bytes of a file are held in memory at once
+UPLOAD_PART_SIZE = int(os.environ.get("JANAI_UPLOAD_PART_SIZE", 8 * 1024 ** 2))
+UPLOAD_WORKERS = int(os.environ.get("JANAI_UPLOAD_WORKERS", 4))
+
+# Maximum number of concurrent uploads when ingesting many files into a vector store, and files per file batch
+# (the API maximum is 500)
+INGEST_WORKERS = int(os.environ.get("JANAI_INGEST_WORKERS", 8))
+FILE_BATCH_SIZE = 500
+
+# Seconds between status polls of vector store file batches, doubling up to the maximum while batches are in progress
+POLL_INTERVAL = 1.0
+POLL_MAX_INTERVAL = 30.0
+
+# Adaptive request scheduling per project: starting and maximum number of requests in flight, retries of transient
+# errors, and the base and cap in seconds of the jittered exponential backoff between retries
+SCHEDULER_INITIAL_CONCURRENCY = int(os.environ.get("JANAI_SCHEDULER_INITIAL_CONCURRENCY", 8))
+SCHEDULER_MAX_CONCURRENCY = int(os.environ.get("JANAI_SCHEDULER_MAX_CONCURRENCY", HTTP_MAX_CONNECTIONS))
+SCHEDULER_MAX_RETRIES = int(os.environ.get("JANAI_SCHEDULER_MAX_RETRIES", 6))
+SCHEDULER_BACKOFF_BASE = 0.5
+SCHEDULER_BACKOFF_MAX = 30.0
+
+# Directory of the journals of resumable bulk jobs
+JOBS_DIR = os.environ.get("JANAI_JOBS_DIR", os.path.join(DATA_DIR, "jobs"))
+
+# A running job refreshes its marker at most every JOB_HEARTBEAT_INTERVAL seconds, and is taken for dead (and offered
+# for resuming) once its marker is older than JOB_HEARTBEAT_TIMEOUT seconds
+JOB_HEARTBEAT_INTERVAL = 5.0
+JOB_HEARTBEAT_TIMEOUT = float(os.environ.get("JANAI_JOB_HEARTBEAT_TIMEOUT", 60))
+
+# Periodic export of the API call metrics: a file path or an http(s) URL to POST to (disabled when empty), the
+# format ("prometheus" or "json") and the seconds between exports
+METRICS_EXPORT = os.environ.get("JANAI_METRICS_EXPORT", "")
+METRICS_FORMAT = os.environ.get("JANAI_METRICS_FORMAT", "prometheus")
+METRICS_EXPORT_INTERVAL = float(os.environ.get("JANAI_METRICS_EXPORT_INTERVAL", 15))
+
+# Rerun profiling of the Streamlit pages: "1" times the stages of every rerun (it can also be switched on from the
+# sidebar), "cprofile" also runs cProfile and keeps the dumps of the slowest reruns in PROFILE_DIR
+PROFILE = os.environ.get("JANAI_PROFILE", "")
+PROFILE_DIR = os.environ.get("JANAI_PROFILE_DIR", os.path.join(DATA_DIR, "profiles"))
+PROFILE_HISTORY = 20
+PROFILE_KEEP_SLOWEST = 5
+
+# Background refresh of the inventory: whether it starts switched on (it can also be switched on from the sidebar), the
+# seconds between incremental syncs of a project, the seconds between full listings (which also pick up objects changed
+# or deleted elsewhere), the seconds between checks of a session for published changes, and the seconds after which a
+# worker without any session checking for changes stops
+AUTO_REFRESH = os.environ.get("JANAI_AUTO_REFRESH", "") not in ("", "0")
+REFRESH_INTERVAL = float(os.environ.get("JANAI_REFRESH_INTERVAL", 60))
+REFRESH_RECONCILE_INTERVAL = float(os.environ.get("JANAI_REFRESH_RECONCILE_INTERVAL", 600))
+REFRESH_DRAIN_INTERVAL = 5
+REFRESH_IDLE_TIMEOUT = 300
+
+# Seconds an inventory listed by one session is reused by every other session of the process
+SHARED_INVENTORY_TTL = float(os.environ.get("JANAI_SHARED_INVENTORY_TTL", 120))
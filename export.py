@@ -0,0 +1,110 @@
+"""
+Command-line inventory export for JanAI.
+
+Streams the assistants, vector stores and files of one or all configured projects as NDJSON or CSV, writing each page of
+objects as soon as it arrives, so output starts immediately and memory stays flat however large the inventory is.
+
+Usage:
+    python export.py [--project PROJECT_ONE | --all-projects] [--kinds files,vector_stores] [--format ndjson|csv]
+                     [--output inventory.ndjson]
+
+`--project` takes the name of a `PROJECT_*` variable from `.env` or a project ID; without it the key's default project
+is exported. NDJSON lines hold the full API object with its `project` and `kind`; CSV rows hold the common columns below.
+"""
+import argparse
+import csv
+import json
+import sys
+import constants as c
+from inventory import KINDS
+from janai import JanAI, configured_projects
+
+# Columns of the CSV export, shared by every kind
+CSV_COLUMNS = ["project", "kind", "id", "name", "purpose", "bytes", "status", "model", "created_at", "last_active_at"]
+
+
+def csv_row(project, kind, obj):
+    """
+    Returns the CSV columns of one object.
+    """
+    return {
+        "project": project,
+        "kind": kind,
+        "id": obj.id,
+        "name": obj.filename if kind == "files" else obj.name,
+        "purpose": getattr(obj, "purpose", None),
+        "bytes": obj.bytes if kind == "files" else getattr(obj, "usage_bytes", None),
+        "status": getattr(obj, "status", None),
+        "model": getattr(obj, "model", None),
+        "created_at": obj.created_at,
+        "last_active_at": getattr(obj, "last_active_at", None),
+    }
+
+
+def export(out, projects, kinds=KINDS, fmt="ndjson"):
+    """
+    Streams the objects of the given projects and kinds to a text stream.
+
+    Args:
+        out: The text stream to write to.
+        projects (dict): The project IDs to export, keyed by the name written in the `project` column.
+        kinds (iterable, optional): The kinds to export. Defaults to all three.
+        fmt (str, optional): "ndjson" or "csv". Defaults to "ndjson".
+
+    Returns:
+        int: The number of objects written.
+    """
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+    janai = JanAI()
+    count = 0
+    for name, project in projects.items():
+        janai.set_project(project)
+        for kind in kinds:
+            for obj in getattr(janai, f"iter_{kind}")():
+                if writer is not None:
+                    writer.writerow(csv_row(name, kind, obj))
+                else:
+                    out.write(json.dumps({"project": name, "kind": kind, **obj.to_dict()}) + "\n")
+                count += 1
+                if count % c.PAGE_SIZE == 0:
+                    out.flush()
+    out.flush()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--project", help="PROJECT_* variable name or project ID to export")
+    target.add_argument("--all-projects", action="store_true", help="export every PROJECT_* project from .env")
+    parser.add_argument("--kinds", default=",".join(KINDS), help="comma-separated kinds to export (default: all)")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson", help="output format (default: ndjson)")
+    parser.add_argument("--output", help="write to this file instead of stdout")
+    args = parser.parse_args()
+
+    kinds = [kind.strip() for kind in args.kinds.split(",") if kind.strip()]
+    unknown = set(kinds) - set(KINDS)
+    if unknown:
+        parser.error(f"unknown kinds: {', '.join(sorted(unknown))}")
+    if args.all_projects:
+        projects = configured_projects()
+        if not projects:
+            parser.error("no PROJECT_* variables are configured")
+    elif args.project:
+        projects = {args.project: configured_projects().get(args.project, args.project)}
+    else:
+        projects = {"default": None}
+
+    if args.output:
+        with open(args.output, "w", newline="") as out:
+            count = export(out, projects, kinds, args.format)
+    else:
+        count = export(sys.stdout, projects, kinds, args.format)
+    print(f"# exported {count} objects", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import constants as c
+from records import RECORD_TYPES
+
+# The object kinds held in the inventory, in the order the app loads them
+KINDS = ("assistants", "vector_stores", "files")
+
+
+class InventoryCache:
+    """
+    InventoryCache is a local on-disk copy of the assistants, vector stores and files of every project, stored in
+    SQLite. Each object is kept as the JSON returned by the API, next to its `created_at` timestamp so that
+    incremental syncs only need to fetch objects newer than the newest one already known. A per-project,
+    per-kind sync marker records when the inventory was last synced and when it was last fully reconciled
+    against the API (which is the only way to notice objects deleted elsewhere).
+
+    The cache is safe to share between threads and Streamlit sessions.
+
+    Attributes:
+        path (str): The path of the SQLite database file.
+    """
+
+    def __init__(self, path=c.CACHE_PATH):
+        """
+        Opens (and creates, if needed) the inventory database.
+
+        Args:
+            path (str): The path of the SQLite database file. Defaults to c.CACHE_PATH.
+        """
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS objects ("
+                "project TEXT NOT NULL, kind TEXT NOT NULL, id TEXT NOT NULL, created_at INTEGER, data TEXT NOT NULL, "
+                "PRIMARY KEY (project, kind, id))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS objects_created_at ON objects (project, kind, created_at)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state ("
+                "project TEXT NOT NULL, kind TEXT NOT NULL, last_synced REAL, last_reconciled REAL, "
+                "PRIMARY KEY (project, kind))"
+            )
+            # SHA-256 of each file's content; NULL marks a file whose content cannot be downloaded to be hashed
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS file_hashes ("
+                "project TEXT NOT NULL, file_id TEXT NOT NULL, purpose TEXT, sha256 TEXT, "
+                "PRIMARY KEY (project, file_id))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS file_hashes_sha256 ON file_hashes (project, sha256)")
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._conn.close()
+
+    def load(self, project, kind):
+        """
+        Reads the cached objects of one kind for a project.
+
+        Args:
+            project (str): The project ID, or None for the default project.
+            kind (str): One of "assistants", "vector_stores" or "files".
+
+        Returns:
+            list: The cached objects as compact records (see `records.py`), assistants oldest first and the other
+            kinds newest first (matching the order the app lists them from the API).
+        """
+        order = "ASC" if kind == "assistants" else "DESC"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM objects WHERE project = ? AND kind = ? ORDER BY created_at {order}, id {order}",
+                (project or "", kind),
+            ).fetchall()
+        record_type = RECORD_TYPES[kind]
+        return [record_type.from_dict(json.loads(data)) for (data,) in rows]
+
+    def newest_created_at(self, project, kind):
+        """
+        Returns the newest `created_at` timestamp cached for one kind of a project, or None if nothing is cached.
+        """
+        with self._lock:
+            (newest,) = self._conn.execute(
+                "SELECT MAX(created_at) FROM objects WHERE project = ? AND kind = ?", (project or "", kind)
+            ).fetchone()
+        return newest
+
+    def upsert(self, project, kind, objects):
+        """
+        Inserts or replaces objects of one kind for a project.
+
+        Args:
+            project (str): The project ID, or None for the default project.
+            kind (str): One of "assistants", "vector_stores" or "files".
+            objects (iterable): The SDK objects to store.
+        """
+        rows = [(project or "", kind, obj.id, obj.created_at, json.dumps(obj.to_dict())) for obj in objects]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO objects (project, kind, id, created_at, data) VALUES (?, ?, ?, ?, ?)", rows
+            )
+
+    def delete(self, project, kind, ids):
+        """
+        Removes objects of one kind for a project by ID.
+        """
+        ids = list(ids)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM objects WHERE project = ? AND kind = ? AND id = ?",
+                [(project or "", kind, object_id) for object_id in ids],
+            )
+            if kind == "files":
+                self._conn.executemany(
+                    "DELETE FROM file_hashes WHERE project = ? AND file_id = ?",
+                    [(project or "", object_id) for object_id in ids],
+                )
+
+    def replace(self, project, kind, objects):
+        """
+        Replaces every cached object of one kind for a project with a complete listing from the API, dropping
+        cached objects that no longer exist. The replacement is a single transaction, so concurrent readers see either
+        the old or the new objects, never an empty kind.
+
+        Args:
+            project (str): The project ID, or None for the default project.
+            kind (str): One of "assistants", "vector_stores" or "files".
+            objects (list): The complete listing of SDK objects.
+        """
+        rows = [(project or "", kind, obj.id, obj.created_at, json.dumps(obj.to_dict())) for obj in objects]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM objects WHERE project = ? AND kind = ?", (project or "", kind))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO objects (project, kind, id, created_at, data) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            if kind == "files":
+                self._conn.execute(
+                    "DELETE FROM file_hashes WHERE project = ? AND file_id NOT IN "
+                    "(SELECT id FROM objects WHERE project = ? AND kind = 'files')",
+                    (project or "", project or ""),
+                )
+
+    def sync_state(self, project, kind):
+        """
+        Returns the `(last_synced, last_reconciled)` epoch timestamps for one kind of a project, or None if it
+        has never been synced.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT last_synced, last_reconciled FROM sync_state WHERE project = ? AND kind = ?",
+                (project or "", kind),
+            ).fetchone()
+
+    def needs_reconcile(self, project, kind):
+        """
+        Returns True if one kind of a project has never been synced, or was last fully reconciled more than
+        c.RECONCILE_INTERVAL seconds ago.
+        """
+        state = self.sync_state(project, kind)
+        return state is None or state[1] is None or time.time() - state[1] > c.RECONCILE_INTERVAL
+
+    def mark_synced(self, project, kind, reconciled=False):
+        """
+        Records that one kind of a project has just been synced.
+
+        Args:
+            project (str): The project ID, or None for the default project.
+            kind (str): One of "assistants", "vector_stores" or "files".
+            reconciled (bool): Whether the sync was a complete listing rather than an incremental one.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sync_state (project, kind, last_synced, last_reconciled) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (project, kind) DO UPDATE SET last_synced = excluded.last_synced, "
+                "last_reconciled = COALESCE(excluded.last_reconciled, sync_state.last_reconciled)",
+                (project or "", kind, now, now if reconciled else None),
+            )
+
+    def remember_hash(self, project, file_id, purpose, sha256):
+        """
+        Records the SHA-256 of a file's content, or None if the content cannot be downloaded to be hashed.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO file_hashes (project, file_id, purpose, sha256) VALUES (?, ?, ?, ?)",
+                (project or "", file_id, purpose, sha256),
+            )
+
+    def find_by_hash(self, project, sha256, purpose):
+        """
+        Returns the ID of the oldest known file of a project with the given content and purpose, or None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT h.file_id FROM file_hashes h JOIN objects o "
+                "ON o.project = h.project AND o.kind = 'files' AND o.id = h.file_id "
+                "WHERE h.project = ? AND h.sha256 = ? AND h.purpose = ? ORDER BY o.created_at, o.id LIMIT 1",
+                (project or "", sha256, purpose),
+            ).fetchone()
+        return row[0] if row else None
+
+    def unhashed_files(self, project):
+        """
+        Returns the cached files of a project that have no entry in the hash index yet, as records.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT o.data FROM objects o LEFT JOIN file_hashes h ON h.project = o.project AND h.file_id = o.id "
+                "WHERE o.project = ? AND o.kind = 'files' AND h.file_id IS NULL ORDER BY o.created_at, o.id",
+                (project or "",),
+            ).fetchall()
+        record_type = RECORD_TYPES["files"]
+        return [record_type.from_dict(json.loads(data)) for (data,) in rows]
+
+    def duplicate_files(self, project):
+        """
+        Groups the cached files of a project that could be collapsed into one. Files are grouped by content hash where
+        it is known, and otherwise (files never hashed, or whose content cannot be downloaded) by identical filename,
+        size and purpose, which is only a likely match.
+
+        Args:
+            project (str): The project ID, or None for the default project.
+
+        Returns:
+            list: One dictionary per group of two or more files, with the "match" ("content" or "name_and_size"),
+            the shared "sha256" (None for likely matches), and the group's "files" as records, oldest first. Groups are
+            sorted by the bytes that collapsing them would free, largest first.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT o.data, h.sha256 FROM objects o LEFT JOIN file_hashes h ON h.project = o.project AND h.file_id = o.id "
+                "WHERE o.project = ? AND o.kind = 'files' ORDER BY o.created_at, o.id",
+                (project or "",),
+            ).fetchall()
+        record_type = RECORD_TYPES["files"]
+        groups = {}
+        for data, sha256 in rows:
+            file = record_type.from_dict(json.loads(data))
+            key = ("content", sha256, file.purpose) if sha256 else ("name_and_size", file.filename, file.bytes, file.purpose)
+            groups.setdefault(key, []).append(file)
+        duplicates = [
+            {"match": key[0], "sha256": key[1] if key[0] == "content" else None, "files": files}
+            for key, files in groups.items() if len(files) > 1
+        ]
+        duplicates.sort(key=lambda group: sum(file.bytes or 0 for file in group["files"][1:]), reverse=True)
+        return duplicates
+
+
+class _Flight:
+    """
+    A fetch in progress, which callers asking for the same inventory wait on instead of fetching it again.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.abandoned = False
+
+
+def _copy_error(error):
+    """
+    Returns a copy of an exception with its own traceback, so a failure shared by several threads is raised as a
+    separate object in each of them. Exception constructors vary, so the copy is made without calling `__init__`.
+    """
+    clone = type(error).__new__(type(error))
+    clone.__dict__.update(vars(error))
+    clone.args = error.args
+    return clone
+
+
+class SharedInventory:
+    """
+    SharedInventory is the process-wide in-memory copy of each project's inventory, shared by every Streamlit session,
+    so sessions opening the same project reuse one listing instead of each syncing it.
+
+    Entries are keyed by project and kind and expire after c.SHARED_INVENTORY_TTL seconds. Fetches are single-flight:
+    while one caller fetches an inventory, every other caller asking for it waits for that fetch and gets its result
+    (or a copy of its error). A fetch interrupted by anything other than an error (e.g. Streamlit stopping or rerunning
+    the leader's script) is abandoned, and its waiting callers retry, one of them leading a new fetch. Any mutation of a project invalidates the affected kinds (see `invalidate`), and a fetch that was in
+    flight when the invalidation happened is not stored, so later callers never see an inventory older than their
+    own changes.
+
+    The cached values are shared between sessions and must not be modified.
+    """
+    _lock = threading.Lock()
+    _entries = {}
+    _flights = {}
+    _generations = {}
+
+    @classmethod
+    def get(cls, project, kinds, fetch, ttl=None, force=False):
+        """
+        Returns the inventory of a project, fetching only the kinds that are not cached.
+
+        Args:
+            project (str): The project ID, or None for the default project.
+            kinds (iterable): The kinds to return.
+            fetch (callable): Called as `fetch(kinds)` with the tuple of kinds to fetch; returns their values keyed by
+                kind.
+            ttl (float, optional): The maximum age in seconds of a cached kind. Defaults to c.SHARED_INVENTORY_TTL.
+            force (bool, optional): Ignore cached kinds and fetch them again, unless a fetch is already in flight.
+                Defaults to False.
+
+        Returns:
+            dict: The value of each requested kind.
+        """
+        ttl = c.SHARED_INVENTORY_TTL if ttl is None else ttl
+        result, waiting, leading = {}, {}, []
+        with cls._lock:
+            now = time.monotonic()
+            for kind in kinds:
+                key = (project, kind)
+                entry = cls._entries.get(key)
+                if key in cls._flights:
+                    waiting[kind] = cls._flights[key]
+                elif not force and entry is not None and now - entry[0] < ttl:
+                    result[kind] = entry[1]
+                else:
+                    leading.append(kind)
+            flight = _Flight() if leading else None
+            for kind in leading:
+                cls._flights[(project, kind)] = flight
+
+        if flight is not None:
+            try:
+                flight.result = fetch(tuple(leading))
+            except Exception as e:
+                flight.error = e
+                raise
+            except BaseException:
+                flight.abandoned = True
+                raise
+            finally:
+                with cls._lock:
+                    for kind in leading:
+                        # An invalidation while the fetch was in flight detached it; its result may predate the change
+                        if cls._flights.get((project, kind)) is flight:
+                            del cls._flights[(project, kind)]
+                            if flight.error is None and not flight.abandoned:
+                                cls._entries[(project, kind)] = (time.monotonic(), flight.result[kind])
+                flight.done.set()
+            result.update({kind: flight.result[kind] for kind in leading})
+
+        retry = []
+        for kind, other in waiting.items():
+            other.done.wait()
+            if other.abandoned:
+                retry.append(kind)
+            elif other.error is not None:
+                raise _copy_error(other.error) from other.error
+            else:
+                result[kind] = other.result[kind]
+        if retry:
+            result.update(cls.get(project, retry, fetch, ttl=ttl, force=force))
+        return result
+
+    @classmethod
+    def generation(cls, project):
+        """
+        Returns a number that changes whenever the project is invalidated, to be read before listing it for `put`.
+        """
+        with cls._lock:
+            return cls._generations.get(project, 0)
+
+    @classmethod
+    def put(cls, project, kind, value, generation=None):
+        """
+        Stores a freshly listed inventory, e.g. from a background refresh, unless a fetch of it is in flight or the
+        project was invalidated since `generation` was read.
+        """
+        with cls._lock:
+            if generation is not None and cls._generations.get(project, 0) != generation:
+                return
+            if (project, kind) not in cls._flights:
+                cls._entries[(project, kind)] = (time.monotonic(), value)
+
+    @classmethod
+    def invalidate(cls, project, kinds=KINDS):
+        """
+        Drops the cached inventory of some kinds of a project after a mutation, and detaches fetches of them in flight
+        so their results are not stored.
+        """
+        with cls._lock:
+            cls._generations[project] = cls._generations.get(project, 0) + 1
+            for kind in kinds:
+                cls._entries.pop((project, kind), None)
+                cls._flights.pop((project, kind), None)
@@ -1,6 +1,19 @@
-from openai import OpenAI
+import asyncio
+import functools
+import hashlib
+import inspect
+import mimetypes
 import os
+import queue
+import random
+import threading
+import time
 from dotenv import load_dotenv
+import constants as c
+from inventory import KINDS, SharedInventory
+from metrics import Metrics, metered_transport
+import profiler
+from scheduler import RequestScheduler
 
 load_dotenv()
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
@@ -8,26 +21,286 @@ OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 model = "gpt-4o-mini"
 project = None
 
-class JanAI:
+
+def configured_projects():
     """
-    JanAI is a class that provides an interface to various OpenAI API functionalities, including managing files,
-    vector stores, and assistants. It allows for operations such as listing, creating, retrieving, and deleting
-    files and vector stores, as well as managing assistants by listing, creating, updating, and deleting them.
+    Returns the projects configured in the environment as `PROJECT_<NAME>=<project id>` variables.
+    
+    Returns:
+        dict: The project IDs keyed by their environment variable name.
+    """
+    return {key: value for key, value in os.environ.items() if key.startswith('PROJECT_')}
+
+
+def upload_size(file):
+    """
+    Returns the number of bytes left to read in a seekable file-like object, or None for anything else (raw bytes,
+    paths, `(filename, content)` tuples, unseekable streams).
+    """
+    if not (hasattr(file, "read") and hasattr(file, "seek") and hasattr(file, "tell")):
+        return None
+    try:
+        position = file.tell()
+        size = file.seek(0, os.SEEK_END) - position
+        file.seek(position)
+    except (OSError, ValueError):
+        return None
+    return size
+
+
+def upload_parts(file, part_size=c.UPLOAD_PART_SIZE):
+    """
+    Reads a file-like object in parts of at most `part_size` bytes, yielding `(index, data)` pairs, and hashes the
+    content as it goes.
+
+    Args:
+        file: The file-like object, read from its current position.
+        part_size (int, optional): The size of each part in bytes. Defaults to c.UPLOAD_PART_SIZE.
+
+    Yields:
+        tuple: The zero-based part index and the part's bytes. Once the generator is exhausted, the MD5 digest of the
+        whole content is available as the generator's return value.
+    """
+    md5 = hashlib.md5()
+    index = 0
+    while True:
+        data = file.read(part_size)
+        if not data:
+            return md5.hexdigest()
+        md5.update(data)
+        yield index, data
+        index += 1
+
+
+def content_hash(file, chunk_size=c.HASH_CHUNK_SIZE):
+    """
+    Returns the SHA-256 hex digest of a file-like object's content from its current position, reading it in chunks
+    and restoring the position afterwards.
+    """
+    position = file.tell()
+    sha256 = hashlib.sha256()
+    for chunk in iter(lambda: file.read(chunk_size), b""):
+        sha256.update(chunk)
+    file.seek(position)
+    return sha256.hexdigest()
+
+
+class ClientPool:
+    """
+    ClientPool is a process-wide registry of OpenAI clients keyed by project. Every client shares one HTTP transport
+    with tuned keep-alive and connection limits, so switching projects (or switching back) reuses warm connections
+    and TLS sessions instead of paying a new handshake per project.
+    
+    The transports feed every response's rate limit headers to the project's `RequestScheduler` and count the bytes
+    of every request and response in `Metrics`, and the clients do not retry on their own (`max_retries=0`): JanAI
+    sends every request through the scheduler, which owns retries.
+    
+    Async work from synchronous callers (the `JanAI` wrappers around `AsyncJanAI`) runs on one process-wide event loop
+    in a background thread (see `run`), with one shared async transport, so it also reuses warm connections instead of
+    building a transport inside a new `asyncio.run` every time.
+    
+    The `openai` and `httpx` modules are imported, and clients are built, on the first API call rather than at
+    import time, which keeps app startup fast and lets the app start without an API key.
+    """
+    _lock = threading.Lock()
+    _http_client = None
+    _clients = {}
+    _loop = None
+    _async_http_client = None
+    _async_clients = {}
+
+    @staticmethod
+    def limits():
+        """
+        Returns the connection limits used for every pooled HTTP transport.
+        """
+        import httpx
+
+        return httpx.Limits(
+            max_connections=c.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=c.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=c.HTTP_KEEPALIVE_EXPIRY,
+        )
+
+    @classmethod
+    def get(cls, project=None):
+        """
+        Returns the shared OpenAI client for a project, creating it on first use.
+        
+        Args:
+            project (str, optional): The project ID, or None for the default project. Defaults to None.
+            
+        Returns:
+            OpenAI: The client for the project.
+        """
+        from openai import OpenAI, DefaultHttpxClient
+
+        with cls._lock:
+            if cls._http_client is None:
+                cls._http_client = DefaultHttpxClient(transport=metered_transport(cls.limits()), event_hooks={"response": [RequestScheduler.observe]})
+            if project not in cls._clients:
+                cls._clients[project] = OpenAI(project=project, http_client=cls._http_client, max_retries=0)
+            return cls._clients[project]
+
+    @staticmethod
+    def async_http_client():
+        """
+        Returns a new async HTTP transport with the pooled connection limits, for callers running their own event loop.
+        Async transports are bound to the event loop they are used on; coroutines run through `run` share the one of
+        the pool's loop instead (see `shared_async_http_client`).
+        """
+        from openai import DefaultAsyncHttpxClient
+
+        return DefaultAsyncHttpxClient(transport=metered_transport(ClientPool.limits(), asynchronous=True), event_hooks={"response": [RequestScheduler.async_observe]})
+
+    @classmethod
+    def loop(cls):
+        """
+        Returns the process-wide event loop that `run` runs coroutines on, starting its thread on first use.
+        """
+        with cls._lock:
+            if cls._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="janai-async", daemon=True).start()
+                cls._loop = loop
+            return cls._loop
+
+    @classmethod
+    def shared_async_http_client(cls):
+        """
+        Returns the async HTTP transport of the pool's event loop, creating it on first use. It must only be used by
+        coroutines run through `run`, and is never closed.
+        """
+        with cls._lock:
+            if cls._async_http_client is None:
+                cls._async_http_client = cls.async_http_client()
+            return cls._async_http_client
+
+    @classmethod
+    def run(cls, coroutine_function, callback=None):
+        """
+        Runs a coroutine on the pool's event loop and waits for its result.
+
+        The coroutine is built as `coroutine_function(relay)`. When `callback` is given, `relay` takes the same
+        arguments and hands each call over to the calling thread, which makes it while it waits (Streamlit elements can
+        only be written from the script thread); otherwise `relay` is None. If the caller is interrupted while waiting,
+        the coroutine is cancelled.
+
+        Args:
+            coroutine_function (callable): Called on the calling thread with the relay, returns the coroutine to run.
+            callback (callable, optional): The function the relay calls on the calling thread. Defaults to None.
+
+        Returns:
+            The result of the coroutine.
+        """
+        calls = queue.SimpleQueue()
+        relay = None if callback is None else (lambda *args: calls.put(args))
+        future = asyncio.run_coroutine_threadsafe(coroutine_function(relay), cls.loop())
+        future.add_done_callback(lambda _: calls.put(None))
+        try:
+            while (args := calls.get()) is not None:
+                callback(*args)
+        except BaseException:
+            future.cancel()
+            raise
+        return future.result()
+
+    @classmethod
+    def iterate(cls, iterable_function):
+        """
+        Iterates from the calling thread over an async iterable run on the pool's event loop.
+
+        The iterable, built as `iterable_function()`, is consumed on the loop as fast as it yields and its items are
+        handed over to the calling thread. It is cancelled if the caller stops iterating early.
+
+        Args:
+            iterable_function (callable): Returns the async iterable to consume, e.g. an `AsyncJanAI.iter_*` listing.
+
+        Yields:
+            The items of the iterable, in order.
+        """
+        items = queue.SimpleQueue()
+        end = object()
+
+        async def consume():
+            try:
+                async for item in iterable_function():
+                    items.put(item)
+            finally:
+                items.put(end)
+
+        future = asyncio.run_coroutine_threadsafe(consume(), cls.loop())
+        try:
+            while (item := items.get()) is not end:
+                yield item
+            future.result()
+        finally:
+            future.cancel()
+
+    @classmethod
+    def get_async(cls, project=None, http_client=None):
+        """
+        Returns an AsyncOpenAI client for a project on the given async HTTP transport: the shared client of the project
+        on the pool's loop transport (see `shared_async_http_client`), or a new one on any other transport.
+        """
+        from openai import AsyncOpenAI
+
+        if http_client is None or http_client is not cls._async_http_client:
+            return AsyncOpenAI(project=project, http_client=http_client, max_retries=0)
+        with cls._lock:
+            if project not in cls._async_clients:
+                cls._async_clients[project] = AsyncOpenAI(project=project, http_client=http_client, max_retries=0)
+            return cls._async_clients[project]
+
+
+class AsyncJanAI:
+    """
+    AsyncJanAI implements the API of JanAI on `AsyncOpenAI`, as coroutines (and async generators for the `iter_*`
+    listings), so independent requests can be awaited concurrently. JanAI wraps these methods for synchronous
+    callers.
+    
+    Reads and writes of the local inventory (SQLite queries and JSON encoding) run in worker threads through
+    `asyncio.to_thread`, so they never stall the event loop, which JanAI shares between every session.
     
     Attributes:
         model (str): The model name to be used for the assistant operations.
+        project (str): The project ID used for the OpenAI API operations, or None for the default project.
+        inventory (InventoryCache): The local inventory kept in step with every mutation, or None.
     """
-    client = OpenAI()
     
-    def __init__(self, model: str = model):
+    def __init__(self, model: str = model, project=project, inventory=None, http_client=None):
         """
-        Initializes the JanAI class with a specific model.
+        Initializes the AsyncJanAI class with a specific model and project.
         
         Args:
-            model (str): The model name to be used for the assistant operations. Defaults to "gpt-4o".
+            model (str): The model name to be used for the assistant operations. Defaults to "gpt-4o-mini".
+            project (str, optional): The project ID to be used for the OpenAI API operations. Defaults to None.
+            inventory (InventoryCache, optional): A local inventory to keep in step with every mutation and to
+                sync from in `sync_inventory`. Defaults to None.
+            http_client (httpx.AsyncClient, optional): An HTTP transport shared with other AsyncJanAI instances on
+                the same event loop. The caller remains responsible for closing it. Defaults to None (a transport
+                owned by this instance).
         """
         self.model = model
-        
+        self.project = project
+        self.inventory = inventory
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or ClientPool.async_http_client()
+        self.client = ClientPool.get_async(project, http_client=self._http_client)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the underlying HTTP connections, unless the transport is shared.
+        """
+        if self._owns_http_client:
+            await self.client.close()
+
     def set_project(self, project):
         """
         Sets the project to be used for OpenAI API operations.
@@ -36,37 +309,351 @@ class JanAI:
             project: The project ID or name to be used for the OpenAI API operations.
         """
         self.project = project
-        self.client = OpenAI(project=project)
+        self.client = ClientPool.get_async(project, http_client=self._http_client)
+
+    async def _paginate(self, list_method, page_size=c.PAGE_SIZE, max_items=None, **params):
+        """
+        Walks every page of a cursor-paginated list endpoint, yielding objects as each page arrives.
         
+        Args:
+            list_method: The SDK list method to call, e.g. `self.client.files.list`.
+            page_size (int, optional): The number of objects to request per page. Defaults to c.PAGE_SIZE.
+            max_items (int, optional): Stop after yielding this many objects. Defaults to None (no limit).
+            **params: Extra query parameters passed to every page request (e.g. `order`, `after`).
+            
+        Yields:
+            The objects of each page, in the order returned by the API.
+        """
+        params = {key: value for key, value in params.items() if value is not None}
+        count = 0
+        while True:
+            page = await self._call(list_method, limit=page_size, **params)
+            for item in page.data:
+                yield item
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
+            if not page.data or getattr(page, "has_more", None) is False or not page.has_next_page():
+                return
+            params["after"] = page.data[-1].id
 
-    def list_files(self):
+    def iter_files(self, page_size=c.PAGE_SIZE, max_items=None, **params):
+        """
+        Lazily iterates over all files in the OpenAI account, following the `after` cursor page by page.
+        
+        Args:
+            page_size (int, optional): The number of files to request per page. Defaults to c.PAGE_SIZE.
+            max_items (int, optional): The maximum number of files to yield. Defaults to None (all files).
+            **params: Extra query parameters for the list endpoint (e.g. `purpose`, `order`).
+            
+        Yields:
+            The files available in the OpenAI account.
+        """
+        return self._paginate(self.client.files.list, page_size=page_size, max_items=max_items, **params)
+
+    async def list_files(self, page_size=c.PAGE_SIZE, max_items=None, **params):
         """
         Lists all files available in the OpenAI account.
         
+        Args:
+            page_size (int, optional): The number of files to request per page. Defaults to c.PAGE_SIZE.
+            max_items (int, optional): The maximum number of files to return. Defaults to None (all files).
+            **params: Extra query parameters for the list endpoint (e.g. `purpose`, `order`).
+        
         Returns:
             list: A list of files available in the OpenAI account.
         """
-        files_response = self.client.files.list()  
-        file_list = []
-        for file in files_response.data:
-            file_list.append(file)
-        return file_list
+        return [file async for file in self.iter_files(page_size=page_size, max_items=max_items, **params)]
 
-    def create_file(self, file, purpose="assistants"):
+    async def create_file(self, file, purpose="assistants", on_progress=None, dedup=True):
         """
-        Creates a new file in the OpenAI account.
+        Creates a new file in the OpenAI account. File-like objects larger than c.MULTIPART_THRESHOLD bytes are sent
+        in parts through `upload_file`.
+        
+        With a local inventory, the SHA-256 of a file-like object's content is looked up in the project's hash index
+        first: if a file with the same content and purpose already exists, it is returned instead of being uploaded
+        again. The hash of every uploaded file is added to the index.
         
         Args:
             file: The file content or a file-like object to be uploaded.
             purpose (str): The purpose of the file. Defaults to "assistants".
+            on_progress (callable, optional): Called as `on_progress(sent_bytes, total_bytes)` after each part of a
+                multipart upload. Defaults to None.
+            dedup (bool, optional): Whether to return an existing file with identical content. Defaults to True.
+            
+        Returns:
+            The response from the file creation API call, or the existing file with identical content.
+        """
+        size = upload_size(file)
+        sha256 = content_hash(file) if size is not None and self.inventory is not None else None
+        if sha256 is not None and dedup:
+            existing = await self._find_duplicate(sha256, purpose)
+            if existing is not None:
+                return existing
+        if size is not None and size > c.MULTIPART_THRESHOLD:
+            created = await self.upload_file(file, purpose=purpose, on_progress=on_progress)
+        else:
+            created = await self._call(self.client.files.create, file=file, purpose=purpose)
+            await self._remember("files", created)
+        if sha256 is not None:
+            await asyncio.to_thread(self.inventory.remember_hash, self.project, created.id, purpose, sha256)
+        return created
+
+    async def _find_duplicate(self, sha256, purpose):
+        """
+        Returns the existing file with the given content hash and purpose, or None. Index entries of files deleted
+        elsewhere are dropped.
+        """
+        from openai import NotFoundError
+
+        file_id = await asyncio.to_thread(self.inventory.find_by_hash, self.project, sha256, purpose)
+        if file_id is None:
+            return None
+        try:
+            return await self._call(self.client.files.retrieve, file_id)
+        except NotFoundError:
+            await self._forget("files", file_id)
+            return None
+
+    async def _download_hash(self, file):
+        """
+        Streams a file's content from the API and returns its SHA-256, or None if the content cannot be downloaded
+        (the API does not serve the content of files uploaded for assistants).
+        """
+        from openai import BadRequestError
+
+        async def download():
+            sha256 = hashlib.sha256()
+            async with RequestScheduler.for_project(self.project).slot():
+                async with self.client.files.with_streaming_response.content(file.id) as response:
+                    async for chunk in response.iter_bytes(c.HASH_CHUNK_SIZE):
+                        sha256.update(chunk)
+            return sha256.hexdigest()
+
+        try:
+            return await Metrics.async_track(self.client.files.content, self.project, download)
+        except BadRequestError:
+            return None
+
+    async def backfill_file_hashes(self, max_workers=c.BULK_DELETE_WORKERS, on_progress=None):
+        """
+        Adds the files of the local inventory that are not in the hash index yet, streaming their content from the API
+        to hash it. Files whose content cannot be downloaded are recorded as such, so they are not retried.
+        
+        Args:
+            max_workers (int, optional): The maximum number of downloads in flight. Defaults to c.BULK_DELETE_WORKERS.
+            on_progress (callable, optional): Called as `on_progress(done, total)` after each file. Defaults to None.
             
         Returns:
-            The response from the file creation API call.
+            dict: The "hashed" file IDs, the "unavailable" IDs whose content cannot be downloaded, and the "failed"
+            IDs with their error messages.
         """
-        returnedFile = self.client.files.create(file=file, purpose=purpose)
-        return returnedFile
+        files = await asyncio.to_thread(self.inventory.unhashed_files, self.project)
+        result = {"hashed": [], "unavailable": [], "failed": {}}
+        if not files:
+            return result
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+        done = 0
+
+        async def download(file):
+            nonlocal done
+            async with semaphore:
+                try:
+                    sha256 = await self._download_hash(file)
+                except Exception as e:
+                    result["failed"][file.id] = str(e)
+                else:
+                    await asyncio.to_thread(self.inventory.remember_hash, self.project, file.id, file.purpose, sha256)
+                    result["hashed" if sha256 else "unavailable"].append(file.id)
+            done += 1
+            if on_progress is not None:
+                on_progress(done, len(files))
 
-    def retrieve_file(self, file_id):
+        await asyncio.gather(*(download(file) for file in files))
+        return result
+
+    async def duplicate_files(self):
+        """
+        Returns the groups of files of the current project that could be collapsed into one, as reported by
+        `InventoryCache.duplicate_files`.
+        """
+        return await asyncio.to_thread(self.inventory.duplicate_files, self.project)
+
+    async def ingest_files(self, files, vector_store_id, purpose="assistants", max_workers=c.INGEST_WORKERS,
+                           batch_size=c.FILE_BATCH_SIZE, timeout=None, on_progress=None):
+        """
+        Uploads many files and attaches them to a vector store. Files are uploaded concurrently, with at most
+        `max_workers` uploads in flight (through `create_file`, so identical content is reused and large files are
+        sent in parts), and every `batch_size` uploaded files are attached as one vector store file batch while the
+        remaining uploads continue. All batches are then polled together, with an interval that backs off from
+        c.POLL_INTERVAL to c.POLL_MAX_INTERVAL, until each one has finished. A batch that cannot be created, or whose
+        status can no longer be retrieved, does not stop the ingest: its file IDs are recorded as failed to attach and
+        the other batches carry on.
+        
+        Args:
+            files (iterable): The file-like objects to upload.
+            vector_store_id (str): The unique identifier of the vector store to attach the files to.
+            purpose (str, optional): The purpose of the uploaded files. Defaults to "assistants".
+            max_workers (int, optional): The maximum number of uploads or status requests in flight.
+                Defaults to c.INGEST_WORKERS.
+            batch_size (int, optional): The number of files per file batch (the API maximum is 500).
+                Defaults to c.FILE_BATCH_SIZE.
+            timeout (float, optional): The number of seconds after which to stop polling and return the batches as
+                they are. Defaults to None (poll until every batch has finished).
+            on_progress (callable, optional): Called with a dictionary of aggregate counts ("total", "uploaded",
+                "upload_failed", "attach_failed", and the "completed", "failed", "in_progress" and "cancelled" file
+                counts of the batches) whenever they change. Defaults to None.
+            
+        Returns:
+            dict: The uploaded "files", the "failed" uploads as a list of `(filename, error message)` pairs in input
+            order (uploads can share a filename), the
+            uploaded files that could not be attached as "attach_failed", a dictionary from file ID to error message,
+            and the file "batches" in their last polled state.
+        """
+        files = list(files)
+        result = {"files": [], "failed": [], "attach_failed": {}, "batches": []}
+        counts = {"total": len(files), "uploaded": 0, "upload_failed": 0, "attach_failed": 0, "completed": 0, "failed": 0, "in_progress": 0, "cancelled": 0}
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+        pending_ids = []
+        batch_file_ids = {}
+        abandoned = set()
+        upload_failed = {}
+
+        def report():
+            if on_progress is not None:
+                batch_counts = [batch.file_counts for batch in result["batches"]]
+                for status in ("completed", "failed", "in_progress", "cancelled"):
+                    counts[status] = sum(getattr(file_counts, status) for file_counts in batch_counts)
+                counts["attach_failed"] = len(result["attach_failed"])
+                on_progress(dict(counts))
+
+        def attach_failed(file_ids, error):
+            for file_id in file_ids:
+                result["attach_failed"][file_id] = error
+
+        async def attach(file_ids):
+            try:
+                batch = await self._call(self.client.beta.vector_stores.file_batches.create, vector_store_id, file_ids=file_ids)
+            except Exception as e:
+                attach_failed(file_ids, str(e))
+                return
+            batch_file_ids[batch.id] = list(file_ids)
+            result["batches"].append(batch)
+
+        async def upload(index, file):
+            async with semaphore:
+                try:
+                    return index, file, await self.create_file(file, purpose=purpose), None
+                except Exception as e:
+                    return index, file, None, str(e)
+
+        for future in asyncio.as_completed([upload(index, file) for index, file in enumerate(files)]):
+            index, file, created, error = await future
+            if error is not None:
+                upload_failed[index] = (getattr(file, "name", repr(file)), error)
+                counts["upload_failed"] += 1
+            else:
+                result["files"].append(created)
+                pending_ids.append(created.id)
+                counts["uploaded"] += 1
+            if len(pending_ids) >= batch_size:
+                await attach(pending_ids[:batch_size])
+                del pending_ids[:batch_size]
+            report()
+        if pending_ids:
+            await attach(pending_ids)
+            report()
+        result["failed"] = [upload_failed[index] for index in sorted(upload_failed)]
+
+        def polled(batch):
+            return batch.status == "in_progress" and batch.id not in abandoned
+
+        async def refresh(batch):
+            if not polled(batch):
+                return batch
+            async with semaphore:
+                try:
+                    return await self._call(self.client.beta.vector_stores.file_batches.retrieve, batch.id, vector_store_id=vector_store_id)
+                except Exception as e:
+                    abandoned.add(batch.id)
+                    attach_failed(batch_file_ids[batch.id], str(e))
+                    return batch
+
+        interval = c.POLL_INTERVAL
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while any(polled(batch) for batch in result["batches"]):
+            if deadline is not None and time.monotonic() + interval > deadline:
+                break
+            await asyncio.sleep(interval * random.uniform(0.8, 1.2))
+            result["batches"] = list(await asyncio.gather(*(refresh(batch) for batch in result["batches"])))
+            report()
+            interval = min(interval * 2, c.POLL_MAX_INTERVAL)
+        return result
+
+    async def upload_file(self, file, purpose="assistants", filename=None, mime_type=None, part_size=c.UPLOAD_PART_SIZE,
+                          max_workers=c.UPLOAD_WORKERS, on_progress=None):
+        """
+        Uploads a large file through the Uploads API: the upload is created, the file is read in parts that are sent
+        concurrently, and the upload is completed with the part IDs in order, which creates the file. Parts are read
+        only when a worker is free to send them, so at most `part_size * max_workers` bytes are held in memory. The
+        upload is cancelled if any part fails.
+        
+        Args:
+            file: A seekable file-like object, uploaded from its current position.
+            purpose (str): The purpose of the file. Defaults to "assistants".
+            filename (str, optional): The name of the created file. Defaults to the file object's `name`.
+            mime_type (str, optional): The MIME type of the file. Defaults to a guess from the filename.
+            part_size (int, optional): The size of each part in bytes (the API maximum is 64 MB).
+                Defaults to c.UPLOAD_PART_SIZE.
+            max_workers (int, optional): The maximum number of parts in flight. Defaults to c.UPLOAD_WORKERS.
+            on_progress (callable, optional): Called as `on_progress(sent_bytes, total_bytes)` after each part.
+                Defaults to None.
+            
+        Returns:
+            The created file object.
+        """
+        filename = filename or os.path.basename(getattr(file, "name", None) or "upload")
+        mime_type = mime_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        total = upload_size(file)
+        upload = await self._call(self.client.uploads.create, bytes=total, filename=filename, mime_type=mime_type, purpose=purpose)
+
+        slots = asyncio.Semaphore(max(1, max_workers))
+        sent = 0
+
+        async def send(data):
+            nonlocal sent
+            try:
+                part = await self._call(self.client.uploads.parts.create, upload.id, data=data)
+            finally:
+                slots.release()
+            sent += len(data)
+            if on_progress is not None:
+                on_progress(sent, total)
+            return part.id
+
+        tasks = []
+        try:
+            parts = upload_parts(file, part_size=part_size)
+            while True:
+                await slots.acquire()
+                try:
+                    _, data = next(parts)
+                except StopIteration as done:
+                    slots.release()
+                    md5 = done.value
+                    break
+                tasks.append(asyncio.create_task(send(data)))
+            part_ids = await asyncio.gather(*tasks)
+            upload = await self._call(self.client.uploads.complete, upload.id, part_ids=part_ids, md5=md5)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await self._call(self.client.uploads.cancel, upload.id)
+            raise
+        await self._remember("files", upload.file)
+        return upload.file
+
+    async def retrieve_file(self, file_id):
         """
         Retrieves a specific file by its ID.
         
@@ -76,32 +663,51 @@ class JanAI:
         Returns:
             The file object as returned by the OpenAI API.
         """
-        file = self.client.files.retrieve(file_id)
-        return file
+        return await self._call(self.client.files.retrieve, file_id)
 
-    def delete_file(self, file_id):
+    async def delete_file(self, file_id):
         """
         Deletes a specific file by its ID.
         
         Args:
             file_id: The unique identifier of the file to delete.
+            
+        Returns:
+            The ID of the deleted file.
+        """
+        await self._call(self.client.files.delete, file_id)
+        await self._forget("files", file_id)
+        return file_id
+
+    def iter_vector_stores(self, page_size=c.PAGE_SIZE, max_items=None, **params):
         """
-        self.client.files.delete(file_id)
+        Lazily iterates over all vector stores in the OpenAI account, following the `after` cursor page by page.
         
-    def list_vector_stores(self):
+        Args:
+            page_size (int, optional): The number of vector stores to request per page. Defaults to c.PAGE_SIZE.
+            max_items (int, optional): The maximum number of vector stores to yield. Defaults to None (all vector stores).
+            **params: Extra query parameters for the list endpoint (e.g. `order`).
+            
+        Yields:
+            The vector stores available in the OpenAI account.
+        """
+        return self._paginate(self.client.beta.vector_stores.list, page_size=page_size, max_items=max_items, **params)
+
+    async def list_vector_stores(self, page_size=c.PAGE_SIZE, max_items=None, **params):
         """
         Lists all vector stores available in the OpenAI account.
         
+        Args:
+            page_size (int, optional): The number of vector stores to request per page. Defaults to c.PAGE_SIZE.
+            max_items (int, optional): The maximum number of vector stores to return. Defaults to None (all vector stores).
+            **params: Extra query parameters for the list endpoint (e.g. `order`).
+        
         Returns:
             list: A list of vector stores available in the OpenAI account.
         """
-        vector_stores = self.client.beta.vector_stores.list()
-        vs_list = []
-        for vector_store in vector_stores.data:
-            vs_list.append(vector_store)
-        return vs_list
+        return [vector_store async for vector_store in self.iter_vector_stores(page_size=page_size, max_items=max_items, **params)]
 
-    def create_vector_store(self, name, metadata=None):
+    async def create_vector_store(self, name, metadata=None):
         """
         Creates a new vector store in the OpenAI account.
         
@@ -112,38 +718,86 @@ class JanAI:
         Returns:
             The response from the vector store creation API call.
         """
-        vector_store = self.client.beta.vector_stores.create(name=name, metadata=metadata)
+        vector_store = await self._call(self.client.beta.vector_stores.create, name=name, metadata=metadata)
+        await self._remember("vector_stores", vector_store)
         return vector_store
 
-    def delete_vector_store(self, vector_store_id):
+    async def delete_vector_store(self, vector_store_id):
         """
         Deletes a specific vector store by its ID.
         
         Args:
             vector_store_id: The unique identifier of the vector store to delete.
+            
+        Returns:
+            The ID of the deleted vector store.
         """
-        self.client.beta.vector_stores.delete(vector_store_id)
-    
-    def list_assistants(self, limit=None, order=None, after=None, before=None):
+        await self._call(self.client.beta.vector_stores.delete, vector_store_id)
+        await self._forget("vector_stores", vector_store_id)
+        return vector_store_id
+
+    def iter_vector_store_files(self, vector_store_id, page_size=c.PAGE_SIZE, max_items=None, **params):
+        """
+        Lazily lists the files attached to a vector store, fetching one page at a time.
+        
+        Args:
+            vector_store_id: The unique identifier of the vector store.
+            page_size (int, optional): The number of files to request per page. Defaults to c.PAGE_SIZE.
+            max_items (int, optional): The maximum number of files to return. Defaults to None (all files).
+            **params: Additional list parameters, e.g. `filter="completed"`.
+            
+        Returns:
+            Iterator of vector store file objects, whose `id` is the ID of the attached file.
+        """
+        return self._paginate(self.client.beta.vector_stores.files.list, page_size=page_size, max_items=max_items,
+                              vector_store_id=vector_store_id, **params)
+
+    def iter_assistants(self, page_size=c.PAGE_SIZE, max_items=None, **params):
+        """
+        Lazily iterates over all assistants in the OpenAI account, following the `after` cursor page by page.
+        
+        Args:
+            page_size (int, optional): The number of assistants to request per page. Defaults to c.PAGE_SIZE.
+            max_items (int, optional): The maximum number of assistants to yield. Defaults to None (all assistants).
+            **params: Extra query parameters for the list endpoint (e.g. `order`, `after`).
+            
+        Yields:
+            The assistants available in the OpenAI account.
+        """
+        return self._paginate(self.client.beta.assistants.list, page_size=page_size, max_items=max_items, **params)
+
+    async def list_assistants(self, limit=None, order=None, after=None, before=None):
         """
         Lists all assistants available in the OpenAI account.
         
         Args:
-            limit (int, optional): The maximum number of assistants to return. Defaults to None.
+            limit (int, optional): The number of assistants to request per page. Defaults to None (c.PAGE_SIZE).
             order (str, optional): The order in which to return the assistants. Defaults to None.
             after (str, optional): A pagination token to retrieve the next set of assistants. Defaults to None.
-            before (str, optional): A pagination token to retrieve the previous set of assistants. Defaults to None.
+            before (str, optional): A pagination token to retrieve the previous set of assistants. Only the
+                single page before this token is returned. Defaults to None.
             
         Returns:
             list: A list of assistants available in the OpenAI account.
         """
-        assistants = self.client.beta.assistants.list(limit=limit, order=order, after=after, before=before)
-        assistant_list = []
-        for assistant in assistants.data:
-            assistant_list.append(assistant)
-        return assistant_list
-    
-    def create_assistant(self, model, name=None, description=None, instructions=None, tools=None, tool_resources=None, temperature=1.0, top_p=1.0, metadata=None, response_format=None):
+        if before is not None:
+            assistants = await self._call(self.client.beta.assistants.list, limit=limit, order=order, after=after, before=before)
+            return list(assistants.data)
+        return [assistant async for assistant in self.iter_assistants(page_size=limit or c.PAGE_SIZE, order=order, after=after)]
+
+    async def retrieve_assistant(self, assistant_id):
+        """
+        Retrieves a specific assistant by its ID.
+        
+        Args:
+            assistant_id: The unique identifier of the assistant to retrieve.
+            
+        Returns:
+            The assistant object as returned by the OpenAI API.
+        """
+        return await self._call(self.client.beta.assistants.retrieve, assistant_id)
+
+    async def create_assistant(self, model, name=None, description=None, instructions=None, tools=None, tool_resources=None, temperature=1.0, top_p=1.0, metadata=None, response_format=None):
         """
         Creates a new assistant in the OpenAI account.
         
@@ -162,17 +816,18 @@ class JanAI:
         Returns:
             The response from the assistant creation API call.
         """
-        assistant = self.client.beta.assistants.create(
-            name=name, 
-            model=model, 
-            description=description, 
-            instructions=instructions, 
-            temperature=temperature, 
-            top_p=top_p, 
+        assistant = await self._call(self.client.beta.assistants.create,
+            name=name,
+            model=model,
+            description=description,
+            instructions=instructions,
+            temperature=temperature,
+            top_p=top_p,
         )
+        await self._remember("assistants", assistant)
         return assistant
-    
-    def update_assistant(self, model, assistant_id, name=None, description=None, instructions=None, tools=None, tool_resources=None, temperature=None, top_p=None, metadata=None, response_format=None):
+
+    async def update_assistant(self, model, assistant_id, name=None, description=None, instructions=None, tools=None, tool_resources=None, temperature=None, top_p=None, metadata=None, response_format=None):
         """
         Updates an existing assistant in the OpenAI account.
         
@@ -192,25 +847,455 @@ class JanAI:
         Returns:
             The response from the assistant update API call.
         """
-        assistant = self.client.beta.assistants.update(
-            assistant_id, 
-            name=name, 
+        assistant = await self._call(self.client.beta.assistants.update,
+            assistant_id,
+            name=name,
             model=model,
-            description=description, 
-            instructions=instructions, 
-            temperature=temperature, 
+            description=description,
+            instructions=instructions,
+            temperature=temperature,
             tools=tools,
-            top_p=top_p, 
+            top_p=top_p,
         )
+        await self._remember("assistants", assistant)
         return assistant
-    
-    def delete_assistant(self, assistant_id):
+
+    async def delete_assistant(self, assistant_id):
         """
         Deletes a specific assistant by its ID.
         
         Args:
             assistant_id: The unique identifier of the assistant to delete.
+            
+        Returns:
+            The ID of the deleted assistant.
+        """
+        await self._call(self.client.beta.assistants.delete, assistant_id)
+        await self._forget("assistants", assistant_id)
+        return assistant_id
+
+    async def _call(self, method, *args, **kwargs):
+        """
+        Calls an SDK method through the current project's request scheduler, which paces it against the project's
+        rate limits and retries transient errors (see `RequestScheduler.call`), and records the call's metrics.
+        """
+        scheduler = RequestScheduler.for_project(self.project)
+        return await Metrics.async_track(method, self.project, lambda: scheduler.async_call(method, *args, **kwargs))
+
+    async def _remember(self, kind, obj):
+        """
+        Stores a created or updated object in the local inventory, if there is one, and invalidates the shared
+        in-memory inventory of its kind.
+        """
+        if self.inventory is not None:
+            await asyncio.to_thread(self.inventory.upsert, self.project, kind, [obj])
+        SharedInventory.invalidate(self.project, (kind,))
+
+    async def _forget(self, kind, object_id):
+        """
+        Removes a deleted object from the local inventory, if there is one, and invalidates the shared in-memory
+        inventory of its kind.
+        """
+        if self.inventory is not None:
+            await asyncio.to_thread(self.inventory.delete, self.project, kind, [object_id])
+        SharedInventory.invalidate(self.project, (kind,))
+
+    async def _bulk_delete(self, delete_method, ids, max_workers=c.BULK_DELETE_WORKERS, kind=None, job=None):
+        """
+        Deletes many objects concurrently, with at most `max_workers` deletions in flight. Objects that no longer exist
+        (a 404) count as deleted.
+        
+        Args:
+            delete_method: The single-object delete coroutine to call for each ID, e.g. `self.delete_file`.
+            ids (iterable): The unique identifiers of the objects to delete.
+            max_workers (int, optional): The maximum number of deletions in flight. Defaults to c.BULK_DELETE_WORKERS.
+            kind (str, optional): The kind of the objects, used for the job journal. Defaults to None.
+            job (BulkJob, optional): A job whose journal records the outcome of each deletion as it completes.
+                IDs the journal already records as done or missing are skipped. Defaults to None.
+            
+        Returns:
+            dict: A dictionary with a "deleted" list of the IDs that were removed and a "failed" dictionary
+            mapping each ID that could not be removed to its error message.
+        """
+        from openai import NotFoundError
+
+        ids = list(dict.fromkeys(ids))
+        result = {"deleted": [], "failed": {}}
+        if job is not None:
+            ids = [object_id for object_id in ids if (kind, object_id) not in job.completed]
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+
+        async def delete(object_id):
+            async with semaphore:
+                try:
+                    await delete_method(object_id)
+                    event, error = "done", None
+                except NotFoundError:
+                    await self._forget(kind, object_id)
+                    event, error = "missing", None
+                except Exception as e:
+                    event, error = "failed", str(e)
+                if job is not None:
+                    job.record(kind, object_id, event, error)
+                return object_id, error
+
+        for object_id, error in await asyncio.gather(*(delete(object_id) for object_id in ids)):
+            if error is None:
+                result["deleted"].append(object_id)
+            else:
+                result["failed"][object_id] = error
+        return result
+
+    async def bulk_delete_files(self, file_ids, max_workers=c.BULK_DELETE_WORKERS, job=None):
+        """
+        Deletes many files concurrently.
+        
+        Args:
+            file_ids (iterable): The unique identifiers of the files to delete.
+            max_workers (int, optional): The maximum number of deletions in flight. Defaults to c.BULK_DELETE_WORKERS.
+            job (BulkJob, optional): A job journaling each deletion (see `_bulk_delete`). Defaults to None.
+            
+        Returns:
+            dict: The "deleted" IDs and the "failed" IDs with their error messages.
+        """
+        return await self._bulk_delete(self.delete_file, file_ids, max_workers=max_workers, kind="files", job=job)
+
+    async def bulk_delete_vector_stores(self, vector_store_ids, max_workers=c.BULK_DELETE_WORKERS, job=None):
+        """
+        Deletes many vector stores concurrently.
+        
+        Args:
+            vector_store_ids (iterable): The unique identifiers of the vector stores to delete.
+            max_workers (int, optional): The maximum number of deletions in flight. Defaults to c.BULK_DELETE_WORKERS.
+            job (BulkJob, optional): A job journaling each deletion (see `_bulk_delete`). Defaults to None.
+            
+        Returns:
+            dict: The "deleted" IDs and the "failed" IDs with their error messages.
+        """
+        return await self._bulk_delete(self.delete_vector_store, vector_store_ids, max_workers=max_workers, kind="vector_stores", job=job)
+
+    async def bulk_delete_assistants(self, assistant_ids, max_workers=c.BULK_DELETE_WORKERS, job=None):
+        """
+        Deletes many assistants concurrently.
+        
+        Args:
+            assistant_ids (iterable): The unique identifiers of the assistants to delete.
+            max_workers (int, optional): The maximum number of deletions in flight. Defaults to c.BULK_DELETE_WORKERS.
+            job (BulkJob, optional): A job journaling each deletion (see `_bulk_delete`). Defaults to None.
+            
+        Returns:
+            dict: The "deleted" IDs and the "failed" IDs with their error messages.
+        """
+        return await self._bulk_delete(self.delete_assistant, assistant_ids, max_workers=max_workers, kind="assistants", job=job)
+
+    async def run_job(self, job, max_workers=c.BULK_DELETE_WORKERS):
+        """
+        Runs, or resumes, a journaled bulk delete: the pending objects of each planned kind are deleted, assistants
+        first, then vector stores, then files. The job is marked running while it runs (see `BulkJob.start`) and
+        finished once nothing is pending.
+        
+        Args:
+            job (BulkJob): The job to run, e.g. from `BulkJob.create` or `BulkJob.unfinished`.
+            max_workers (int, optional): The maximum number of deletions in flight. Defaults to c.BULK_DELETE_WORKERS.
+            
+        Returns:
+            dict: The bulk delete result of each planned kind, keyed by kind.
+        """
+        delete_methods = {
+            "assistants": self.bulk_delete_assistants,
+            "vector_stores": self.bulk_delete_vector_stores,
+            "files": self.bulk_delete_files,
+        }
+        job.start()
+        try:
+            results = {kind: await delete_methods[kind](job.pending(kind), max_workers=max_workers, job=job) for kind in KINDS if kind in job.planned}
+        finally:
+            job.stop()
+        if not job.remaining():
+            job.finish()
+        return results
+
+    def _iter_kind(self, kind, **params):
+        """
+        Returns the lazy listing of one kind of object.
+        """
+        iterators = {
+            "assistants": self.iter_assistants,
+            "vector_stores": self.iter_vector_stores,
+            "files": self.iter_files,
+        }
+        return iterators[kind](**params)
+
+    async def _collect(self, kind, items, on_page=None):
+        """
+        Collects a lazy listing into a list, calling `on_page(kind, loaded)` after every full page. `loaded` is the list
+        being collected, not a copy, so callbacks should only read its latest page rather than process it whole.
+        """
+        loaded = []
+        async for item in items:
+            loaded.append(item)
+            if on_page is not None and len(loaded) % c.PAGE_SIZE == 0:
+                on_page(kind, loaded)
+        return loaded
+
+    async def list_inventory(self, kinds=KINDS, on_page=None):
+        """
+        Lists the assistants, vector stores and files concurrently.
+        
+        Args:
+            kinds (tuple, optional): The kinds to list, out of "assistants", "vector_stores" and "files".
+                Defaults to all three.
+            on_page (callable, optional): Called as `on_page(kind, loaded)` after every full page, where `kind` is
+                "assistants", "vector_stores" or "files" and `loaded` is the list of objects loaded so far.
+                Defaults to None.
+            
+        Returns:
+            dict: The lists of objects keyed by kind.
+        """
+        async def list_kind(kind):
+            params = {"order": "asc"} if kind == "assistants" else {}
+            return kind, await self._collect(kind, self._iter_kind(kind, **params), on_page=on_page)
+
+        return dict(await asyncio.gather(*(list_kind(kind) for kind in kinds)))
+
+    async def reference_graph(self, vector_store_ids, file_ids=None, max_concurrency=c.SCAN_CONCURRENCY):
         """
-        self.client.beta.assistants.delete(assistant_id)
+        Builds the reference graph of the current project (see `references.ReferenceGraph.scan`).
+        
+        Args:
+            vector_store_ids (iterable): The IDs of the vector stores whose files to list.
+            file_ids (iterable, optional): The IDs of the project's files at the time of the scan. Defaults to None.
+            max_concurrency (int, optional): The maximum number of listings in flight. Defaults to c.SCAN_CONCURRENCY.
+            
+        Returns:
+            ReferenceGraph: The references between the project's assistants, vector stores and files.
+        """
+        from references import ReferenceGraph
+
+        return await ReferenceGraph.scan(self, vector_store_ids, file_ids=file_ids, max_concurrency=max_concurrency)
+
+    async def sync_inventory(self, kinds=KINDS, reconcile=False, on_page=None):
+        """
+        Brings the local inventory up to date concurrently for each requested kind and returns its contents.
+        
+        A kind that has never been synced, whose last full reconcile is older than c.RECONCILE_INTERVAL, or for
+        which `reconcile` is set, is listed completely and replaces the cached copy (dropping objects deleted
+        elsewhere). Otherwise only objects newer than the newest cached `created_at` are fetched, newest first,
+        stopping at the first already-known object.
+        
+        Args:
+            kinds (tuple, optional): The kinds to sync, out of "assistants", "vector_stores" and "files".
+                Defaults to all three.
+            reconcile (bool, optional): Force a complete listing of every requested kind. Defaults to False.
+            on_page (callable, optional): Called as `on_page(kind, loaded)` after every full page fetched.
+                Defaults to None.
+            
+        Returns:
+            dict: The lists of objects keyed by kind, read back from the local inventory as compact records.
+        """
+        if self.inventory is None:
+            return await self.list_inventory(kinds=kinds, on_page=on_page)
+
+        async def sync_kind(kind):
+            if reconcile or await asyncio.to_thread(self.inventory.needs_reconcile, self.project, kind):
+                objects = await self._collect(kind, self._iter_kind(kind), on_page=on_page)
+                await asyncio.to_thread(self.inventory.replace, self.project, kind, objects)
+                await asyncio.to_thread(self.inventory.mark_synced, self.project, kind, reconciled=True)
+            else:
+                newest = await asyncio.to_thread(self.inventory.newest_created_at, self.project, kind) or 0
+                objects = []
+                items = self._iter_kind(kind, order="desc")
+                try:
+                    async for obj in items:
+                        if obj.created_at < newest:
+                            break
+                        objects.append(obj)
+                finally:
+                    await items.aclose()
+                await asyncio.to_thread(self.inventory.upsert, self.project, kind, objects)
+                await asyncio.to_thread(self.inventory.mark_synced, self.project, kind)
+            return kind, await asyncio.to_thread(self.inventory.load, self.project, kind)
+
+        return dict(await asyncio.gather(*(sync_kind(kind) for kind in kinds)))
+
+    @classmethod
+    async def scan_projects(cls, projects, model=model, inventory=None, max_concurrency=c.SCAN_CONCURRENCY, http_client=None):
+        """
+        Loads the assistants, vector stores and files of several projects concurrently.
+        
+        Every (project, kind) pair is synced as its own task, and a shared semaphore bounds how many run at once,
+        so the whole scan takes roughly as long as the slowest project rather than the sum of all of them.
         
-    
\ No newline at end of file
+        Args:
+            projects (dict): The project IDs keyed by a display name, e.g. the result of `configured_projects()`.
+            model (str, optional): The model name for the per-project clients. Defaults to "gpt-4o-mini".
+            inventory (InventoryCache, optional): A local inventory to sync through. Defaults to None.
+            max_concurrency (int, optional): The maximum number of listings in flight across all projects and
+                kinds. Defaults to c.SCAN_CONCURRENCY.
+            http_client (httpx.AsyncClient, optional): An HTTP transport to scan through, which the caller remains
+                responsible for closing. Defaults to None (a transport created and closed by the scan).
+            
+        Returns:
+            dict: For each project name, the lists of objects keyed by kind.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        owns_http_client = http_client is None
+        http_client = http_client or ClientPool.async_http_client()
+        clients = {
+            name: cls(model, project=project_id, inventory=inventory, http_client=http_client)
+            for name, project_id in projects.items()
+        }
+
+        async def scan(name, kind):
+            async with semaphore:
+                objects = await clients[name].sync_inventory(kinds=(kind,))
+            return name, kind, objects[kind]
+
+        try:
+            results = await asyncio.gather(*(scan(name, kind) for name in clients for kind in KINDS))
+        finally:
+            if owns_http_client:
+                await http_client.aclose()
+        scanned = {name: {} for name in clients}
+        for name, kind, objects in results:
+            scanned[name][kind] = objects
+        return scanned
+
+
+def _blocking(name, callback=None):
+    """
+    Returns a synchronous JanAI method running the `AsyncJanAI` coroutine method `name` on the pool's event loop (see
+    `ClientPool.run`). A `callback` argument (e.g. "on_progress"), if given, is relayed back to the calling thread.
+    """
+    async_method = getattr(AsyncJanAI, name)
+    signature = inspect.signature(async_method)
+
+    @profiler.timed("api")
+    @functools.wraps(async_method)
+    def method(self, *args, **kwargs):
+        arguments = signature.bind(None, *args, **kwargs)
+        function = arguments.arguments.pop(callback, None) if callback else None
+
+        async def call(relay):
+            arguments.arguments["self"] = self._async()
+            if relay is not None:
+                arguments.arguments[callback] = relay
+            return await async_method(*arguments.args, **arguments.kwargs)
+
+        return ClientPool.run(call, function)
+    return method
+
+
+def _iterating(name):
+    """
+    Returns a synchronous JanAI method iterating over the `AsyncJanAI` async generator method `name` on the pool's
+    event loop (see `ClientPool.iterate`).
+    """
+    async_method = getattr(AsyncJanAI, name)
+
+    @functools.wraps(async_method)
+    def method(self, *args, **kwargs):
+        return ClientPool.iterate(lambda: async_method(self._async(), *args, **kwargs))
+    return method
+
+
+class JanAI:
+    """
+    JanAI is a class that provides an interface to various OpenAI API functionalities, including managing files,
+    vector stores, and assistants. It allows for operations such as listing, creating, retrieving, and deleting
+    files and vector stores, as well as managing assistants by listing, creating, updating, and deleting them.
+    
+    JanAI is the synchronous face of `AsyncJanAI`, for callers that are not running an event loop, such as Streamlit
+    scripts: each method runs the `AsyncJanAI` method of the same name on the pool's event loop and waits for it,
+    and the `iter_*` methods are regular iterators over the async listings. The API is implemented once, in
+    `AsyncJanAI`.
+    
+    Attributes:
+        model (str): The model name to be used for the assistant operations.
+        project (str): The project ID used for the OpenAI API operations, or None for the default project.
+        inventory (InventoryCache): The local inventory kept in step with every mutation, or None.
+    """
+    
+    def __init__(self, model: str = model, inventory=None):
+        """
+        Initializes the JanAI class with a specific model.
+        
+        Args:
+            model (str): The model name to be used for the assistant operations. Defaults to "gpt-4o-mini".
+            inventory (InventoryCache, optional): A local inventory to keep in step with every create, update
+                and delete, and to sync from in `sync_inventory`. Defaults to None.
+        """
+        self.model = model
+        self.project = project
+        self.inventory = inventory
+        
+    def set_project(self, project):
+        """
+        Sets the project to be used for OpenAI API operations.
+        
+        Args:
+            project: The project ID or name to be used for the OpenAI API operations.
+        """
+        self.project = project
+
+    @property
+    def client(self):
+        """
+        The pooled synchronous OpenAI client of the current project, built on first use.
+        """
+        return ClientPool.get(self.project)
+
+    def _async(self):
+        """
+        Returns an AsyncJanAI for the current project and inventory on the pool loop's shared transport. Must be called
+        on the pool's event loop.
+        """
+        return AsyncJanAI(self.model, project=self.project, inventory=self.inventory, http_client=ClientPool.shared_async_http_client())
+
+    iter_files = _iterating("iter_files")
+    list_files = _blocking("list_files")
+    create_file = _blocking("create_file", callback="on_progress")
+    backfill_file_hashes = _blocking("backfill_file_hashes", callback="on_progress")
+    duplicate_files = _blocking("duplicate_files")
+    ingest_files = _blocking("ingest_files", callback="on_progress")
+    upload_file = _blocking("upload_file", callback="on_progress")
+    retrieve_file = _blocking("retrieve_file")
+    delete_file = _blocking("delete_file")
+    iter_vector_stores = _iterating("iter_vector_stores")
+    list_vector_stores = _blocking("list_vector_stores")
+    create_vector_store = _blocking("create_vector_store")
+    delete_vector_store = _blocking("delete_vector_store")
+    iter_vector_store_files = _iterating("iter_vector_store_files")
+    iter_assistants = _iterating("iter_assistants")
+    list_assistants = _blocking("list_assistants")
+    retrieve_assistant = _blocking("retrieve_assistant")
+    create_assistant = _blocking("create_assistant")
+    update_assistant = _blocking("update_assistant")
+    delete_assistant = _blocking("delete_assistant")
+    bulk_delete_files = _blocking("bulk_delete_files")
+    bulk_delete_vector_stores = _blocking("bulk_delete_vector_stores")
+    bulk_delete_assistants = _blocking("bulk_delete_assistants")
+    run_job = _blocking("run_job")
+    list_inventory = _blocking("list_inventory", callback="on_page")
+    reference_graph = _blocking("reference_graph")
+    sync_inventory = _blocking("sync_inventory", callback="on_page")
+
+    @profiler.timed("api")
+    def scan_projects(self, projects, max_concurrency=c.SCAN_CONCURRENCY):
+        """
+        Loads the assistants, vector stores and files of several projects concurrently.
+        
+        This is a thin synchronous wrapper around `AsyncJanAI.scan_projects`, sharing this instance's model and
+        local inventory.
+        
+        Args:
+            projects (dict): The project IDs keyed by a display name, e.g. the result of `configured_projects()`.
+            max_concurrency (int, optional): The maximum number of listings in flight across all projects and
+                kinds. Defaults to c.SCAN_CONCURRENCY.
+            
+        Returns:
+            dict: For each project name, the lists of objects keyed by kind.
+        """
+        return ClientPool.run(lambda _: AsyncJanAI.scan_projects(
+            projects, model=self.model, inventory=self.inventory, max_concurrency=max_concurrency, http_client=ClientPool.shared_async_http_client()
+        ))
@@ -0,0 +1,247 @@
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+import constants as c
+
+
+class BulkJob:
+    """
+    BulkJob is a resumable bulk operation backed by an append-only JSONL journal under c.JOBS_DIR. The journal starts
+    with the job's plan (the object IDs to process, per kind) and gets one line per processed object as soon as it is
+    processed, so after a crash or restart the job can be reopened and resumed with only the objects that were neither
+    completed nor already missing, without any extra API call.
+
+    Journal lines are JSON objects with an "event" of:
+    - "plan": the job's name, project and planned "ids" per kind (first line);
+    - "done": an object was processed ("kind", "id");
+    - "missing": an object no longer existed (a 404), which counts as processed;
+    - "failed": an object could not be processed ("error"); it is retried on resume;
+    - "finished": the job ran to the end, or was discarded.
+
+    A finished job's journal is deleted. While a job runs, a `.running` marker next to its journal is refreshed as
+    objects are processed (see `start`), so that other sessions do not offer it for resuming; a marker that has not been
+    refreshed for c.JOB_HEARTBEAT_TIMEOUT seconds belongs to a job that died and is ignored.
+
+    Attributes:
+        path (str): The path of the journal file.
+        name (str): A human-readable name of the job, e.g. "clear project".
+        project (str): The project ID the job runs against, or None for the default project.
+        created_at (float): The epoch timestamp the job was planned at.
+        planned (dict): The planned object IDs, keyed by kind, in processing order.
+        completed (set): The `(kind, id)` pairs that were done or missing.
+        failed (dict): The last error message of each `(kind, id)` pair that failed and has not completed since.
+        finished (bool): Whether the job ran to the end or was discarded.
+    """
+    _cache_lock = threading.Lock()
+    _unfinished = {}
+
+    def __init__(self, path, name, project, created_at, planned):
+        self.path = path
+        self.name = name
+        self.project = project
+        self.created_at = created_at
+        self.planned = planned
+        self.completed = set()
+        self.failed = {}
+        self.finished = False
+        self._lock = threading.Lock()
+        self._beat_at = None
+
+    @property
+    def marker_path(self):
+        return self.path + ".running"
+
+    @classmethod
+    def create(cls, name, project, planned, directory=None):
+        """
+        Plans a new job and writes its journal.
+
+        Args:
+            name (str): A human-readable name of the job.
+            project (str): The project ID the job runs against, or None for the default project.
+            planned (dict): The object IDs to process, keyed by kind, in processing order.
+            directory (str, optional): The directory of the journal. Defaults to c.JOBS_DIR.
+
+        Returns:
+            BulkJob: The new job.
+        """
+        directory = directory or c.JOBS_DIR
+        os.makedirs(directory, exist_ok=True)
+        created_at = time.time()
+        path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S', time.gmtime(created_at))}-{uuid.uuid4().hex[:8]}.jsonl")
+        job = cls(path, name, project, created_at, {kind: list(dict.fromkeys(ids)) for kind, ids in planned.items()})
+        job._append({"event": "plan", "name": name, "project": project, "created_at": created_at, "ids": job.planned})
+        return job
+
+    @classmethod
+    def open(cls, path):
+        """
+        Reopens a job by replaying its journal. A truncated last line (from a crash mid-write) is ignored.
+
+        Args:
+            path (str): The path of the journal file.
+
+        Returns:
+            BulkJob: The job in the state its journal records.
+        """
+        job = None
+        with open(path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                event = entry["event"]
+                if event == "plan":
+                    job = cls(path, entry["name"], entry["project"], entry["created_at"], entry["ids"])
+                elif event in ("done", "missing"):
+                    job.completed.add((entry["kind"], entry["id"]))
+                    job.failed.pop((entry["kind"], entry["id"]), None)
+                elif event == "failed":
+                    job.failed[(entry["kind"], entry["id"])] = entry["error"]
+                elif event == "finished":
+                    job.finished = True
+        return job
+
+    @classmethod
+    def unfinished(cls, project=None, directory=None):
+        """
+        Returns the jobs of a project that neither ran to the end nor were discarded and are not running, oldest first.
+
+        Journals of running jobs are not read, and journals of finished jobs that could not be deleted when they
+        finished are deleted now.
+
+        The list is cached per directory and project. Journals are only read again once a job was planned, started,
+        stopped or finished, in any process (which creates or deletes a file and so changes the directory's
+        modification time), or after c.JOB_HEARTBEAT_TIMEOUT seconds, when the marker of a job that died goes stale.
+
+        Args:
+            project (str): The project ID, or None for the default project.
+            directory (str, optional): The directory of the journals. Defaults to c.JOBS_DIR.
+        """
+        directory = directory or c.JOBS_DIR
+        try:
+            modified_at = os.stat(directory).st_mtime_ns
+        except OSError:
+            return []
+        key = (directory, project)
+        with cls._cache_lock:
+            cached = cls._unfinished.get(key)
+            if cached is not None and cached[0] == modified_at and time.monotonic() - cached[1] < c.JOB_HEARTBEAT_TIMEOUT:
+                return list(cached[2])
+        jobs = cls._read_unfinished(project, directory)
+        with cls._cache_lock:
+            cls._unfinished[key] = (modified_at, time.monotonic(), jobs)
+        return list(jobs)
+
+    @classmethod
+    def _read_unfinished(cls, project, directory):
+        jobs = []
+        for path in sorted(glob.glob(os.path.join(directory, "*.jsonl"))):
+            if cls._alive(path + ".running"):
+                continue
+            job = cls.open(path)
+            if job is None:
+                continue
+            if job.finished:
+                job._remove()
+            elif job.project == project:
+                jobs.append(job)
+        return jobs
+
+    @staticmethod
+    def _alive(marker_path):
+        try:
+            return time.time() - os.path.getmtime(marker_path) < c.JOB_HEARTBEAT_TIMEOUT
+        except OSError:
+            return False
+
+    def running(self):
+        """
+        Returns whether the job is running, in this process or another one.
+        """
+        return self._alive(self.marker_path)
+
+    def start(self):
+        """
+        Marks the job as running until `stop`, so that it is not offered for resuming elsewhere.
+        """
+        with open(self.marker_path, "w") as f:
+            f.write(str(os.getpid()))
+        self._beat_at = time.monotonic()
+
+    def stop(self):
+        """
+        Removes the running marker of the job.
+        """
+        self._beat_at = None
+        try:
+            os.remove(self.marker_path)
+        except OSError:
+            pass
+
+    def _heartbeat(self):
+        if self._beat_at is None or time.monotonic() - self._beat_at < c.JOB_HEARTBEAT_INTERVAL:
+            return
+        self._beat_at = time.monotonic()
+        try:
+            os.utime(self.marker_path)
+        except OSError:
+            pass
+
+    def _remove(self):
+        for path in (self.path, self.marker_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _append(self, entry):
+        with self._lock, open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def pending(self, kind):
+        """
+        Returns the planned IDs of one kind that have not completed yet, in processing order.
+        """
+        return [object_id for object_id in self.planned.get(kind, []) if (kind, object_id) not in self.completed]
+
+    def remaining(self):
+        """
+        Returns the number of planned objects, of every kind, that have not completed yet.
+        """
+        return sum(len(self.pending(kind)) for kind in self.planned)
+
+    def record(self, kind, object_id, event, error=None):
+        """
+        Appends the outcome of one object to the journal.
+
+        Args:
+            kind (str): One of "assistants", "vector_stores" or "files".
+            object_id (str): The ID of the object.
+            event (str): "done", "missing" or "failed".
+            error (str, optional): The error message of a failure. Defaults to None.
+        """
+        entry = {"event": event, "kind": kind, "id": object_id}
+        if event == "failed":
+            entry["error"] = error
+        self._append(entry)
+        self._heartbeat()
+        with self._lock:
+            if event == "failed":
+                self.failed[(kind, object_id)] = error
+            else:
+                self.completed.add((kind, object_id))
+                self.failed.pop((kind, object_id), None)
+
+    def finish(self):
+        """
+        Marks the job as finished, so it is no longer offered for resuming, and deletes its journal and marker.
+        """
+        self._append({"event": "finished", "at": time.time()})
+        self.finished = True
+        self._beat_at = None
+        self._remove()
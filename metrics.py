@@ -0,0 +1,323 @@
+import bisect
+import contextvars
+import json
+import threading
+import time
+import urllib.request
+import constants as c
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# The operation of the API call in progress, so the HTTP transport can attribute bytes to it
+current_operation = contextvars.ContextVar("current_operation", default="other")
+
+
+def operation_name(method):
+    """
+    Returns the name of an SDK method from its resource path, e.g. "files.list", "vector_stores.files.list" or
+    "vector_stores.file_batches.create".
+
+    The path is the module of the method's resource after `resources.`, without the `beta` namespace and with a
+    resource's own module collapsed into its package (`vector_stores.vector_stores` is `vector_stores`), so that methods
+    of nested resources sharing a name are told apart.
+    """
+    owner = getattr(method, "__self__", None)
+    if owner is None:
+        return getattr(method, "__qualname__", "other")
+    module = type(owner).__module__
+    resource = module.partition("resources.")[2] or module.rsplit(".", 1)[-1]
+    path = [segment for segment in resource.split(".") if segment != "beta"]
+    if len(path) > 1 and path[-1] == path[-2]:
+        path.pop()
+    return ".".join([*path, method.__name__])
+
+
+class Metrics:
+    """
+    Metrics is the process-wide registry of API call metrics, labelled by operation and project: call and error
+    counts, a latency histogram, and the bytes sent and received on the wire. JanAI records every call through
+    `track`, and the pooled HTTP transports record bytes through `metered_transport`.
+
+    The registry renders as Prometheus text or JSON (with p50/p90/p99 latencies estimated from the histogram), and is
+    written every c.METRICS_EXPORT_INTERVAL seconds to c.METRICS_EXPORT (a file path or an http(s) URL) when that is set.
+    """
+    _lock = threading.Lock()
+    _series = {}
+    _exporter = None
+
+    @classmethod
+    def _get(cls, operation, project):
+        key = (operation, project or "default")
+        series = cls._series.get(key)
+        if series is None:
+            series = cls._series[key] = {
+                "calls": 0, "errors": {}, "buckets": [0] * (len(LATENCY_BUCKETS) + 1), "seconds": 0.0,
+                "bytes_sent": 0, "bytes_received": 0,
+            }
+        return series
+
+    @classmethod
+    def record_call(cls, operation, project, seconds, error=None):
+        """
+        Records one API call.
+
+        Args:
+            operation (str): The operation name, e.g. "files.delete".
+            project (str): The project ID, or None for the default project.
+            seconds (float): The call's latency, including scheduling and retries.
+            error (str, optional): The class name of the error the call failed with. Defaults to None.
+        """
+        with cls._lock:
+            series = cls._get(operation, project)
+            series["calls"] += 1
+            series["seconds"] += seconds
+            series["buckets"][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            if error is not None:
+                series["errors"][error] = series["errors"].get(error, 0) + 1
+        cls._start_exporter()
+
+    @classmethod
+    def record_bytes(cls, operation, project, sent=0, received=0):
+        """
+        Adds bytes sent and received on the wire to an operation's totals.
+        """
+        with cls._lock:
+            series = cls._get(operation, project)
+            series["bytes_sent"] += sent
+            series["bytes_received"] += received
+
+    @classmethod
+    def track(cls, method, project, call):
+        """
+        Runs `call()` as the given SDK method's operation and records it.
+
+        Args:
+            method: The SDK method being called, used to name the operation.
+            project (str): The project ID, or None for the default project.
+            call (callable): Performs the call and returns its result.
+
+        Returns:
+            The result of `call()`.
+        """
+        operation = operation_name(method)
+        token = current_operation.set(operation)
+        start = time.perf_counter()
+        try:
+            result = call()
+        except Exception as e:
+            cls.record_call(operation, project, time.perf_counter() - start, error=type(e).__name__)
+            raise
+        finally:
+            current_operation.reset(token)
+        cls.record_call(operation, project, time.perf_counter() - start)
+        return result
+
+    @classmethod
+    async def async_track(cls, method, project, call):
+        """
+        Async counterpart of `track`, where `call()` returns an awaitable.
+        """
+        operation = operation_name(method)
+        token = current_operation.set(operation)
+        start = time.perf_counter()
+        try:
+            result = await call()
+        except Exception as e:
+            cls.record_call(operation, project, time.perf_counter() - start, error=type(e).__name__)
+            raise
+        finally:
+            current_operation.reset(token)
+        cls.record_call(operation, project, time.perf_counter() - start)
+        return result
+
+    @staticmethod
+    def _quantile(buckets, q):
+        """
+        Estimates a latency quantile from histogram buckets by linear interpolation within the bucket it falls in.
+        """
+        total = sum(buckets)
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(buckets):
+            if count and seen + count >= rank:
+                lower = LATENCY_BUCKETS[index - 1] if index > 0 else 0.0
+                upper = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else LATENCY_BUCKETS[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return LATENCY_BUCKETS[-1]
+
+    @classmethod
+    def snapshot(cls):
+        """
+        Returns the metrics as a list of dictionaries, one per operation and project, with latency quantiles in seconds.
+        """
+        with cls._lock:
+            series = {key: {**value, "errors": dict(value["errors"]), "buckets": list(value["buckets"])} for key, value in cls._series.items()}
+        return [
+            {
+                "operation": operation,
+                "project": project,
+                "calls": value["calls"],
+                "errors": sum(value["errors"].values()),
+                "errors_by_type": value["errors"],
+                "mean_seconds": value["seconds"] / value["calls"] if value["calls"] else None,
+                "p50_seconds": cls._quantile(value["buckets"], 0.5),
+                "p90_seconds": cls._quantile(value["buckets"], 0.9),
+                "p99_seconds": cls._quantile(value["buckets"], 0.99),
+                "bytes_sent": value["bytes_sent"],
+                "bytes_received": value["bytes_received"],
+            }
+            for (operation, project), value in sorted(series.items())
+        ]
+
+    @classmethod
+    def render_json(cls):
+        """
+        Returns the metrics as a JSON document.
+        """
+        return json.dumps({"generated_at": time.time(), "series": cls.snapshot()}, indent=2)
+
+    @classmethod
+    def render_prometheus(cls):
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        with cls._lock:
+            series = {key: {**value, "errors": dict(value["errors"]), "buckets": list(value["buckets"])} for key, value in cls._series.items()}
+        lines = [
+            "# HELP janai_api_calls_total API calls made, including failed ones.",
+            "# TYPE janai_api_calls_total counter",
+        ]
+        for (operation, project), value in sorted(series.items()):
+            lines.append(f'janai_api_calls_total{{operation="{operation}",project="{project}"}} {value["calls"]}')
+        lines += ["# HELP janai_api_errors_total API calls that failed, by error type.", "# TYPE janai_api_errors_total counter"]
+        for (operation, project), value in sorted(series.items()):
+            for error, count in sorted(value["errors"].items()):
+                lines.append(f'janai_api_errors_total{{operation="{operation}",project="{project}",error="{error}"}} {count}')
+        lines += ["# HELP janai_api_call_seconds API call latency, including scheduling and retries.", "# TYPE janai_api_call_seconds histogram"]
+        for (operation, project), value in sorted(series.items()):
+            labels = f'operation="{operation}",project="{project}"'
+            cumulative = 0
+            for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), value["buckets"]):
+                cumulative += count
+                lines.append(f'janai_api_call_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'janai_api_call_seconds_sum{{{labels}}} {value["seconds"]}')
+            lines.append(f'janai_api_call_seconds_count{{{labels}}} {value["calls"]}')
+        for direction in ("sent", "received"):
+            lines += [f"# HELP janai_api_bytes_{direction}_total Bytes {direction} on the wire.", f"# TYPE janai_api_bytes_{direction}_total counter"]
+            for (operation, project), value in sorted(series.items()):
+                lines.append(f'janai_api_bytes_{direction}_total{{operation="{operation}",project="{project}"}} {value[f"bytes_{direction}"]}')
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def export(cls, target=None, fmt=None):
+        """
+        Writes the metrics to a file, or POSTs them to an http(s) URL.
+
+        Args:
+            target (str, optional): The file path or URL. Defaults to c.METRICS_EXPORT.
+            fmt (str, optional): "prometheus" or "json". Defaults to c.METRICS_FORMAT.
+        """
+        target = target or c.METRICS_EXPORT
+        fmt = fmt or c.METRICS_FORMAT
+        body = cls.render_prometheus() if fmt == "prometheus" else cls.render_json()
+        if target.startswith(("http://", "https://")):
+            content_type = "text/plain; version=0.0.4" if fmt == "prometheus" else "application/json"
+            request = urllib.request.Request(target, data=body.encode(), headers={"Content-Type": content_type}, method="POST")
+            with urllib.request.urlopen(request, timeout=10):
+                pass
+        else:
+            with open(target, "w") as f:
+                f.write(body)
+
+    @classmethod
+    def _start_exporter(cls):
+        """
+        Starts the periodic export thread on first use, if c.METRICS_EXPORT is set.
+        """
+        if not c.METRICS_EXPORT or cls._exporter is not None:
+            return
+        with cls._lock:
+            if cls._exporter is not None:
+                return
+
+            def run():
+                while True:
+                    time.sleep(c.METRICS_EXPORT_INTERVAL)
+                    try:
+                        cls.export()
+                    except OSError:
+                        pass
+
+            cls._exporter = threading.Thread(target=run, name="janai-metrics-exporter", daemon=True)
+            cls._exporter.start()
+
+    @classmethod
+    def reset(cls):
+        """
+        Clears every recorded metric.
+        """
+        with cls._lock:
+            cls._series.clear()
+
+
+def metered_transport(limits, asynchronous=False):
+    """
+    Returns an HTTP transport with the given connection limits that records the bytes of every request and response
+    (as sent and received on the wire) under the current operation and the request's project.
+    """
+    import httpx
+
+    def project_of(request):
+        return request.headers.get("openai-project") or None
+
+    def request_size(request):
+        try:
+            return int(request.headers.get("content-length", 0))
+        except ValueError:
+            return 0
+
+    class CountingStream(httpx.SyncByteStream):
+        def __init__(self, stream, operation, project):
+            self._stream, self._operation, self._project = stream, operation, project
+
+        def __iter__(self):
+            for chunk in self._stream:
+                Metrics.record_bytes(self._operation, self._project, received=len(chunk))
+                yield chunk
+
+        def close(self):
+            self._stream.close()
+
+    class AsyncCountingStream(httpx.AsyncByteStream):
+        def __init__(self, stream, operation, project):
+            self._stream, self._operation, self._project = stream, operation, project
+
+        async def __aiter__(self):
+            async for chunk in self._stream:
+                Metrics.record_bytes(self._operation, self._project, received=len(chunk))
+                yield chunk
+
+        async def aclose(self):
+            await self._stream.aclose()
+
+    class MeteredTransport(httpx.HTTPTransport):
+        def handle_request(self, request):
+            operation, project = current_operation.get(), project_of(request)
+            Metrics.record_bytes(operation, project, sent=request_size(request))
+            response = super().handle_request(request)
+            response.stream = CountingStream(response.stream, operation, project)
+            return response
+
+    class AsyncMeteredTransport(httpx.AsyncHTTPTransport):
+        async def handle_async_request(self, request):
+            operation, project = current_operation.get(), project_of(request)
+            Metrics.record_bytes(operation, project, sent=request_size(request))
+            response = await super().handle_async_request(request)
+            response.stream = AsyncCountingStream(response.stream, operation, project)
+            return response
+
+    return AsyncMeteredTransport(limits=limits) if asynchronous else MeteredTransport(limits=limits)
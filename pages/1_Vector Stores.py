@@ -1,9 +1,5 @@
 import streamlit as st
-from st_aggrid import AgGrid, GridOptionsBuilder
-import pandas as pd
-from janai import JanAI
 from utils import JanAIUtils as utils
-import constants as c
 
 
 
@@ -17,11 +13,11 @@ def main():
         display_vector_stores():
             Converts vector store data into a human-readable format and displays it using AgGrid. It formats datetime and byte size fields for better readability. The function also configures the grid's columns, including their visibility and width, and dynamically adjusts the grid's height based on the number of rows.
 
-        refresh_vector_stores():
-            Refreshes the list of vector stores from the JanAI instance and triggers a rerender of the grid. This function is useful for reflecting changes in the vector stores, such as after creating a new vector store.
+        apply_changes():
+            Patches the list of vector stores in session state with created, updated or deleted vector stores and triggers a rerender of the grid, without re-listing them from the API.
 
         create_vector_store_action():
-            Creates a new vector store with a name provided by the user through the Streamlit interface. Upon successful creation, it refreshes the list of vector stores to include the newly created one.
+            Creates a new vector store with a name provided by the user through the Streamlit interface. Upon successful creation, it inserts the newly created one into the list of vector stores.
 
         main():
             The main entry point of the Streamlit application. It initializes the JanAI instance and the list of vector stores if they are not already in the session state. It also handles the logic for updating the grid display and processes the action of deleting selected vector stores.
@@ -59,15 +55,12 @@ def main():
             selected_rows = st.session_state.grid_response['selected_rows']
             if not selected_rows.empty:
                 deleted_ids = [row['id'] for index, row in selected_rows.iterrows() if 'id' in row]
-                for row_id in deleted_ids:
-                    st.session_state.janai.delete_vector_store(row_id)
-                st.write("Deleted Vector Store IDs:", deleted_ids)
-                utils.refresh_vector_stores()
+                utils.bulk_delete('vector_stores', deleted_ids, "Vector Store")
             else:
                 st.write("No rows selected for deletion.")
     with col2:
         if st.button('Reload'):
-            st.session_state.files = st.session_state.janai.list_vector_stores()
+            st.session_state.vector_stores = utils.load_vector_stores()
             st.session_state.update_grid = True
 
     st.write("---")
@@ -75,10 +68,10 @@ def main():
     st.text_input("Enter a name for the new vector store:", key="user_input")
     if st.button("Create Vector Store"):
         utils.create_vector_store_action()
-        utils.refresh_vector_stores()
 
 if __name__ == '__main__':
     main()
+    utils.finish_profile()
     
     
     
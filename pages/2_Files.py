@@ -1,9 +1,6 @@
 import streamlit as st
-from st_aggrid import AgGrid
-import pandas as pd
-from janai import JanAI
-from utils import JanAIUtils as utils
 import constants as c
+from utils import JanAIUtils as utils
 
 
 def main():
@@ -30,16 +27,13 @@ def main():
             selected_rows = st.session_state.grid_response['selected_rows']
             if not selected_rows.empty:
                 deleted_ids = [row['id'] for index, row in selected_rows.iterrows() if 'id' in row]
-                for row_id in deleted_ids:
-                    st.session_state.janai.delete_file(row_id)
-                st.write("Deleted Vector Store IDs:", deleted_ids)
-                utils.refresh_files()
+                utils.bulk_delete('files', deleted_ids, "File")
             else:
                 st.write("No rows selected for deletion.")
     
     with col2:
         if st.button('Reload'):
-            st.session_state.files = st.session_state.janai.list_files()
+            st.session_state.files = utils.load_files()
             st.session_state.update_grid = True
             
     st.write("---")
@@ -52,11 +46,60 @@ def main():
             st.session_state.file_processed = False
 
         if not st.session_state.file_processed:
-            st.session_state.janai.create_file(file=uploaded_file)
-            st.success("File uploaded successfully.")
+            progress = st.progress(0.0, text="Uploading...") if uploaded_file.size > c.MULTIPART_THRESHOLD else None
+            file = st.session_state.janai.create_file(
+                file=uploaded_file,
+                on_progress=lambda sent, total: progress.progress(sent / total, text=f"Uploading... {utils.bytes_to_readable(sent)} of {utils.bytes_to_readable(total)}"),
+            )
+            if progress is not None:
+                progress.empty()
             st.session_state.file_processed = True
             st.session_state.last_file_hash = current_file_hash
-            utils.refresh_files()
+            if file.id in st.session_state.files:
+                st.info(f"An identical file is already uploaded as {file.filename} ({file.id}); it was not uploaded again.")
+            else:
+                st.success("File uploaded successfully.")
+                utils.apply_changes('files', upserted=[file])
+
+    st.write("---")
+    st.write("## Add Files to a Vector Store")
+    vector_stores = {f"{vector_store.name or 'Unnamed'} ({vector_store.id})": vector_store.id for vector_store in st.session_state.vector_stores}
+    with st.form("ingest_form", clear_on_submit=True):
+        uploaded_files = st.file_uploader("Files", accept_multiple_files=True, key="ingest_uploader")
+        vector_store = st.selectbox("Vector store", list(vector_stores))
+        submitted = st.form_submit_button("Upload and add")
+
+    if submitted and uploaded_files and vector_store:
+        progress = st.progress(0.0, text="Uploading...")
+
+        def show_progress(counts):
+            total = counts['total']
+            if counts['uploaded'] + counts['upload_failed'] < total:
+                progress.progress((counts['uploaded'] + counts['upload_failed']) / total,
+                                  text=f"Uploading... {counts['uploaded']} of {total} uploaded, {counts['upload_failed']} failed")
+            else:
+                finished = counts['completed'] + counts['failed'] + counts['cancelled'] + counts['attach_failed']
+                progress.progress(finished / max(counts['uploaded'], 1),
+                                  text=f"Processing... {counts['completed']} of {counts['uploaded']} added, {counts['failed']} failed, {counts['in_progress']} in progress")
+
+        result = st.session_state.janai.ingest_files(uploaded_files, vector_stores[vector_store], on_progress=show_progress)
+        progress.empty()
+        added = sum(batch.file_counts.completed for batch in result['batches'])
+        st.success(f"Added {added} of {len(uploaded_files)} file(s) to the vector store.")
+        if result['failed']:
+            import pandas as pd
+
+            st.error(f"Failed to upload {len(result['failed'])} file(s):")
+            st.dataframe(pd.DataFrame(result['failed'], columns=['filename', 'error']), use_container_width=True, hide_index=True)
+        if result['attach_failed']:
+            st.error(f"Failed to add {len(result['attach_failed'])} uploaded file(s) to the vector store:")
+            st.write(result['attach_failed'])
+        utils.apply_changes('files', upserted=[file for file in result['files'] if file.id not in st.session_state.files], rerun=False)
+
+    st.write("---")
+    st.write("## Duplicate Files")
+    utils.display_duplicate_files()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
+    utils.finish_profile()
\ No newline at end of file
@@ -1,6 +1,5 @@
 import streamlit as st
 from datetime import datetime
-from st_aggrid import AgGrid
 from utils import JanAIUtils as utils
 
 def main():
@@ -30,16 +29,13 @@ def main():
                     selected_rows = st.session_state.grid_response['selected_rows']
                     if not selected_rows.empty:
                         deleted_ids = [row['id'] for index, row in selected_rows.iterrows() if 'id' in row]
-                        for row_id in deleted_ids:
-                            st.session_state.janai.delete_assistant(row_id)
-                        st.write("Deleted Vector Store IDs:", deleted_ids)
-                        utils.refresh_assistants()
+                        utils.bulk_delete('assistants', deleted_ids, "Assistant")
                     else:
                         st.write("No rows selected for deletion.")
                         
         with button_col3:
             if st.button('Reload'):
-                st.session_state.assistants = st.session_state.janai.list_assistants(order='asc', limit=100)
+                st.session_state.assistants = utils.load_assistants()
                 st.session_state.update_grid = True
 
     
@@ -55,13 +51,13 @@ def main():
                     selected_row = selected_rows.iloc[0]
                     assistant_id = selected_row['id']
                     st.write(f"Assistant ID: {assistant_id}")  # Display the selected assistant's ID
-                    matching_assistant = next((assistant for assistant in st.session_state.assistants if assistant.id == assistant_id), None)
-                    if matching_assistant:
-                        utils.display_assistant_form(matching_assistant)
+                    if assistant_id in st.session_state.assistants:
+                        utils.display_assistant_form(utils.assistant_details(assistant_id))
                 else:
                     st.write("Assistant ID: N/A")  # Display 'N/A' if no row is selected
             else:
                 st.write("Assistant ID: N/A")  # Display 'N/A' if no row is selected
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
+    utils.finish_profile()
\ No newline at end of file
@@ -0,0 +1,59 @@
+import streamlit as st
+from utils import JanAIUtils as utils
+
+
+def main():
+    """
+    Main function to run the Streamlit app.
+
+    This function lists the files that belong to no vector store and are used by no assistant, and the vector stores
+    that no assistant uses. The references are scanned on demand (every vector store's files and every assistant's tool
+    resources, listed concurrently) and kept in session state; the orphans are recomputed from the current inventory on
+    each rerun, so deletions made here or on other pages are reflected without another scan. Objects created since the
+    scan are never listed as orphans, since their references are not known until the next scan.
+    """
+    st.set_page_config(layout="wide")
+    utils.init_session_state()
+
+    st.write("# JanAI")
+    st.write("## Orphans")
+
+    col1, _ = st.columns([2, 8])
+    with col1:
+        if st.button('Scan references'):
+            with st.spinner("Listing vector store files and assistant tool resources..."):
+                st.session_state.reference_graph = st.session_state.janai.reference_graph(
+                    st.session_state.vector_stores.ids(), file_ids=st.session_state.files.ids()
+                )
+
+    graph = st.session_state.get('reference_graph')
+    if graph is None:
+        st.write("Scan the references to find orphan files and vector stores.")
+        return
+
+    st.write("### Files in no vector store and used by no assistant")
+    orphan_files = graph.orphan_files(st.session_state.files, st.session_state.vector_stores.ids(), st.session_state.assistants.ids())
+    grid_response = utils.display_files(orphan_files, key='orphan_files_grid')
+    st.write(f"Number of orphan files: {len(orphan_files)}")
+    if st.button('Delete selected files'):
+        selected_rows = grid_response['selected_rows']
+        if not selected_rows.empty:
+            utils.bulk_delete('files', selected_rows['id'].tolist(), "File")
+        else:
+            st.write("No rows selected for deletion.")
+
+    st.write("---")
+    st.write("### Vector stores used by no assistant")
+    orphan_vector_stores = graph.orphan_vector_stores(st.session_state.vector_stores, st.session_state.assistants.ids())
+    grid_response = utils.display_vector_stores(orphan_vector_stores, key='orphan_vector_stores_grid')
+    st.write(f"Number of orphan vector stores: {len(orphan_vector_stores)}")
+    if st.button('Delete selected vector stores'):
+        selected_rows = grid_response['selected_rows']
+        if not selected_rows.empty:
+            utils.bulk_delete('vector_stores', selected_rows['id'].tolist(), "Vector Store")
+        else:
+            st.write("No rows selected for deletion.")
+
+if __name__ == '__main__':
+    main()
+    utils.finish_profile()
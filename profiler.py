@@ -0,0 +1,216 @@
+import contextvars
+import cProfile
+import functools
+import os
+import threading
+import time
+import constants as c
+
+# Stages of a rerun in display order; time spent outside any stage is reported as "other"
+STAGES = ("api", "conversion", "dataframe", "grid_options", "grid_render")
+
+# The profile of the rerun in progress on this thread, if profiling is enabled
+current_profile = contextvars.ContextVar("current_profile", default=None)
+
+
+class _NullStage:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class RerunProfile:
+    """
+    RerunProfile holds the stage timings of one script rerun. Stages are timed exclusively: when a stage starts inside
+    another one, the outer stage is paused until the inner one ends, so the stage times never add up to more than the
+    rerun's wall time. Only the thread that started the rerun is timed; work handed to thread pools is attributed to
+    the stage the script thread is waiting in.
+
+    Attributes:
+        number (int): The rerun's sequence number within its session.
+        started_at (float): The epoch timestamp the rerun started at.
+        seconds (dict): The exclusive seconds spent in each stage, keyed by stage name.
+        total (float): The rerun's wall time in seconds, once finished.
+        interrupted (bool): Whether the rerun was cut short (e.g. by `st.rerun`) before reaching its end.
+        dump_path (str): The path of the rerun's cProfile dump, or None.
+    """
+
+    def __init__(self, number):
+        self.number = number
+        self.started_at = time.time()
+        self.seconds = {}
+        self.total = None
+        self.interrupted = False
+        self.dump_path = None
+        self._thread = threading.get_ident()
+        self._start = time.perf_counter()
+        self._stack = []
+        self._mark = self._start
+        self._last = self._start
+
+    def _charge(self, now):
+        if self._stack:
+            name = self._stack[-1]
+            self.seconds[name] = self.seconds.get(name, 0.0) + now - self._mark
+        self._mark = now
+
+    def enter(self, name):
+        self._charge(time.perf_counter())
+        self._stack.append(name)
+
+    def exit(self):
+        now = time.perf_counter()
+        self._charge(now)
+        self._stack.pop()
+        self._last = now
+
+    def stage(self, name):
+        """
+        Returns a context manager timing a stage of the rerun.
+        """
+        profile = self
+
+        class Stage:
+            def __enter__(self):
+                profile.enter(name)
+
+            def __exit__(self, exc_type, exc, traceback):
+                profile.exit()
+                return False
+
+        return Stage()
+
+    def finish(self, interrupted=False):
+        """
+        Ends the rerun. An interrupted rerun ends when its last stage did, since the time after that is not known.
+        """
+        now = self._last if interrupted else time.perf_counter()
+        while self._stack:
+            self._charge(now)
+            self._stack.pop()
+        self.interrupted = interrupted
+        self.total = now - self._start
+        self.seconds["other"] = max(0.0, self.total - sum(self.seconds.values()))
+
+    def breakdown(self):
+        """
+        Returns the rerun as a flat dictionary of milliseconds per stage, for display.
+        """
+        return {
+            "rerun": self.number,
+            "total ms": round(self.total * 1000, 1),
+            **{f"{name} ms": round(self.seconds.get(name, 0.0) * 1000, 1) for name in (*STAGES, "other")},
+            "interrupted": self.interrupted,
+        }
+
+
+def stage(name):
+    """
+    Returns a context manager timing a stage of the rerun in progress, or a no-op one when profiling is disabled or the
+    caller is not the rerun's thread.
+    """
+    profile = current_profile.get()
+    if profile is None or profile._thread != threading.get_ident():
+        return _NULL_STAGE
+    return profile.stage(name)
+
+
+def timed(name):
+    """
+    Decorator timing every call of a function as a stage of the rerun in progress (see `stage`).
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class RerunProfiler:
+    """
+    RerunProfiler keeps the stage timings of the last reruns of one session and, when asked to, profiles each rerun
+    with cProfile and keeps the dumps of the slowest ones on disk (as `.prof` files readable with `pstats` or
+    snakeviz), deleting dumps that drop out of the slowest set.
+
+    Attributes:
+        history (list): The last finished `RerunProfile`s, oldest first.
+        dumps (list): The `(seconds, path)` of the kept cProfile dumps, slowest first.
+    """
+
+    def __init__(self, history=c.PROFILE_HISTORY, keep=c.PROFILE_KEEP_SLOWEST, directory=None):
+        self.history = []
+        self.dumps = []
+        self._size = history
+        self._keep = keep
+        self._directory = directory or c.PROFILE_DIR
+        self._count = 0
+        self._profile = None
+        self._cprofile = None
+
+    def start(self, cprofile=False):
+        """
+        Starts profiling a rerun on the calling thread, first finishing a previous rerun that was interrupted.
+
+        Args:
+            cprofile (bool, optional): Whether to also run cProfile over the rerun. Defaults to False.
+
+        Returns:
+            RerunProfile: The profile of the new rerun.
+        """
+        if self._profile is not None:
+            self.finish(interrupted=True)
+        self._count += 1
+        self._profile = RerunProfile(self._count)
+        current_profile.set(self._profile)
+        if cprofile:
+            self._cprofile = cProfile.Profile()
+            try:
+                self._cprofile.enable()
+            except ValueError:
+                # Another profiler is already active on this interpreter
+                self._cprofile = None
+        return self._profile
+
+    def finish(self, interrupted=False):
+        """
+        Finishes the rerun in progress, if any, adds it to the history and keeps its cProfile dump if it is one of the
+        slowest reruns.
+
+        Returns:
+            RerunProfile: The finished profile, or None.
+        """
+        profile, self._profile = self._profile, None
+        if profile is None:
+            return None
+        if current_profile.get() is profile:
+            current_profile.set(None)
+        profile.finish(interrupted=interrupted)
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._keep_dump(profile, self._cprofile)
+            self._cprofile = None
+        self.history = (self.history + [profile])[-self._size:]
+        return profile
+
+    def _keep_dump(self, profile, cprofile):
+        if len(self.dumps) >= self._keep and profile.total <= self.dumps[-1][0]:
+            return
+        os.makedirs(self._directory, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.gmtime(profile.started_at))
+        path = os.path.join(self._directory, f"{stamp}-rerun{profile.number}-{round(profile.total * 1000)}ms.prof")
+        cprofile.dump_stats(path)
+        profile.dump_path = path
+        self.dumps = sorted(self.dumps + [(profile.total, path)], reverse=True)
+        for _, evicted in self.dumps[self._keep:]:
+            try:
+                os.remove(evicted)
+            except OSError:
+                pass
+        self.dumps = self.dumps[:self._keep]
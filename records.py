@@ -0,0 +1,154 @@
+import itertools
+
+
+class Record:
+    """
+    Record is the base of the compact representations of API objects kept in session state. Each subclass lists the
+    only fields the app reads in `__slots__`, so a record carries no per-instance `__dict__` and none of the nested
+    data of the full SDK object. Full objects are fetched on demand when a detail view needs them.
+    """
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for field in self.__slots__:
+            setattr(self, field, values.get(field))
+
+    @classmethod
+    def from_object(cls, obj):
+        """
+        Builds a record from an SDK object (or another record) by reading only the record's fields.
+        """
+        return cls(**{field: getattr(obj, field, None) for field in cls.__slots__})
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a record from the dictionary form of an API object, e.g. its cached JSON.
+        """
+        return cls(**{field: data.get(field) for field in cls.__slots__})
+
+    def __repr__(self):
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+
+class FileRecord(Record):
+    __slots__ = ("id", "filename", "purpose", "bytes", "status", "created_at")
+
+
+class VectorStoreRecord(Record):
+    __slots__ = ("id", "name", "status", "usage_bytes", "created_at", "last_active_at")
+
+
+class AssistantRecord(Record):
+    __slots__ = ("id", "name", "model", "instructions", "created_at")
+
+
+# Versions of record stores are drawn from one process-wide counter, so a store that replaces another (e.g. after a
+# reload) never reuses its version
+_versions = itertools.count(1)
+
+# Record type of each kind of object
+RECORD_TYPES = {
+    "assistants": AssistantRecord,
+    "vector_stores": VectorStoreRecord,
+    "files": FileRecord,
+}
+
+
+class RecordStore:
+    """
+    RecordStore holds the records of one kind of object in listing order, with an index from ID to position for O(1)
+    lookup. It behaves like a read-only sequence (`len`, iteration, indexing) so it can stand in for the lists of SDK
+    objects the app used to keep, and is updated in place with `upsert` and `remove`.
+
+    Attributes:
+        kind (str): One of "assistants", "vector_stores" or "files".
+        version (int): A number that changes whenever the records change, so views built from the store can be
+            cached until it does.
+    """
+    __slots__ = ("kind", "version", "_records", "_index")
+
+    def __init__(self, kind, objects=()):
+        """
+        Builds a store from SDK objects or records.
+
+        Args:
+            kind (str): One of "assistants", "vector_stores" or "files".
+            objects (iterable): The objects, in listing order. Defaults to an empty store.
+        """
+        self.kind = kind
+        self._records = [self._to_record(obj) for obj in objects]
+        self._reindex()
+        self.version = next(_versions)
+
+    def _to_record(self, obj):
+        record_type = RECORD_TYPES[self.kind]
+        return obj if isinstance(obj, record_type) else record_type.from_object(obj)
+
+    def _reindex(self):
+        self._index = {record.id: position for position, record in enumerate(self._records)}
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __getitem__(self, position):
+        return self._records[position]
+
+    def __contains__(self, object_id):
+        return object_id in self._index
+
+    def get(self, object_id, default=None):
+        """
+        Returns the record with the given ID, or `default` if there is none.
+        """
+        position = self._index.get(object_id)
+        return default if position is None else self._records[position]
+
+    def ids(self):
+        """
+        Returns the IDs of all records, in listing order.
+        """
+        return [record.id for record in self._records]
+
+    def upsert(self, objects):
+        """
+        Replaces the records with the same IDs as the given objects, and inserts the others where a fresh listing would
+        put them: at the end for assistants (listed oldest first) and at the front for files and vector stores (listed
+        newest first).
+
+        Args:
+            objects (iterable): The created or updated SDK objects or records.
+        """
+        created = []
+        updated = False
+        for obj in objects:
+            record = self._to_record(obj)
+            position = self._index.get(record.id)
+            if position is None:
+                created.append(record)
+            else:
+                self._records[position] = record
+                updated = True
+        if updated or created:
+            self.version = next(_versions)
+        if not created:
+            return
+        if self.kind == "assistants":
+            self._records.extend(created)
+        else:
+            self._records[:0] = reversed(created)
+        self._reindex()
+
+    def remove(self, ids):
+        """
+        Drops the records with the given IDs. Unknown IDs are ignored.
+        """
+        removed = set(ids) & self._index.keys()
+        if removed:
+            self._records = [record for record in self._records if record.id not in removed]
+            self._reindex()
+            self.version = next(_versions)
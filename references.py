@@ -0,0 +1,137 @@
+import asyncio
+import constants as c
+
+
+class ReferenceGraph:
+    """
+    ReferenceGraph indexes which vector stores hold which files and which assistants use which vector stores and files
+    (through their `file_search` and `code_interpreter` tool resources), in both directions. Orphans are then found with
+    set differences against the inventory rather than by scanning the references once per object.
+
+    Vector stores and files can also be attached to threads, which the API cannot list, so an orphan here is an object
+    that no vector store or assistant refers to. Only objects that existed when the graph was scanned can be orphans:
+    the references of objects created since then are not known.
+
+    Attributes:
+        vector_store_files (dict): The IDs of the files attached to each vector store, keyed by vector store ID.
+        assistant_vector_stores (dict): The IDs of the vector stores used by each assistant, keyed by assistant ID.
+        assistant_files (dict): The IDs of the code interpreter files of each assistant, keyed by assistant ID.
+        file_vector_stores (dict): The IDs of the vector stores holding each file, keyed by file ID.
+        vector_store_assistants (dict): The IDs of the assistants using each vector store, keyed by vector store ID.
+        file_assistants (dict): The IDs of the assistants using each file directly, keyed by file ID.
+        file_ids (set): The IDs of the files that existed when the graph was scanned, or None if not known.
+    """
+
+    def __init__(self, vector_store_files, assistant_vector_stores, assistant_files, file_ids=None):
+        """
+        Builds the graph and its reverse indexes from forward references.
+
+        Args:
+            vector_store_files (dict): The file IDs of each vector store, keyed by vector store ID.
+            assistant_vector_stores (dict): The vector store IDs of each assistant, keyed by assistant ID.
+            assistant_files (dict): The code interpreter file IDs of each assistant, keyed by assistant ID.
+            file_ids (iterable, optional): The IDs of the files that existed when the graph was scanned. Defaults to
+                None (every file is a candidate orphan).
+        """
+        self.vector_store_files = vector_store_files
+        self.assistant_vector_stores = assistant_vector_stores
+        self.assistant_files = assistant_files
+        self.file_vector_stores = self._reverse(vector_store_files)
+        self.vector_store_assistants = self._reverse(assistant_vector_stores)
+        self.file_assistants = self._reverse(assistant_files)
+        self.file_ids = None if file_ids is None else set(file_ids)
+
+    @staticmethod
+    def _reverse(references):
+        reverse = {}
+        for source, targets in references.items():
+            for target in targets:
+                reverse.setdefault(target, set()).add(source)
+        return reverse
+
+    @classmethod
+    async def scan(cls, async_janai, vector_store_ids, file_ids=None, max_concurrency=c.SCAN_CONCURRENCY):
+        """
+        Lists the files of every vector store and the tool resources of every assistant concurrently, with at most
+        `max_concurrency` listings in flight.
+
+        Args:
+            async_janai (AsyncJanAI): The client of the project to scan.
+            vector_store_ids (iterable): The IDs of the vector stores whose files to list.
+            file_ids (iterable, optional): The IDs of the project's files at the time of the scan, so that files
+                uploaded later are not taken for orphans. Defaults to None.
+            max_concurrency (int, optional): The maximum number of listings in flight. Defaults to c.SCAN_CONCURRENCY.
+
+        Returns:
+            ReferenceGraph: The references of the project.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def list_vector_store_files(vector_store_id):
+            async with semaphore:
+                return vector_store_id, {file.id async for file in async_janai.iter_vector_store_files(vector_store_id)}
+
+        async def list_assistants():
+            async with semaphore:
+                return [assistant async for assistant in async_janai.iter_assistants()]
+
+        assistants, *memberships = await asyncio.gather(
+            list_assistants(), *(list_vector_store_files(vector_store_id) for vector_store_id in vector_store_ids)
+        )
+        assistant_vector_stores = {}
+        assistant_files = {}
+        for assistant in assistants:
+            resources = assistant.tool_resources
+            file_search = resources and resources.file_search
+            code_interpreter = resources and resources.code_interpreter
+            assistant_vector_stores[assistant.id] = set(file_search and file_search.vector_store_ids or ())
+            assistant_files[assistant.id] = set(code_interpreter and code_interpreter.file_ids or ())
+        return cls(dict(memberships), assistant_vector_stores, assistant_files, file_ids=file_ids)
+
+    @staticmethod
+    def _referenced(references, sources):
+        """
+        Returns the union of the targets of the given sources, or of every source if `sources` is None.
+        """
+        if sources is None:
+            return set().union(*references.values())
+        return set().union(*(references[source] for source in set(sources) & references.keys()))
+
+    def orphan_files(self, files, vector_store_ids=None, assistant_ids=None, purposes=("assistants",)):
+        """
+        Returns the files that no vector store holds and no assistant uses, among those that existed at the scan.
+
+        Args:
+            files (iterable): The file records of the project.
+            vector_store_ids (iterable, optional): The IDs of the vector stores that still exist, so that files held
+                only by vector stores deleted since the scan count as orphans. Defaults to None (every scanned one).
+            assistant_ids (iterable, optional): The IDs of the assistants that still exist. Defaults to None (every
+                scanned one).
+            purposes (tuple, optional): The purposes of the files to consider; files uploaded for other purposes (e.g.
+                batch inputs) are not meant to be attached and are never orphans. Defaults to ("assistants",).
+
+        Returns:
+            list: The orphan file records, in the given order.
+        """
+        referenced = self._referenced(self.vector_store_files, vector_store_ids) | self._referenced(self.assistant_files, assistant_ids)
+        candidates = {file.id for file in files if file.purpose in purposes}
+        if self.file_ids is not None:
+            candidates &= self.file_ids
+        orphans = candidates - referenced
+        return [file for file in files if file.id in orphans]
+
+    def orphan_vector_stores(self, vector_stores, assistant_ids=None):
+        """
+        Returns the vector stores that no assistant uses, among those whose files were scanned.
+
+        Args:
+            vector_stores (iterable): The vector store records of the project.
+            assistant_ids (iterable, optional): The IDs of the assistants that still exist, so that vector stores used
+                only by assistants deleted since the scan count as orphans. Defaults to None (every scanned one).
+
+        Returns:
+            list: The orphan vector store records, in the given order.
+        """
+        candidates = {vector_store.id for vector_store in vector_stores} & self.vector_store_files.keys()
+        orphans = candidates - self._referenced(self.assistant_vector_stores, assistant_ids)
+        return [vector_store for vector_store in vector_stores if vector_store.id in orphans]
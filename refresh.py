@@ -0,0 +1,220 @@
+import queue
+import threading
+import time
+import constants as c
+from inventory import KINDS, SharedInventory
+from records import RECORD_TYPES
+
+
+def snapshot(kind, objects):
+    """
+    Returns the records of some objects keyed by ID, for diffing.
+    """
+    record_type = RECORD_TYPES[kind]
+    return {record.id: record for record in map(record_type.from_object, objects)}
+
+
+def key_fields(record):
+    """
+    Returns the values of a record's fields, the ones the app displays, so two records compare equal when nothing
+    displayed has changed.
+    """
+    return tuple(getattr(record, field) for field in record.__slots__)
+
+
+def diff(before, after):
+    """
+    Compares two snapshots of one kind by ID and key fields.
+
+    Args:
+        before (dict): The previous records keyed by ID.
+        after (dict): The current records keyed by ID.
+
+    Returns:
+        dict: The "upserted" records (created or with changed key fields) and the "removed" IDs, or None if nothing
+        changed.
+    """
+    upserted = [record for object_id, record in after.items() if object_id not in before or key_fields(before[object_id]) != key_fields(record)]
+    removed = [object_id for object_id in before if object_id not in after]
+    if not upserted and not removed:
+        return None
+    return {"upserted": upserted, "removed": removed}
+
+
+class RefreshWorker:
+    """
+    RefreshWorker polls the inventory of one project in a background thread and publishes what changed to every
+    subscribed session, so pages stay fresh without re-listing anything on a rerun.
+
+    Every c.REFRESH_INTERVAL seconds the worker syncs the project incrementally through `JanAI.sync_inventory`, which
+    only fetches the objects created since the newest one in the local inventory and goes through the project's
+    request scheduler. Every c.REFRESH_RECONCILE_INTERVAL seconds, or whenever the local inventory is due for it (see
+    `InventoryCache.needs_reconcile`), it lists the project completely instead, which also picks up objects changed or
+    deleted elsewhere. Each resulting inventory is diffed against the previous one by ID and key fields (see `diff`).
+    Only the changes are put on the subscribers' queues. A
+    new subscriber is first sent the difference between the state it already holds and the worker's latest listing
+    (or its first one, if it has not listed the project yet).
+
+    Workers are shared by every session of the process and created on first use with `for_project`. A worker stops,
+    and leaves the registry, once no subscriber has drained its queue for c.REFRESH_IDLE_TIMEOUT seconds.
+
+    Attributes:
+        project (str): The project ID, or None for the default project.
+        polled_at (float): The epoch timestamp of the last successful poll, or None.
+        error (str): The error of the last poll if it failed, or None.
+        stopped (bool): Whether the worker has stopped; its subscribers should subscribe to a new one.
+    """
+    _registry_lock = threading.Lock()
+    _workers = {}
+
+    def __init__(self, project=None, inventory=None, interval=None):
+        self.project = project
+        self.inventory = inventory
+        self.interval = interval or c.REFRESH_INTERVAL
+        self.polled_at = None
+        self.error = None
+        self.stopped = False
+        self._lock = threading.Lock()
+        self._snapshots = None
+        self._subscribers = {}
+        self._baselines = {}
+        self._wake = threading.Event()
+        self._thread = None
+        self._reconciled_at = time.monotonic()
+
+    @classmethod
+    def for_project(cls, project=None, inventory=None):
+        """
+        Returns the process-wide worker of a project, creating and starting it on first use.
+        """
+        with cls._registry_lock:
+            worker = cls._workers.get(project)
+            if worker is None:
+                worker = cls._workers[project] = cls(project, inventory)
+                worker._thread = threading.Thread(target=worker._run, name=f"janai-refresh-{project or 'default'}", daemon=True)
+                worker._thread.start()
+            return worker
+
+    def subscribe(self, current=None):
+        """
+        Registers a subscriber and returns its queue of changes.
+
+        Args:
+            current (dict, optional): The objects the subscriber already holds, keyed by kind. The difference between
+                them and the worker's latest listing is queued first, right away if the worker has listed the project
+                already or after its first listing otherwise. Defaults to None.
+
+        Returns:
+            queue.SimpleQueue: The queue the worker puts `{kind: {"upserted": [...], "removed": [...]}}` changes on.
+        """
+        changes = queue.SimpleQueue()
+        with self._lock:
+            self._subscribers[changes] = time.monotonic()
+            if current is not None:
+                baseline = {kind: snapshot(kind, current[kind]) for kind in KINDS if kind in current}
+                if self._snapshots is None:
+                    self._baselines[changes] = baseline
+                else:
+                    self._publish(changes, baseline, self._snapshots)
+        return changes
+
+    @staticmethod
+    def _publish(changes, before, after):
+        batch = {kind: change for kind in before if (change := diff(before[kind], after[kind])) is not None}
+        if batch:
+            changes.put(batch)
+        return batch
+
+    def unsubscribe(self, changes):
+        with self._lock:
+            self._subscribers.pop(changes, None)
+            self._baselines.pop(changes, None)
+
+    def drain(self, changes):
+        """
+        Returns every change queued for a subscriber since its last drain, merged per kind in order, and marks the
+        subscriber as alive.
+        """
+        with self._lock:
+            if changes in self._subscribers:
+                self._subscribers[changes] = time.monotonic()
+        merged = {}
+        while True:
+            try:
+                batch = changes.get_nowait()
+            except queue.Empty:
+                return merged
+            for kind, change in batch.items():
+                pending = merged.setdefault(kind, {"upserted": {}, "removed": set()})
+                for record in change["upserted"]:
+                    pending["upserted"][record.id] = record
+                    pending["removed"].discard(record.id)
+                for object_id in change["removed"]:
+                    pending["upserted"].pop(object_id, None)
+                    pending["removed"].add(object_id)
+
+    def poll(self):
+        """
+        Syncs the project once, completely if c.REFRESH_RECONCILE_INTERVAL seconds have passed since the last complete
+        listing and incrementally otherwise, publishes the changes since the previous poll and shares the inventory with
+        sessions loading the project (see `SharedInventory`).
+
+        Returns:
+            dict: The changes per kind (empty if nothing changed).
+        """
+        from janai import JanAI
+
+        janai = JanAI(inventory=self.inventory)
+        janai.set_project(self.project)
+        generation = SharedInventory.generation(self.project)
+        reconcile = time.monotonic() - self._reconciled_at > c.REFRESH_RECONCILE_INTERVAL
+        inventory = janai.sync_inventory(reconcile=reconcile)
+        if reconcile:
+            self._reconciled_at = time.monotonic()
+        snapshots = {kind: snapshot(kind, inventory[kind]) for kind in KINDS}
+        for kind in KINDS:
+            SharedInventory.put(self.project, kind, list(snapshots[kind].values()), generation=generation)
+        with self._lock:
+            previous, self._snapshots = self._snapshots, snapshots
+            for subscriber, baseline in self._baselines.items():
+                self._publish(subscriber, baseline, snapshots)
+            self._baselines.clear()
+            changes = {} if previous is None else {
+                kind: change for kind in KINDS if (change := diff(previous[kind], snapshots[kind])) is not None
+            }
+            if changes:
+                for subscriber in self._subscribers:
+                    subscriber.put(changes)
+        return changes
+
+    def _idle(self):
+        deadline = time.monotonic() - max(c.REFRESH_IDLE_TIMEOUT, 2 * self.interval)
+        with self._lock:
+            for subscriber, drained_at in list(self._subscribers.items()):
+                if drained_at < deadline:
+                    del self._subscribers[subscriber]
+                    self._baselines.pop(subscriber, None)
+            return not self._subscribers
+
+    def _run(self):
+        while True:
+            try:
+                self.poll()
+                self.polled_at = time.time()
+                self.error = None
+            except Exception as e:
+                self.error = str(e)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            with self._registry_lock:
+                if self._idle():
+                    self.stopped = True
+                    if self._workers.get(self.project) is self:
+                        del self._workers[self.project]
+                    return
+
+    def wake(self):
+        """
+        Makes the worker poll now instead of waiting for the end of its interval.
+        """
+        self._wake.set()
@@ -0,0 +1,181 @@
+"""
+Headless retention policy runner for JanAI.
+
+Evaluates declarative retention rules against the assistants, vector stores and files of a project, streamed page by
+page from the API, prints the plan and, with `--execute`, deletes the matching objects with bounded concurrency. Only
+the IDs of matching objects are kept in memory, so very large organizations can be processed.
+
+Each chunk of deletions runs as a journaled job (see `journal.BulkJob`): a chunk interrupted part-way, or with objects
+that could not be deleted, is offered for resuming on the Home page of the app.
+
+Usage:
+    python retention.py rules.json [--project proj_xxx] [--execute] [--max-workers 8]
+
+The rules file holds a list of rules (or an object with a "rules" list). Every condition of a rule must hold for an
+object to match it, and an object is deleted if it matches any rule:
+
+    [
+        {"kind": "files", "purpose": "batch", "older_than_days": 30},
+        {"kind": "files", "name": "tmp-*", "older_than_days": 1},
+        {"kind": "vector_stores", "idle_days": 14},
+        {"kind": "assistants", "name": "test *", "older_than_days": 7}
+    ]
+
+- kind: "assistants", "vector_stores" or "files" (required).
+- older_than_days: the object was created more than this many days ago.
+- idle_days: the vector store was last active more than this many days ago (vector stores only).
+- name: a shell-style pattern (`*`, `?`, `[...]`) the name, or the filename of files, must match.
+- purpose: the purpose a file must have (files only).
+"""
+import argparse
+import fnmatch
+import json
+import sys
+import time
+import constants as c
+from inventory import KINDS, InventoryCache
+from janai import JanAI
+from journal import BulkJob
+
+
+class RetentionRule:
+    """
+    RetentionRule is one declarative retention condition set for a kind of object.
+
+    Attributes:
+        kind (str): One of "assistants", "vector_stores" or "files".
+        older_than_days (float): The minimum age in days, or None.
+        idle_days (float): The minimum number of days since the vector store was last active, or None.
+        name (str): The shell-style pattern the name or filename must match, or None.
+        purpose (str): The purpose a file must have, or None.
+    """
+    FIELDS = ("kind", "older_than_days", "idle_days", "name", "purpose")
+
+    def __init__(self, kind, older_than_days=None, idle_days=None, name=None, purpose=None):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown kind {kind!r}; expected one of {', '.join(KINDS)}")
+        if idle_days is not None and kind != "vector_stores":
+            raise ValueError("idle_days only applies to vector_stores")
+        if purpose is not None and kind != "files":
+            raise ValueError("purpose only applies to files")
+        if older_than_days is None and idle_days is None and name is None and purpose is None:
+            raise ValueError(f"A {kind} rule needs at least one condition; it would match every object")
+        self.kind = kind
+        self.older_than_days = older_than_days
+        self.idle_days = idle_days
+        self.name = name
+        self.purpose = purpose
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a rule from its JSON form, rejecting unknown keys.
+        """
+        unknown = set(data) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown rule keys: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    def matches(self, obj, now):
+        """
+        Returns True if an object satisfies every condition of the rule.
+
+        Args:
+            obj: An SDK object of the rule's kind.
+            now (float): The current epoch timestamp.
+        """
+        if self.older_than_days is not None and now - obj.created_at <= self.older_than_days * 86400:
+            return False
+        if self.idle_days is not None and now - (obj.last_active_at or obj.created_at) <= self.idle_days * 86400:
+            return False
+        if self.name is not None:
+            name = obj.filename if self.kind == "files" else obj.name
+            if not fnmatch.fnmatchcase(name or "", self.name):
+                return False
+        if self.purpose is not None and obj.purpose != self.purpose:
+            return False
+        return True
+
+    def __str__(self):
+        return json.dumps({field: getattr(self, field) for field in self.FIELDS if getattr(self, field) is not None})
+
+
+def load_rules(path):
+    """
+    Reads the rules file and returns its rules.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data["rules"]
+    return [RetentionRule.from_dict(rule) for rule in data]
+
+
+def plan(janai, rules, kind, now, out=sys.stdout):
+    """
+    Streams one kind of object from the API and prints the objects matching any rule.
+
+    Args:
+        janai (JanAI): The client of the project.
+        rules (list): The rules of this kind.
+        kind (str): One of "assistants", "vector_stores" or "files".
+        now (float): The current epoch timestamp.
+        out: The stream to print the plan to. Defaults to stdout.
+
+    Returns:
+        tuple: The IDs of the matching objects, the number of objects scanned and the bytes the matches hold.
+    """
+    matched = []
+    scanned = 0
+    size = 0
+    for obj in getattr(janai, f"iter_{kind}")():
+        scanned += 1
+        for index, rule in enumerate(rules):
+            if rule.matches(obj, now):
+                matched.append(obj.id)
+                size += getattr(obj, "bytes", None) or getattr(obj, "usage_bytes", None) or 0
+                name = obj.filename if kind == "files" else obj.name
+                print(f"delete {kind} {obj.id} {name!r} created {time.strftime('%Y-%m-%d', time.gmtime(obj.created_at))} (rule {index + 1})", file=out)
+                break
+    return matched, scanned, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("rules", help="path of the JSON rules file")
+    parser.add_argument("--project", help="project ID to clean up (defaults to the key's default project)")
+    parser.add_argument("--execute", action="store_true", help="delete the matching objects instead of only printing the plan")
+    parser.add_argument("--max-workers", type=int, default=c.BULK_DELETE_WORKERS, help="maximum number of deletions in flight")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="number of objects deleted per bulk delete")
+    args = parser.parse_args()
+
+    rules = load_rules(args.rules)
+    janai = JanAI(inventory=InventoryCache())
+    janai.set_project(args.project)
+
+    now = time.time()
+    failures = 0
+    for kind in KINDS:
+        kind_rules = [rule for rule in rules if rule.kind == kind]
+        if not kind_rules:
+            continue
+        matched, scanned, size = plan(janai, kind_rules, kind, now)
+        print(f"# {kind}: {len(matched)} of {scanned} match, {size} bytes", file=sys.stderr)
+        if not args.execute:
+            continue
+        # Deleting only once the listing is complete keeps the pagination cursor valid
+        for start in range(0, len(matched), args.chunk_size):
+            job = BulkJob.create("retention", janai.project, {kind: matched[start:start + args.chunk_size]})
+            result = janai.run_job(job, max_workers=args.max_workers)[kind]
+            failures += len(result["failed"])
+            for object_id, error in result["failed"].items():
+                print(f"# failed to delete {kind} {object_id}: {error}", file=sys.stderr)
+            print(f"# {kind}: processed {min(start + args.chunk_size, len(matched))} of {len(matched)}", file=sys.stderr)
+
+    if not args.execute:
+        print("# dry run: nothing was deleted; pass --execute to delete", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
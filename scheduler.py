@@ -0,0 +1,321 @@
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+import constants as c
+
+# Durations in rate limit reset headers, e.g. "1s", "6m0s" or "120ms"
+DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_duration(value):
+    """
+    Returns the number of seconds in a rate limit reset header value, or None if it cannot be parsed.
+    """
+    parts = DURATION_PART.findall(value or "")
+    if not parts:
+        return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class RequestScheduler:
+    """
+    RequestScheduler paces the API requests of one project, shared by every JanAI and AsyncJanAI instance (and thread)
+    of the process. It combines:
+
+    - a token bucket sized from the `x-ratelimit-*-requests` response headers, so requests are spread over the
+      window instead of exhausting it and then failing;
+    - an adaptive concurrency limit (additive increase on success, multiplicative decrease on throttling), so bulk
+      jobs converge on the highest concurrency the account sustains without tuning worker counts;
+    - retries of transient errors (429s, connection errors, timeouts and 5xx responses) with full-jitter exponential
+      backoff, honouring `retry-after` headers, instead of failing the whole operation on the first error.
+
+    Schedulers are created on first use with `for_project`; the response headers of every request on the pooled HTTP
+    transports are fed to them through `observe`.
+
+    Attributes:
+        project (str): The project ID, or None for the default project.
+    """
+    _registry_lock = threading.Lock()
+    _schedulers = {}
+
+    def __init__(self, project=None):
+        self.project = project
+        self._condition = threading.Condition()
+        self._limit = float(c.SCHEDULER_INITIAL_CONCURRENCY)
+        self._inflight = 0
+        self._rate = None
+        self._capacity = None
+        self._tokens = 0.0
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._decreased_at = 0.0
+        self._async_waiters = {}
+
+    @classmethod
+    def for_project(cls, project=None):
+        """
+        Returns the process-wide scheduler of a project, creating it on first use.
+
+        The default project (None) resolves to the `OPENAI_PROJECT_ID` environment variable when it is set, as it does
+        for the OpenAI clients, so a request and its response (see `observe`) always share one scheduler.
+        """
+        project = project or os.environ.get("OPENAI_PROJECT_ID") or None
+        with cls._registry_lock:
+            if project not in cls._schedulers:
+                cls._schedulers[project] = cls(project)
+            return cls._schedulers[project]
+
+    @classmethod
+    def observe(cls, response):
+        """
+        Updates the scheduler of the response's project from its rate limit headers. Installed as a response event hook
+        on the pooled HTTP transports.
+        """
+        headers = response.headers
+        if "x-ratelimit-limit-requests" not in headers:
+            return
+        project = response.request.headers.get("openai-project") or None
+        cls.for_project(project).update_limits(
+            headers.get("x-ratelimit-limit-requests"),
+            headers.get("x-ratelimit-remaining-requests"),
+            headers.get("x-ratelimit-reset-requests"),
+        )
+
+    @classmethod
+    async def async_observe(cls, response):
+        """
+        Async counterpart of `observe`, for the event hooks of async HTTP transports.
+        """
+        cls.observe(response)
+
+    def update_limits(self, limit, remaining, reset):
+        """
+        Resizes the token bucket from the request rate limit headers of a response.
+
+        Args:
+            limit (str): The `x-ratelimit-limit-requests` header: the requests allowed per minute.
+            remaining (str): The `x-ratelimit-remaining-requests` header: the requests left in the window.
+            reset (str): The `x-ratelimit-reset-requests` header: the time until the window is fully replenished.
+        """
+        try:
+            limit = int(limit)
+            remaining = int(remaining) if remaining is not None else None
+        except ValueError:
+            return
+        if limit <= 0:
+            return
+        with self._condition:
+            self._refill(time.monotonic())
+            self._capacity = float(limit)
+            self._rate = limit / 60
+            if remaining is not None:
+                self._tokens = min(float(remaining), self._capacity)
+                if remaining == 0:
+                    self._block(parse_duration(reset) or 1 / self._rate)
+            self._notify()
+
+    def limits(self):
+        """
+        Returns the current concurrency limit, requests in flight and request rate (per second, or None if unknown).
+        """
+        with self._condition:
+            return {"concurrency": int(self._limit), "inflight": self._inflight, "rate": self._rate}
+
+    def _refill(self, now):
+        if self._rate is not None:
+            self._tokens = min(self._capacity, self._tokens + (now - self._refilled_at) * self._rate)
+        self._refilled_at = now
+
+    def _block(self, seconds):
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    @staticmethod
+    def _wake(waiter):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def _notify(self):
+        """
+        Wakes every waiter, in any thread or event loop, to try again. Must be called with the condition held.
+        """
+        self._condition.notify_all()
+        for waiter, loop in self._async_waiters.items():
+            loop.call_soon_threadsafe(self._wake, waiter)
+        self._async_waiters.clear()
+
+    def _try_acquire(self):
+        """
+        Takes a slot if one is free, returning 0, or returns the seconds to wait before trying again (None to wait for a
+        request to finish). Must be called with the condition held.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self._inflight >= int(self._limit):
+            return None
+        if self._rate is not None and self._tokens < 1:
+            return (1 - self._tokens) / self._rate
+        self._inflight += 1
+        if self._rate is not None:
+            self._tokens -= 1
+        return 0
+
+    def acquire(self):
+        """
+        Blocks until the project may send another request.
+        """
+        with self._condition:
+            while (wait := self._try_acquire()) != 0:
+                self._condition.wait(wait)
+
+    async def async_acquire(self):
+        """
+        Async counterpart of `acquire`, which waits without blocking the event loop: for exactly the seconds
+        `_try_acquire` asks for, or until a release or new limits wake it up, whichever comes first.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                wait = self._try_acquire()
+                if wait == 0:
+                    return
+                waiter = loop.create_future()
+                self._async_waiters[waiter] = loop
+            try:
+                await asyncio.wait((waiter,), timeout=wait)
+            finally:
+                with self._condition:
+                    self._async_waiters.pop(waiter, None)
+
+    def release(self, throttled=False, retry_after=None):
+        """
+        Gives back a slot after a request, adjusting the concurrency limit: up by one per limit's worth of successful
+        requests, or halved (at most once per second) when the request was throttled.
+
+        Args:
+            throttled (bool, optional): Whether the request was rejected with a 429. Defaults to False.
+            retry_after (float, optional): The seconds the API asked to wait before retrying. Defaults to None.
+        """
+        with self._condition:
+            self._inflight -= 1
+            if throttled:
+                now = time.monotonic()
+                if now - self._decreased_at > 1:
+                    self._limit = max(1.0, self._limit / 2)
+                    self._decreased_at = now
+                if retry_after:
+                    self._block(retry_after)
+            else:
+                self._limit = min(float(c.SCHEDULER_MAX_CONCURRENCY), self._limit + 1 / self._limit)
+            self._notify()
+
+    @staticmethod
+    def _classify(error):
+        """
+        Returns `(transient, throttled, retry_after)` for an error raised by the SDK.
+        """
+        import openai
+
+        retry_after = None
+        response = getattr(error, "response", None)
+        if response is not None:
+            headers = response.headers
+            try:
+                if "retry-after-ms" in headers:
+                    retry_after = float(headers["retry-after-ms"]) / 1000
+                elif "retry-after" in headers:
+                    retry_after = float(headers["retry-after"])
+            except ValueError:
+                pass
+        if isinstance(error, openai.RateLimitError):
+            # An exhausted quota does not recover by waiting
+            return getattr(error, "code", None) != "insufficient_quota", True, retry_after
+        if isinstance(error, openai.APIConnectionError):
+            return True, False, retry_after
+        if isinstance(error, openai.APIStatusError):
+            return error.status_code in (408, 409) or error.status_code >= 500, False, retry_after
+        return False, False, None
+
+    def _retry_delay(self, attempt, retry_after):
+        backoff = random.uniform(0, min(c.SCHEDULER_BACKOFF_MAX, c.SCHEDULER_BACKOFF_BASE * 2 ** attempt))
+        return max(backoff, retry_after or 0)
+
+    def call(self, method, *args, **kwargs):
+        """
+        Calls an SDK method once a slot is free, retrying transient errors up to c.SCHEDULER_MAX_RETRIES times.
+
+        Args:
+            method: The SDK method to call, e.g. `client.files.delete`.
+            *args, **kwargs: The arguments of the call.
+
+        Returns:
+            The result of the call.
+        """
+        for attempt in range(c.SCHEDULER_MAX_RETRIES + 1):
+            self.acquire()
+            try:
+                result = method(*args, **kwargs)
+            except Exception as e:
+                transient, throttled, retry_after = self._classify(e)
+                self.release(throttled=throttled, retry_after=retry_after)
+                if not transient or attempt == c.SCHEDULER_MAX_RETRIES:
+                    raise
+                time.sleep(self._retry_delay(attempt, retry_after))
+                continue
+            except BaseException:
+                self.release()
+                raise
+            self.release()
+            return result
+
+    async def async_call(self, method, *args, **kwargs):
+        """
+        Async counterpart of `call`, for the coroutine methods of `AsyncOpenAI`.
+        """
+        for attempt in range(c.SCHEDULER_MAX_RETRIES + 1):
+            await self.async_acquire()
+            try:
+                result = await method(*args, **kwargs)
+            except Exception as e:
+                transient, throttled, retry_after = self._classify(e)
+                self.release(throttled=throttled, retry_after=retry_after)
+                if not transient or attempt == c.SCHEDULER_MAX_RETRIES:
+                    raise
+                await asyncio.sleep(self._retry_delay(attempt, retry_after))
+                continue
+            except BaseException:
+                # e.g. the task was cancelled
+                self.release()
+                raise
+            self.release()
+            return result
+
+    def slot(self):
+        """
+        Returns a context manager holding a slot for a request that cannot go through `call`, such as a streamed
+        download. The request is not retried. It can be used with `with` or, from a coroutine, with `async with`.
+        """
+        scheduler = self
+
+        class Slot:
+            def __enter__(self):
+                scheduler.acquire()
+
+            def __exit__(self, exc_type, exc, traceback):
+                throttled, retry_after = False, None
+                if exc is not None:
+                    _, throttled, retry_after = scheduler._classify(exc)
+                scheduler.release(throttled=throttled, retry_after=retry_after)
+
+            async def __aenter__(self):
+                await scheduler.async_acquire()
+
+            async def __aexit__(self, exc_type, exc, traceback):
+                self.__exit__(exc_type, exc, traceback)
+
+        return Slot()
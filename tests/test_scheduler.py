@@ -0,0 +1,244 @@
+"""
+Unit tests of `scheduler.RequestScheduler`: token bucket refill, throttling backoff and recovery of the concurrency
+limit, and the waits of `acquire` and `async_acquire`.
+
+Usage:
+    python -m pytest tests
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import constants as c
+from scheduler import RequestScheduler, parse_duration
+
+
+def limited(per_minute, remaining, reset=None):
+    """
+    Returns a scheduler whose token bucket was sized from rate limit headers.
+    """
+    scheduler = RequestScheduler()
+    scheduler.update_limits(str(per_minute), str(remaining), reset)
+    return scheduler
+
+
+def test_parse_duration():
+    assert parse_duration("1s") == 1
+    assert parse_duration("6m0s") == 360
+    assert parse_duration("120ms") == 0.12
+    assert parse_duration("") is None
+    assert parse_duration(None) is None
+
+
+def test_bucket_refills_at_the_advertised_rate():
+    # 600 requests per minute refill one token every 0.1 seconds
+    scheduler = limited(600, 1)
+    assert scheduler._try_acquire() == 0
+    scheduler.release()
+    wait = scheduler._try_acquire()
+    assert 0.09 < wait <= 0.1
+    time.sleep(wait)
+    assert scheduler._try_acquire() == 0
+
+
+def test_bucket_never_exceeds_its_capacity():
+    scheduler = limited(60, 60)
+    scheduler._refilled_at -= 3600
+    scheduler._refill(time.monotonic())
+    assert scheduler._tokens == 60
+
+
+def test_exhausted_window_blocks_until_reset():
+    scheduler = limited(600, 0, "200ms")
+    wait = scheduler._try_acquire()
+    assert 0.15 < wait <= 0.2
+
+
+def spy_waits(monkeypatch):
+    """
+    Records the timeout of every `asyncio.wait` of the scheduler module, so tests can check how long `async_acquire`
+    asked to wait without depending on how long the wait actually took.
+    """
+    import scheduler
+
+    timeouts = []
+    wait = asyncio.wait
+
+    def spy(aws, timeout=None, **kwargs):
+        timeouts.append(timeout)
+        return wait(aws, timeout=timeout, **kwargs)
+
+    monkeypatch.setattr(scheduler.asyncio, "wait", spy)
+    return timeouts
+
+
+def test_acquire_waits_for_the_deficit():
+    scheduler = limited(600, 0, "100ms")
+    start = time.monotonic()
+    scheduler.acquire()
+    # Generous upper bound: only the lower one is guaranteed on a loaded machine
+    assert 0.09 < time.monotonic() - start < 2
+
+
+def test_async_acquire_sleeps_for_the_exact_deficit(monkeypatch):
+    timeouts = spy_waits(monkeypatch)
+    scheduler = limited(600, 0, "100ms")
+
+    async def acquire():
+        start = time.monotonic()
+        await scheduler.async_acquire()
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(acquire())
+    assert elapsed > 0.09
+    assert 0.09 < timeouts[0] <= 0.1
+
+
+def test_async_acquire_wakes_up_on_release(monkeypatch):
+    timeouts = spy_waits(monkeypatch)
+    scheduler = RequestScheduler()
+    scheduler._limit = 1.0
+    scheduler.acquire()
+    released = []
+
+    def release():
+        time.sleep(0.05)
+        released.append(time.monotonic())
+        scheduler.release()
+
+    async def acquire():
+        threading.Thread(target=release).start()
+        await scheduler.async_acquire()
+        return time.monotonic()
+
+    acquired = asyncio.run(acquire())
+    # Waiting for a release has no timeout, so only the release can have woken it up
+    assert timeouts == [None]
+    assert acquired >= released[0]
+    assert scheduler._async_waiters == {}
+
+
+def test_cancelled_async_acquire_leaves_no_waiter():
+    scheduler = RequestScheduler()
+    scheduler._limit = 1.0
+    scheduler.acquire()
+
+    async def acquire():
+        task = asyncio.ensure_future(scheduler.async_acquire())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(acquire())
+    assert scheduler._async_waiters == {}
+    assert scheduler.limits()["inflight"] == 1
+
+
+def test_default_project_resolves_like_the_clients(monkeypatch):
+    import httpx
+
+    monkeypatch.setattr(RequestScheduler, "_schedulers", {})
+    monkeypatch.setenv("OPENAI_PROJECT_ID", "proj_env")
+    request = httpx.Request("GET", "https://api.openai.com/v1/files", headers={"openai-project": "proj_env"})
+    headers = {"x-ratelimit-limit-requests": "600", "x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "1s"}
+    RequestScheduler.observe(httpx.Response(200, headers=headers, request=request))
+    assert RequestScheduler.for_project(None) is RequestScheduler.for_project("proj_env")
+    assert RequestScheduler.for_project(None).limits()["rate"] == 10
+
+
+def test_throttling_halves_the_limit_at_most_once_per_second():
+    scheduler = RequestScheduler()
+    scheduler._limit = 16.0
+    for _ in range(3):
+        scheduler.acquire()
+    scheduler.release(throttled=True)
+    scheduler.release(throttled=True)
+    assert scheduler.limits()["concurrency"] == 8
+    scheduler._decreased_at -= 2
+    scheduler.release(throttled=True)
+    assert scheduler.limits()["concurrency"] == 4
+
+
+def test_throttling_never_drops_below_one_request():
+    scheduler = RequestScheduler()
+    scheduler._limit = 1.0
+    scheduler.acquire()
+    scheduler.release(throttled=True)
+    assert scheduler.limits()["concurrency"] == 1
+
+
+def test_retry_after_blocks_new_requests():
+    scheduler = RequestScheduler()
+    scheduler.acquire()
+    scheduler.release(throttled=True, retry_after=0.2)
+    assert 0.15 < scheduler._try_acquire() <= 0.2
+
+
+def test_limit_recovers_additively_after_throttling():
+    scheduler = RequestScheduler()
+    scheduler._limit = 4.0
+    # One limit's worth of successful requests raises the limit by about one
+    for _ in range(4):
+        scheduler.acquire()
+        scheduler.release()
+    assert scheduler.limits()["concurrency"] == 4
+    assert 4.8 < scheduler._limit < 5
+    for _ in range(100):
+        scheduler.acquire()
+        scheduler.release()
+    assert scheduler.limits()["concurrency"] > 10
+
+
+def test_limit_recovery_is_capped():
+    scheduler = RequestScheduler()
+    scheduler._limit = float(c.SCHEDULER_MAX_CONCURRENCY)
+    scheduler.acquire()
+    scheduler.release()
+    assert scheduler.limits()["concurrency"] == c.SCHEDULER_MAX_CONCURRENCY
+
+
+def test_backoff_grows_exponentially_up_to_its_cap():
+    scheduler = RequestScheduler()
+    for attempt in range(12):
+        bound = min(c.SCHEDULER_BACKOFF_MAX, c.SCHEDULER_BACKOFF_BASE * 2 ** attempt)
+        assert all(0 <= scheduler._retry_delay(attempt, None) <= bound for _ in range(50))
+    assert scheduler._retry_delay(0, 5) >= 5
+
+
+def test_call_retries_transient_errors(monkeypatch):
+    import httpx
+    import openai
+
+    monkeypatch.setattr(c, "SCHEDULER_BACKOFF_BASE", 0.001)
+    scheduler = RequestScheduler()
+    attempts = []
+
+    def flaky():
+        attempts.append(None)
+        if len(attempts) < 3:
+            raise openai.APIConnectionError(request=httpx.Request("GET", "https://api.openai.com/v1/files"))
+        return "ok"
+
+    assert scheduler.call(flaky) == "ok"
+    assert len(attempts) == 3
+    assert scheduler.limits()["inflight"] == 0
+
+
+def test_call_does_not_retry_other_errors():
+    scheduler = RequestScheduler()
+    attempts = []
+
+    def broken():
+        attempts.append(None)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        scheduler.call(broken)
+    assert len(attempts) == 1
+    assert scheduler.limits()["inflight"] == 0
@@ -1,23 +1,31 @@
-import hashlib
+import os
+import time
 import streamlit as st
-from st_aggrid import AgGrid, GridOptionsBuilder
-import pandas as pd
-from datetime import datetime, timezone
 import constants as c
-from janai import JanAI  # Assuming JanAI is defined and accessible
+from janai import JanAI, content_hash  # Assuming JanAI is defined and accessible
+from inventory import InventoryCache, KINDS, SharedInventory
+from journal import BulkJob
+from metrics import Metrics
+import profiler
+from profiler import RerunProfiler
+from records import RECORD_TYPES, RecordStore
+from refresh import RefreshWorker, key_fields
 
 class JanAIUtils:
     @staticmethod
     def init_session_state():
+        JanAIUtils.start_profile()
         # Initialize session state variables if they don't exist
+        if not os.environ.get("OPENAI_API_KEY"):
+            st.error("OPENAI_API_KEY is not set. Add it to `.env` and restart the app.")
+            st.stop()
         if 'janai' not in st.session_state:
-            st.session_state.janai = JanAI()
-        if 'assistants' not in st.session_state:
-            st.session_state.assistants = st.session_state.janai.list_assistants(order='asc', limit=100)
-        if 'vector_stores' not in st.session_state:
-            st.session_state.vector_stores = st.session_state.janai.list_vector_stores()
-        if 'files' not in st.session_state:
-            st.session_state.files = st.session_state.janai.list_files()
+            st.session_state.janai = JanAI(inventory=JanAIUtils.inventory_cache())
+        if not all(kind in st.session_state for kind in KINDS):
+            # Read the local inventory and sync the three kinds concurrently on the first render
+            for kind, objects in JanAIUtils.load_inventory().items():
+                if kind not in st.session_state:
+                    st.session_state[kind] = objects
         if 'update_grid' not in st.session_state:
             st.session_state.update_grid = True
         if 'file_processed' not in st.session_state:
@@ -26,7 +34,273 @@ class JanAIUtils:
             st.session_state.last_file_hash = ''
         if 'grid_key' not in st.session_state:  # Initialize grid_key in session state
             st.session_state.grid_key = "grid"
+        JanAIUtils.auto_refresh()
+        JanAIUtils.display_metrics()
+        JanAIUtils.show_bulk_delete_reports()
         
+    @staticmethod
+    def auto_refresh():
+        """
+        Keeps the inventory in session state fresh in the background when "Auto-refresh" is switched on in the sidebar
+        (or c.AUTO_REFRESH is set).
+
+        The session subscribes to the `RefreshWorker` of the current project, which syncs the project every
+        c.REFRESH_INTERVAL seconds in its own thread and publishes only what changed. A fragment in the sidebar applies
+        the published changes every c.REFRESH_DRAIN_INTERVAL seconds (see `apply_refresh`), so reruns never wait for a
+        listing and the grids only rerender when something did change.
+        """
+        enabled = st.sidebar.toggle("Auto-refresh", value=c.AUTO_REFRESH, key='auto_refresh',
+                                    help=f"List the project every {c.REFRESH_INTERVAL:.0f} seconds in the background and apply what changed")
+        subscription = st.session_state.get('refresh_subscription')
+        project = st.session_state.janai.project
+        if subscription is not None and (not enabled or subscription['worker'].project != project or subscription['worker'].stopped):
+            subscription['worker'].unsubscribe(subscription['changes'])
+            subscription = st.session_state.refresh_subscription = None
+        if not enabled:
+            return
+        if subscription is None:
+            worker = RefreshWorker.for_project(project, JanAIUtils.inventory_cache())
+            changes = worker.subscribe({kind: st.session_state[kind] for kind in KINDS})
+            st.session_state.refresh_subscription = {'worker': worker, 'changes': changes}
+        with st.sidebar:
+            JanAIUtils.apply_refresh()
+
+    @staticmethod
+    @st.fragment(run_every=c.REFRESH_DRAIN_INTERVAL)
+    def apply_refresh():
+        """
+        Applies the changes the refresh worker published since the last check to the inventory in session state, and
+        reruns the page only if a record was actually added, changed or removed. Changes the session already made itself
+        (e.g. a delete) are skipped, and so are the changes of a project the session has switched away from since it
+        subscribed.
+        """
+        subscription = st.session_state.get('refresh_subscription')
+        if subscription is None:
+            return
+        worker = subscription['worker']
+        if worker.project != st.session_state.janai.project:
+            worker.unsubscribe(subscription['changes'])
+            st.session_state.refresh_subscription = None
+            return
+        changed = False
+        for kind, change in worker.drain(subscription['changes']).items():
+            store = st.session_state[kind]
+            upserted = [
+                record for record in change['upserted'].values()
+                if (current := store.get(record.id)) is None or key_fields(current) != key_fields(record)
+            ]
+            removed = [object_id for object_id in change['removed'] if object_id in store]
+            if not upserted and not removed:
+                continue
+            store.remove(removed)
+            store.upsert(upserted)
+            if kind == 'assistants':
+                # Cached details of changed assistants are fetched again when the form needs them
+                details = st.session_state.get('assistant_details', {})
+                for object_id in [*removed, *(record.id for record in upserted)]:
+                    details.pop(object_id, None)
+            changed = True
+        if worker.error:
+            st.caption(f"Auto-refresh failed: {worker.error}")
+        elif worker.polled_at:
+            st.caption(f"Auto-refreshed at {time.strftime('%H:%M:%S', time.localtime(worker.polled_at))}")
+        if changed:
+            st.rerun()
+
+    @staticmethod
+    def display_metrics():
+        """
+        Displays the API call metrics of the process (see `metrics.Metrics`) in a sidebar panel: calls, errors,
+        p50/p99 latency and bytes per operation and project, with downloads in Prometheus and JSON format.
+        """
+        import pandas as pd
+
+        with st.sidebar.expander("API metrics"):
+            snapshot = Metrics.snapshot()
+            if not snapshot:
+                st.write("No API calls yet.")
+                return
+            st.dataframe(pd.DataFrame({
+                'operation': [series['operation'] for series in snapshot],
+                'project': [series['project'] for series in snapshot],
+                'calls': [series['calls'] for series in snapshot],
+                'errors': [series['errors'] for series in snapshot],
+                'p50 ms': [round(series['p50_seconds'] * 1000, 1) for series in snapshot],
+                'p99 ms': [round(series['p99_seconds'] * 1000, 1) for series in snapshot],
+                'sent': JanAIUtils.bytes_to_readable_array([series['bytes_sent'] for series in snapshot]),
+                'received': JanAIUtils.bytes_to_readable_array([series['bytes_received'] for series in snapshot]),
+            }), hide_index=True)
+            col1, col2 = st.columns(2)
+            with col1:
+                st.download_button("Prometheus", Metrics.render_prometheus(), file_name="janai_metrics.prom", mime="text/plain")
+            with col2:
+                st.download_button("JSON", Metrics.render_json(), file_name="janai_metrics.json", mime="application/json")
+
+    @staticmethod
+    def start_profile():
+        """
+        Starts timing the stages of this rerun when profiling is enabled, with c.PROFILE or the "Profile reruns" toggle
+        in the sidebar. Pages call `finish_profile` at the end of the script.
+        """
+        enabled = st.sidebar.toggle("Profile reruns", value=bool(c.PROFILE), key='profile_reruns',
+                                    help="Time the stages of every rerun (API calls, conversion, DataFrame build, grid options, grid render)")
+        if not enabled:
+            rerun_profiler = st.session_state.pop('profiler', None)
+            if rerun_profiler is not None:
+                rerun_profiler.finish(interrupted=True)
+            return
+        dump = st.sidebar.checkbox("Keep cProfile dumps of the slowest reruns", value=c.PROFILE == "cprofile", key='profile_dumps')
+        if 'profiler' not in st.session_state:
+            st.session_state.profiler = RerunProfiler()
+        st.session_state.profiler.start(cprofile=dump)
+
+    @staticmethod
+    def finish_profile():
+        """
+        Finishes timing this rerun and displays the stage breakdown of the last reruns in a sidebar panel, newest first
+        and in milliseconds, with the paths of the kept cProfile dumps.
+        """
+        import pandas as pd
+
+        rerun_profiler = st.session_state.get('profiler')
+        if rerun_profiler is None:
+            return
+        rerun_profiler.finish()
+        with st.sidebar.expander("Rerun profile", expanded=True):
+            st.dataframe(pd.DataFrame([profile.breakdown() for profile in reversed(rerun_profiler.history)]), hide_index=True)
+            if rerun_profiler.dumps:
+                st.caption("Slowest reruns (cProfile):")
+                for seconds, path in rerun_profiler.dumps:
+                    st.text(f"{seconds * 1000:.0f} ms  {path}")
+
+    @staticmethod
+    @st.cache_resource
+    def inventory_cache():
+        """
+        Returns the process-wide local inventory, opened once and shared by every session.
+        """
+        return InventoryCache()
+
+    @staticmethod
+    def show_loading_preview(placeholder, label, loaded):
+        """
+        Renders the running count and the latest page of a listing into a placeholder while it is still paginating.
+
+        Only the last c.PAGE_SIZE objects are rendered, so the preview costs the same on every page instead of growing
+        with the number of objects loaded so far.
+
+        Parameters:
+        - placeholder: The `st.empty()` placeholder to render into.
+        - label (str): A human-readable name for the objects being loaded, e.g. "files".
+        - loaded (list): The objects loaded so far.
+        """
+        import pandas as pd
+
+        with placeholder.container():
+            st.caption(f"Loading {label}... {len(loaded)} so far")
+            st.dataframe(pd.DataFrame([{
+                'id': obj.id,
+                'name': getattr(obj, 'name', None) or getattr(obj, 'filename', None),
+            } for obj in loaded[-c.PAGE_SIZE:]]), hide_index=True, height=200)
+
+    @staticmethod
+    def load_inventory(kinds=KINDS, reconcile=False):
+        """
+        Loads the assistants, vector stores and files of the current project from the local inventory.
+
+        Inventories are shared by every session of the process through `SharedInventory`: a kind another session loaded
+        less than c.SHARED_INVENTORY_TTL seconds ago (and that nobody changed since) is reused, and sessions loading the
+        same project at the same time wait for one sync instead of each running their own.
+
+        Other kinds are synced concurrently on `AsyncJanAI` through `JanAI.sync_inventory`: normally only objects newer
+        than the newest cached one are fetched, while a full listing (which also drops objects deleted elsewhere) runs
+        on first use, every c.RECONCILE_INTERVAL seconds, or when `reconcile` is set. Full listings preview their rows
+        as their pages arrive.
+
+        Parameters:
+        - kinds (tuple): The kinds to load, out of "assistants", "vector_stores" and "files". Defaults to all three.
+        - reconcile (bool): Force a full listing of every requested kind. Defaults to False.
+
+        Returns:
+        - dict: A `RecordStore` of compact records per kind.
+        """
+        labels = {'assistants': "assistants", 'vector_stores': "vector stores", 'files': "files"}
+        janai = st.session_state.janai
+        placeholders = {kind: st.empty() for kind in kinds}
+
+        def fetch(missing):
+            inventory = janai.sync_inventory(
+                kinds=missing,
+                reconcile=reconcile,
+                on_page=lambda kind, loaded: JanAIUtils.show_loading_preview(placeholders[kind], labels[kind], loaded),
+            )
+            with profiler.stage('conversion'):
+                return {kind: [RECORD_TYPES[kind].from_object(obj) for obj in objects] for kind, objects in inventory.items()}
+
+        inventory = SharedInventory.get(janai.project, kinds, fetch, force=reconcile)
+        for placeholder in placeholders.values():
+            placeholder.empty()
+        with profiler.stage('conversion'):
+            return {kind: RecordStore(kind, inventory[kind]) for kind in kinds}
+
+    @staticmethod
+    def load_files(reconcile=True):
+        return JanAIUtils.load_inventory(('files',), reconcile=reconcile)['files']
+
+    @staticmethod
+    def load_vector_stores(reconcile=True):
+        return JanAIUtils.load_inventory(('vector_stores',), reconcile=reconcile)['vector_stores']
+
+    @staticmethod
+    def load_assistants(reconcile=True):
+        return JanAIUtils.load_inventory(('assistants',), reconcile=reconcile)['assistants']
+
+    @staticmethod
+    def apply_changes(kind, upserted=(), removed_ids=(), rerun=True):
+        """
+        Patches one inventory in session state in place after a mutation, instead of re-listing it from the API.
+
+        Removed IDs are dropped, and created or updated objects replace the record with the same ID or are inserted where
+        a fresh listing would put them (see `RecordStore.upsert`). Updated assistants also replace their cached details.
+        A full re-list only happens on an explicit reload.
+
+        Parameters:
+        - kind (str): One of "assistants", "vector_stores" or "files".
+        - upserted (iterable): The created or updated objects, as returned by the `JanAI` mutation methods.
+        - removed_ids (iterable): The IDs of deleted objects.
+        - rerun (bool): Whether to rerun the Streamlit script so the grids reflect the change. Defaults to True.
+        """
+        store = st.session_state[kind]
+        store.remove(removed_ids)
+        store.upsert(upserted)
+        if kind == 'assistants':
+            details = st.session_state.setdefault('assistant_details', {})
+            for object_id in removed_ids:
+                details.pop(object_id, None)
+            details.update({assistant.id: assistant for assistant in upserted})
+        st.session_state.update_grid = not st.session_state.update_grid
+        if rerun:
+            st.rerun()
+
+    @staticmethod
+    def assistant_details(assistant_id):
+        """
+        Returns the full assistant object for the detail form, fetching it from the API on first use.
+
+        Session state only keeps compact records of the assistants, so the complete object (tools, tool resources,
+        sampling parameters, ...) is retrieved lazily when the form needs it and cached for the rest of the session.
+
+        Parameters:
+        - assistant_id (str): The ID of the assistant.
+
+        Returns:
+        - The assistant object as returned by the OpenAI API.
+        """
+        details = st.session_state.setdefault('assistant_details', {})
+        if assistant_id not in details:
+            details[assistant_id] = st.session_state.janai.retrieve_assistant(assistant_id)
+        return details[assistant_id]
+
     @staticmethod
     def convert(obj):
         """
@@ -103,35 +377,235 @@ class JanAIUtils:
         # If the size exceeds petabytes, it's still formatted in petabytes.
         # This is the upper limit of this method's conversion logic.
         return f"{bytes:.2f} PB"
-    
-    def delete_all_resources():
-        # Delete all assistants
-        for assistant in st.session_state.assistants:
-            st.session_state.janai.delete_assistant(assistant.id)
-        st.write("All assistants deleted.")
-
-        # Delete all vector stores
-        for vector_store in st.session_state.vector_stores:
-            st.session_state.janai.delete_vector_store(vector_store.id)
-        st.write("All vector stores deleted.")
-
-        # Delete all files
-        for file in st.session_state.files:
-            st.session_state.janai.delete_file(file.id)
-        st.write("All files deleted.")
-
-        # Refresh the lists in session state
-        st.session_state.assistants = st.session_state.janai.list_assistants()
-        st.session_state.vector_stores = st.session_state.janai.list_vector_stores()
-        st.session_state.files = st.session_state.janai.list_files()
-        st.session_state.update_grid = True
+
+    @staticmethod
+    def bytes_to_readable_array(values):
+        """
+        Vectorized version of `bytes_to_readable` for a whole column of byte sizes.
+
+        The unit of every value is found at once by counting how many powers of 1024 it reaches, and the scaled values
+        are formatted with NumPy string operations instead of a Python loop per row.
+
+        Parameters:
+        - values (array-like): The sizes in bytes. Missing values are treated as 0.
+
+        Returns:
+        - numpy.ndarray: The human-readable sizes, e.g. `'2.00 KB'`.
+        """
+        import numpy as np
+
+        units = np.array(['B', 'KB', 'MB', 'GB', 'TB', 'PB'])
+        values = np.nan_to_num(np.asarray(values, dtype=float))
+        exponents = np.zeros(values.shape, dtype=int)
+        for power in range(1, len(units)):
+            exponents += values >= 1024.0 ** power
+        scaled = values / 1024.0 ** exponents
+        return np.char.add(np.char.mod('%.2f ', scaled), units[exponents])
+
+    @staticmethod
+    def format_timestamps(values, fmt='%d/%m/%Y %H:%M UTC'):
+        """
+        Formats a whole column of Unix timestamps as UTC date strings in one vectorized pass.
+
+        Parameters:
+        - values (array-like): The timestamps in seconds. Missing values become empty strings.
+        - fmt (str): The `strftime` format. Defaults to `'%d/%m/%Y %H:%M UTC'`.
+
+        Returns:
+        - numpy.ndarray: The formatted timestamps.
+        """
+        import pandas as pd
+
+        timestamps = pd.to_datetime(pd.Series(values, dtype='float64'), unit='s', utc=True)
+        return timestamps.dt.strftime(fmt).fillna('').to_numpy()
+
+    @staticmethod
+    def sort_column(column):
+        """
+        Returns the name of the hidden column holding the raw values a formatted column is sorted by.
+
+        The frame builders keep these values as regular columns rather than in `df.attrs`, which pandas deep-copies into
+        every frame derived from the frame (filters, windows, selections). They are hidden in the grid and skipped by the
+        filter and sort controls of `show_grid`.
+        """
+        return c.SORT_COLUMN_PREFIX + column
+
+    @staticmethod
+    def display_columns(df):
+        """
+        Returns the columns of a frame that are displayed, i.e. every column but the hidden sort columns.
+        """
+        return [column for column in df.columns if not column.startswith(c.SORT_COLUMN_PREFIX)]
+
+    @staticmethod
+    def files_frame(files):
+        """
+        Builds the display frame of the files grid column by column.
+
+        Only the displayed attributes are read from each object, and the timestamp and size columns are formatted with
+        vectorized operations rather than converting every object to a dictionary and formatting it row by row.
+
+        Parameters:
+        - files (list): The file objects.
+
+        Returns:
+        - pandas.DataFrame: The `id`, `filename`, `bytes` and `created_at` columns. The raw sizes and timestamps are kept in
+          hidden sort columns (see `sort_column`) so that `show_grid` can sort the formatted columns correctly.
+        """
+        import pandas as pd
+
+        sizes = [file.bytes for file in files]
+        created = [file.created_at for file in files]
+        df = pd.DataFrame({
+            'id': [file.id for file in files],
+            'filename': [file.filename for file in files],
+            'bytes': JanAIUtils.bytes_to_readable_array(sizes),
+            'created_at': JanAIUtils.format_timestamps(created),
+            JanAIUtils.sort_column('bytes'): sizes,
+            JanAIUtils.sort_column('created_at'): created,
+        })
+        return df
+
+    @staticmethod
+    def vector_stores_frame(vector_stores):
+        """
+        Builds the display frame of the vector stores grid column by column (see `files_frame`).
+
+        Parameters:
+        - vector_stores (list): The vector store objects.
+
+        Returns:
+        - pandas.DataFrame: The `id`, `name`, `usage_bytes`, `created_at` and `last_active_at` columns.
+        """
+        import pandas as pd
+
+        sizes = [vector_store.usage_bytes for vector_store in vector_stores]
+        created = [vector_store.created_at for vector_store in vector_stores]
+        last_active = [vector_store.last_active_at for vector_store in vector_stores]
+        df = pd.DataFrame({
+            'id': [vector_store.id for vector_store in vector_stores],
+            'name': [vector_store.name for vector_store in vector_stores],
+            'usage_bytes': JanAIUtils.bytes_to_readable_array(sizes),
+            'created_at': JanAIUtils.format_timestamps(created),
+            'last_active_at': JanAIUtils.format_timestamps(last_active),
+            JanAIUtils.sort_column('usage_bytes'): sizes,
+            JanAIUtils.sort_column('created_at'): created,
+            JanAIUtils.sort_column('last_active_at'): last_active,
+        })
+        return df
+
+    @staticmethod
+    def assistants_frame(assistants):
+        """
+        Builds the display frame of the assistants grid column by column (see `files_frame`).
+
+        Parameters:
+        - assistants (list): The assistant objects.
+
+        Returns:
+        - pandas.DataFrame: The `id`, `created_at`, `instructions` and `name` columns.
+        """
+        import pandas as pd
+
+        created = [assistant.created_at for assistant in assistants]
+        df = pd.DataFrame({
+            'id': [assistant.id for assistant in assistants],
+            'created_at': JanAIUtils.format_timestamps(created, fmt='%d/%m/%y %H:%M'),
+            'instructions': [assistant.instructions for assistant in assistants],
+            'name': [assistant.name for assistant in assistants],
+            JanAIUtils.sort_column('created_at'): created,
+        })
+        return df
+
+    @staticmethod
+    def report_bulk_delete(label, result):
+        """
+        Keeps the outcome of a bulk delete in session state until `show_bulk_delete_reports` writes it to the page.
+
+        Deletions are followed by `apply_changes`, whose rerun would wipe anything written to the page before it, so the
+        report is written on the next run instead (see `init_session_state`).
+
+        Parameters:
+        - label (str): A human-readable name for the deleted objects, e.g. "File".
+        - result (dict): The result of one of the `JanAI.bulk_delete_*` methods.
+        """
+        st.session_state.setdefault('bulk_delete_reports', []).append((label, result))
+
+    @staticmethod
+    def show_bulk_delete_reports():
+        """
+        Writes the bulk delete outcomes kept by `report_bulk_delete` to the page, once.
+        """
+        for label, result in st.session_state.pop('bulk_delete_reports', []):
+            st.write(f"Deleted {label} IDs:", result['deleted'])
+            if result['failed']:
+                st.error(f"Failed to delete {len(result['failed'])} {label.lower()}(s):")
+                st.write(result['failed'])
+
+    @staticmethod
+    def bulk_delete(kind, ids, label):
+        """
+        Deletes objects of one kind as a journaled job (see `journal.BulkJob`), reports the outcome and removes the
+        deleted objects from the inventory in session state. Objects that could not be deleted leave the job unfinished,
+        so it is offered for resuming on the Home page.
+
+        Parameters:
+        - kind (str): One of "assistants", "vector_stores" or "files".
+        - ids (list): The IDs of the objects to delete.
+        - label (str): A human-readable name for the objects, e.g. "File".
+        """
+        janai = st.session_state.janai
+        job = BulkJob.create(f"delete {label.lower()}s", janai.project, {kind: ids})
+        result = janai.run_job(job)[kind]
+        JanAIUtils.report_bulk_delete(label, result)
+        JanAIUtils.apply_changes(kind, removed_ids=result['deleted'])
+
+    def delete_all_resources(job=None):
+        """
+        Deletes every assistant, vector store and file of the current project as a journaled job (see `journal.BulkJob`),
+        so an interrupted run can be resumed with `delete_all_resources(job)` without re-listing the project.
+
+        Parameters:
+        - job (BulkJob): An unfinished job to resume. Defaults to None (plan a new job from the inventory in session state).
+        """
+        janai = st.session_state.janai
+        if job is None:
+            job = BulkJob.create("clear project", janai.project, {kind: st.session_state[kind].ids() for kind in KINDS})
+        results = janai.run_job(job)
+
+        for kind, label in [('assistants', "Assistant"), ('vector_stores', "Vector Store"), ('files', "File")]:
+            if kind in results:
+                JanAIUtils.report_bulk_delete(label, results[kind])
+                JanAIUtils.apply_changes(kind, removed_ids=results[kind]['deleted'], rerun=False)
+        JanAIUtils.show_bulk_delete_reports()
+        if not job.finished:
+            st.warning(f"{job.remaining()} object(s) could not be deleted; the job can be resumed from the Home page.")
+
+    @staticmethod
+    def display_unfinished_jobs():
+        """
+        Offers to resume or discard the unfinished bulk jobs of the current project, e.g. after the app was stopped in
+        the middle of clearing a project.
+        """
+        for job in BulkJob.unfinished(st.session_state.janai.project):
+            started = time.strftime('%d/%m/%Y %H:%M UTC', time.gmtime(job.created_at))
+            st.warning(f"An unfinished '{job.name}' job started on {started} has {job.remaining()} object(s) left.")
+            col1, col2, _ = st.columns([1, 1, 8])
+            with col1:
+                if st.button('Resume', key=f'resume_{job.path}'):
+                    JanAIUtils.delete_all_resources(job)
+            with col2:
+                if st.button('Discard', key=f'discard_{job.path}'):
+                    job.finish()
+                    st.rerun()
     
     def file_hash(file):
         """
         Calculates the SHA-256 hash of a file's contents.
 
-        This function reads the entire content of a file, calculates its SHA-256 hash, and then returns the hexadecimal
-        representation of this hash. It ensures the file's read pointer is reset to its original position after reading.
+        This function reads the file in chunks of c.HASH_CHUNK_SIZE bytes, so memory use does not grow with the file
+        size, and returns the hexadecimal representation of the hash. It resets the file's read pointer to the start
+        after reading.
 
         Parameters:
         - file (file-like object): The file for which to calculate the hash. This should be an open file object.
@@ -140,156 +614,331 @@ class JanAIUtils:
         - str: The hexadecimal string representation of the SHA-256 hash of the file's contents.
         """
         file.seek(0)
-        hash_obj = hashlib.sha256()
-        hash_obj.update(file.read())
-        file.seek(0)
-        return hash_obj.hexdigest()
+        return content_hash(file)
 
-    def display_files():
+    def grid_frame(kind, objects, build):
+        """
+        Returns the display frame and grid options of an inventory, built once per inventory version.
+
+        Reruns that did not change the inventory (a widget interaction, a project selectbox, a form slider, ...) reuse the
+        frame and grid options built for the same `RecordStore.version` instead of rebuilding them. One entry is kept per
+        kind in session state, and any mutation or reload of the store changes its version. Objects that are not a
+        `RecordStore` (e.g. a filtered list) are built every time.
+
+        Parameters:
+        - kind (str): One of "assistants", "vector_stores" or "files".
+        - objects (iterable): The objects to display, usually the `RecordStore` of the kind in session state.
+        - build (callable): Called as `build(objects)` to build the `(df, grid_options)` pair.
+
+        Returns:
+        - tuple: The frame and the grid options. They are shared across reruns and must not be modified.
+        """
+        version = getattr(objects, 'version', None)
+        cache = st.session_state.setdefault('grid_frames', {})
+        cached = cache.get(kind)
+        if version is not None and cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+        df, grid_options = build(objects)
+        if version is not None:
+            cache[kind] = (version, df, grid_options)
+        return df, grid_options
+
+    def show_grid(df, grid_options, key):
+        """
+        Renders a frame with AgGrid, paging it in Python when it is too large to send to the browser in one go.
+
+        Frames up to c.GRID_PAGE_THRESHOLD rows are sent whole. Larger frames get filter, sort and paging controls above
+        the grid: the filter (a case-insensitive substring match on every displayed column), the sort (using the raw values
+        of the hidden sort columns for formatted columns) and the paging are applied to the cached frame in Python, and
+        only the visible window of rows is sent to the frontend. The IDs of selected rows are kept in session state per
+        grid and merged with the selection of the visible window on every rerun, so selections survive paging, sorting
+        and filtering and bulk actions see every selected row.
+
+        Parameters:
+        - df (pandas.DataFrame): The frame to display. Must have an `id` column.
+        - grid_options (dict): The AgGrid options built for the frame's columns.
+        - key (str): A unique key for the grid, also used to keep its paging and selection state.
+
+        Returns:
+        - dict: The `selected_rows` across all pages as a DataFrame (empty if nothing is selected) and the raw AgGrid
+          response under `grid`.
+        """
+        import numpy as np
+        from st_aggrid import AgGrid
+
+        def grid_height(rows):
+            return min(max(rows * 30 + 60, 100), 600)
+
+        if len(df) <= c.GRID_PAGE_THRESHOLD:
+            with profiler.stage('grid_render'):
+                # AgGrid adds a row ID column to the frame and layout keys to the options, so it gets copies of the cached ones
+                grid = AgGrid(df.copy(deep=False), gridOptions=dict(grid_options), height=grid_height(len(df)), width='100%', update_mode='MODEL_CHANGED', fit_columns_on_grid_load=True, key=key)
+            selected_rows = grid['selected_rows']
+            return {'selected_rows': selected_rows if selected_rows is not None else df.iloc[0:0], 'grid': grid}
+
+        selected = st.session_state.setdefault(f'{key}_selected', set())
+        selected &= set(df['id'])
+
+        columns = JanAIUtils.display_columns(df)
+        filter_col, sort_col, order_col, size_col, page_col = st.columns([3, 2, 1.2, 1.2, 1.2])
+        with filter_col:
+            query = st.text_input("Filter", key=f'{key}_filter', placeholder="Search all columns")
+        with sort_col:
+            sort_by = st.selectbox("Sort by", ['(none)', *columns], key=f'{key}_sort')
+        with order_col:
+            descending = st.toggle("Descending", key=f'{key}_descending')
+        with size_col:
+            page_size = st.selectbox("Rows per page", c.GRID_PAGE_SIZES, key=f'{key}_page_size')
+
+        positions = np.arange(len(df))
+        if query:
+            matches = np.zeros(len(df), dtype=bool)
+            for column in columns:
+                matches |= df[column].astype(str).str.contains(query, case=False, regex=False).to_numpy()
+            positions = positions[matches]
+        if sort_by != '(none)':
+            values = df[JanAIUtils.sort_column(sort_by) if JanAIUtils.sort_column(sort_by) in df else sort_by]
+            order = values.iloc[positions].reset_index(drop=True).sort_values(ascending=not descending, na_position='last', kind='stable').index
+            positions = positions[order.to_numpy()]
+
+        page_count = max(1, -(-len(positions) // page_size))
+        with page_col:
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1, key=f'{key}_page') - 1
+        window = df.iloc[positions[page * page_size:(page + 1) * page_size]].reset_index(drop=True)
+
+        options = {**grid_options, 'initialState': {**grid_options.get('initialState', {}), 'rowSelection': [
+            str(position) for position in np.flatnonzero(window['id'].isin(selected))
+        ]}}
+        # The window is part of the key so that a selection returned for one window is never applied to another
+        with profiler.stage('grid_render'):
+            grid = AgGrid(window, gridOptions=options, height=grid_height(len(window)), width='100%', update_mode='MODEL_CHANGED', fit_columns_on_grid_load=True,
+                          key=f'{key}_{query}_{sort_by}_{descending}_{page_size}_{page}')
+        if 'nodes' in grid.grid_response:
+            page_selected = grid['selected_rows']
+            selected -= set(window['id'])
+            selected |= set(page_selected['id']) if page_selected is not None else set()
+
+        st.caption(f"Rows {page * page_size + 1 if len(positions) else 0}-{min((page + 1) * page_size, len(positions))} of {len(positions)}"
+                   f" (page {page + 1} of {page_count}) · {len(selected)} selected")
+        return {'selected_rows': df[df['id'].isin(selected)], 'grid': grid}
+
+    def display_files(files=None, key='files_grid'):
         """
         Displays a list of files in a Streamlit app using the AgGrid component.
 
-        This function converts a list of file metadata into a pandas DataFrame, then formats certain columns for better readability
-        (e.g., converting byte sizes to a human-readable format and formatting timestamps). It uses the AgGrid component to display
+        This function builds a pandas DataFrame of the file metadata column by column (see `files_frame`), formatting certain columns
+        for better readability (e.g., converting byte sizes to a human-readable format and formatting timestamps). It uses the AgGrid component to display
         the DataFrame in a grid format, allowing for interactive sorting and selection. The grid's columns are configured for
         display properties and order.
 
+        Parameters:
+        - files (iterable): The files to display. Defaults to every file of the project in session state.
+        - key (str): A unique key for the grid. Defaults to 'files_grid'.
+
         Returns:
         - Grid response object from AgGrid, containing information about the grid state, including selected rows.
         """
-        files_converted = [JanAIUtils.convert(file) for file in st.session_state.files]
-        for file in files_converted:
-            # Convert 'created_at' to datetime and then format it
-            if 'created_at' in file:
-                # Ensure the datetime is timezone-aware in UTC
-                utc_datetime = pd.to_datetime(file['created_at'], unit='s', utc=True)
-                file['created_at'] = utc_datetime.strftime('%d/%m/%Y %H:%M') + " UTC"        # Convert 'bytes' to a human-readable format
-            if 'bytes' in file:
-                file['bytes'] = JanAIUtils.bytes_to_readable(file['bytes'])
-        
-        df = pd.DataFrame(files_converted)
+        from st_aggrid import GridOptionsBuilder
+
+        def build(files):
+            with profiler.stage('dataframe'):
+                df = JanAIUtils.files_frame(files)
         
-        gb = GridOptionsBuilder.from_dataframe(df)
-        # Hide all columns initially
-        gb.configure_columns(df.columns, hide=True)
-        # Specify the order and visibility of columns
-        column_order = ['id', 'filename', 'bytes', 'created_at']
-        for column in column_order:
-            match column:
-                case "id":
-                    # Configure 'id' column
-                    gb.configure_column("id", hide=False, width=c.COL_WIDTHS['id'])
-                case "filename":
-                    # Configure 'filename' column
-                    gb.configure_column("name", hide=False, width=c.COL_WIDTHS['name'])
-                case "bytes":
-                    # Configure 'bytes' column with specific width
-                    gb.configure_column("bytes", hide=False, width=c.COL_WIDTHS['bytes'])
-                case "created_at":
-                    # Configure 'created_at' column
-                    gb.configure_column("created_at", hide=False, width=c.COL_WIDTHS['datetime'])
-                case _:
-                    # Default configuration for any other column
-                    gb.configure_column(column, hide=False)
+            with profiler.stage('grid_options'):
+                gb = GridOptionsBuilder.from_dataframe(df)
+                # Hide all columns initially
+                gb.configure_columns(df.columns, hide=True)
+                # Specify the order and visibility of columns
+                column_order = ['id', 'filename', 'bytes', 'created_at']
+                for column in column_order:
+                    match column:
+                        case "id":
+                            # Configure 'id' column
+                            gb.configure_column("id", hide=False, width=c.COL_WIDTHS['id'])
+                        case "filename":
+                            # Configure 'filename' column
+                            gb.configure_column("filename", hide=False, width=c.COL_WIDTHS['name'])
+                        case "bytes":
+                            # Configure 'bytes' column with specific width
+                            gb.configure_column("bytes", hide=False, width=c.COL_WIDTHS['bytes'])
+                        case "created_at":
+                            # Configure 'created_at' column
+                            gb.configure_column("created_at", hide=False, width=c.COL_WIDTHS['datetime'])
+                        case _:
+                            # Default configuration for any other column
+                            gb.configure_column(column, hide=False)
                     
-        grid_options = gb.build()
-        # Correctly reorder the columnDefs based on column_order
-        # First, create a mapping of field names to column definitions
-        field_to_colDef = {colDef['field']: colDef for colDef in grid_options['columnDefs']}
-        # Then, reorder columnDefs using the column_order list
-        grid_options['columnDefs'] = [field_to_colDef[column] for column in column_order if column in field_to_colDef]
-
-        grid_options['rowSelection'] = 'multiple'
-        base_height_per_row = 30
-        header_height = 60
-        dynamic_height = min(max(len(df) * base_height_per_row + header_height, 100), 600)
-        # grid_response = AgGrid(df, gridOptions=grid_options, height=dynamic_height, width='100%', update_mode='MODEL_CHANGED', fit_columns_on_grid_load=True)
-        grid_response = AgGrid(df, gridOptions=grid_options, height=dynamic_height, width='100%', update_mode='MODEL_CHANGED', fit_columns_on_grid_load=True)
-        return grid_response
+                grid_options = gb.build()
+                # Correctly reorder the columnDefs based on column_order
+                # First, create a mapping of field names to column definitions
+                field_to_colDef = {colDef['field']: colDef for colDef in grid_options['columnDefs']}
+                # Then, reorder columnDefs using the column_order list
+                grid_options['columnDefs'] = [field_to_colDef[column] for column in column_order if column in field_to_colDef]
+
+                grid_options['rowSelection'] = 'multiple'
+            return df, grid_options
 
+        df, grid_options = JanAIUtils.grid_frame('files', st.session_state.files if files is None else files, build)
+        return JanAIUtils.show_grid(df, grid_options, key=key)
 
-    def refresh_files():
+
+    def display_duplicate_files():
         """
-        Refreshes the list of files displayed in the Streamlit app.
+        Displays the groups of duplicate files of the current project, with actions to index existing files by content
+        hash and to delete every duplicate but the oldest file of each content group.
 
-        This function updates the global session state with a new list of files by calling a method to list files from an external
-        source (e.g., a database or file storage system). It then triggers a rerun of the Streamlit app to reflect the updated file list.
+        Groups matched on filename, size and purpose only (files whose content could not be hashed) are listed as likely
+        duplicates and are never deleted automatically.
         """
-        st.session_state.files = st.session_state.janai.list_files()
-        st.session_state.update_grid = not st.session_state.update_grid
-        st.rerun()
-
-
-    def display_vector_stores():
-        vs_converted = [JanAIUtils.convert(vector_store) for vector_store in st.session_state.vector_stores]
-        for vector_store in vs_converted:
-            for key in ['created_at', 'last_active_at']:
-                if key in vector_store:
-                    # Ensure the datetime is timezone-aware in UTC
-                    utc_datetime = pd.to_datetime(vector_store[key], unit='s', utc=True)
-                    vector_store[key] = utc_datetime.strftime('%d/%m/%Y %H:%M') + " UTC"
-                if 'bytes' in vector_store:
-                    vector_store['bytes'] = JanAIUtils.bytes_to_readable(vector_store['bytes'])
-        
-        df = pd.DataFrame([JanAIUtils.convert(vector_store) for vector_store in st.session_state.vector_stores])
-        gb = GridOptionsBuilder.from_dataframe(df)
-        
-        gb.configure_columns(df.columns, hide=True)
-        column_order = ['id', 'name', 'usage_bytes', 'created_at', 'last_active_at']
-        for column in column_order:
-            match column:
-                case "id":
-                    # Configure 'id' column
-                    gb.configure_column("id", hide=False, width=c.COL_WIDTHS['id'])
-                case "name":
-                    # Configure 'filename' column
-                    gb.configure_column("name", hide=False, width=c.COL_WIDTHS['name'])
-                case "usage_bytes":
-                    # Configure 'bytes' column with specific width
-                    gb.configure_column("usage_bytes", hide=False, width=c.COL_WIDTHS['bytes'])
-                case "created_at":
-                    # Configure 'created_at' column
-                    gb.configure_column("created_at", hide=False, width=c.COL_WIDTHS['datetime'])
-                case "last_active_at":
-                    # Configure 'created_at' column
-                    gb.configure_column("last_active_at", hide=False, width=c.COL_WIDTHS['datetime'])
-                case _:
-                    # Default configuration for any other column
-                    gb.configure_column(column, hide=False)
-        
-        grid_options = gb.build()
-        # Correctly reorder the columnDefs based on column_order
-        # First, create a mapping of field names to column definitions
-        field_to_colDef = {colDef['field']: colDef for colDef in grid_options['columnDefs']}
-        # Then, reorder columnDefs using the column_order list
-        grid_options['columnDefs'] = [field_to_colDef[column] for column in column_order if column in field_to_colDef]
+        import pandas as pd
 
-        grid_options['rowSelection'] = 'multiple'
+        janai = st.session_state.janai
+        col1, col2, _ = st.columns([2, 2, 6])
+        with col1:
+            if st.button('Index existing files'):
+                progress = st.progress(0.0, text="Hashing files...")
+                result = janai.backfill_file_hashes(on_progress=lambda done, total: progress.progress(done / total, text=f"Hashing files... {done} of {total}"))
+                progress.empty()
+                st.write(f"Hashed {len(result['hashed'])} file(s); {len(result['unavailable'])} file(s) cannot be downloaded and are matched by name and size.")
+                if result['failed']:
+                    st.error(f"Failed to hash {len(result['failed'])} file(s):")
+                    st.write(result['failed'])
 
-        # Calculate dynamic height
-        base_height_per_row = 30  # Example height per row in pixels
-        header_height = 60  # Approximate height for headers and padding
-        dynamic_height = min(max(len(df) * base_height_per_row + header_height, 100), 600)  # Set min and max height
+        groups = janai.duplicate_files()
+        if not groups:
+            st.write("No duplicate files found.")
+            return
+        redundant = [file for group in groups if group['match'] == 'content' for file in group['files'][1:]]
+        st.write(f"{len(groups)} group(s) of duplicate files; deleting the {len(redundant)} exact duplicate(s) would free "
+                 f"{JanAIUtils.bytes_to_readable(sum(file.bytes or 0 for file in redundant))}.")
+        st.dataframe(pd.DataFrame({
+            'match': ['identical content' if group['match'] == 'content' else 'same name and size' for group in groups],
+            'filename': [group['files'][0].filename for group in groups],
+            'copies': [len(group['files']) for group in groups],
+            'size': JanAIUtils.bytes_to_readable_array([group['files'][0].bytes or 0 for group in groups]),
+            'keep': [group['files'][0].id for group in groups],
+            'duplicates': [', '.join(file.id for file in group['files'][1:]) for group in groups],
+        }), use_container_width=True, hide_index=True)
+        with col2:
+            if redundant and st.button('Delete exact duplicates'):
+                JanAIUtils.bulk_delete('files', [file.id for file in redundant], "File")
 
-        grid_response = AgGrid(df, gridOptions=grid_options, height=dynamic_height, width='100%', update_mode='MODEL_CHANGED', fit_columns_on_grid_load=True)
-        return grid_response
+    def display_vector_stores(vector_stores=None, key='vector_stores_grid'):
+        from st_aggrid import GridOptionsBuilder
 
-    def refresh_vector_stores():
-        st.session_state.vector_stores = st.session_state.janai.list_vector_stores()
-        # Explicitly trigger a rerender of the grid by toggling the update_grid state
-        st.session_state.update_grid = not st.session_state.update_grid
-        # Force Streamlit to rerender the page, which includes the grid
-        st.rerun()
+        def build(vector_stores):
+            with profiler.stage('dataframe'):
+                df = JanAIUtils.vector_stores_frame(vector_stores)
+            with profiler.stage('grid_options'):
+                gb = GridOptionsBuilder.from_dataframe(df)
         
+                gb.configure_columns(df.columns, hide=True)
+                column_order = ['id', 'name', 'usage_bytes', 'created_at', 'last_active_at']
+                for column in column_order:
+                    match column:
+                        case "id":
+                            # Configure 'id' column
+                            gb.configure_column("id", hide=False, width=c.COL_WIDTHS['id'])
+                        case "name":
+                            # Configure 'filename' column
+                            gb.configure_column("name", hide=False, width=c.COL_WIDTHS['name'])
+                        case "usage_bytes":
+                            # Configure 'bytes' column with specific width
+                            gb.configure_column("usage_bytes", hide=False, width=c.COL_WIDTHS['bytes'])
+                        case "created_at":
+                            # Configure 'created_at' column
+                            gb.configure_column("created_at", hide=False, width=c.COL_WIDTHS['datetime'])
+                        case "last_active_at":
+                            # Configure 'created_at' column
+                            gb.configure_column("last_active_at", hide=False, width=c.COL_WIDTHS['datetime'])
+                        case _:
+                            # Default configuration for any other column
+                            gb.configure_column(column, hide=False)
+        
+                grid_options = gb.build()
+                # Correctly reorder the columnDefs based on column_order
+                # First, create a mapping of field names to column definitions
+                field_to_colDef = {colDef['field']: colDef for colDef in grid_options['columnDefs']}
+                # Then, reorder columnDefs using the column_order list
+                grid_options['columnDefs'] = [field_to_colDef[column] for column in column_order if column in field_to_colDef]
+
+                grid_options['rowSelection'] = 'multiple'
+            return df, grid_options
+
+        df, grid_options = JanAIUtils.grid_frame('vector_stores', st.session_state.vector_stores if vector_stores is None else vector_stores, build)
+        return JanAIUtils.show_grid(df, grid_options, key=key)
+
     def create_vector_store_action():
         user_input = st.session_state.user_input
         if user_input:
-            st.session_state.janai.create_vector_store(name=user_input)
+            vector_store = st.session_state.janai.create_vector_store(name=user_input)
             st.success(f"Vector store '{user_input}' created successfully!")
-            JanAIUtils.refresh_vector_stores() 
+            JanAIUtils.apply_changes('vector_stores', upserted=[vector_store])
             
             
 
+    def display_all_projects(projects):
+        """
+        Displays the combined inventory of every configured project.
+
+        All projects are scanned concurrently through `JanAI.scan_projects` the first time the view is shown (and again on
+        "Rescan Projects"), and the results are shown as a per-project summary followed by one grid per kind of object with
+        a project column, so the clutter of the whole organisation is visible on a single screen.
+
+        Parameters:
+        - projects (dict): The project IDs keyed by their `PROJECT_*` environment variable name.
+        """
+        import pandas as pd
+        from st_aggrid import GridOptionsBuilder
+
+        rescan = st.button('Rescan Projects')
+        if rescan or st.session_state.get('all_projects_scanned') != projects:
+            with st.spinner(f"Scanning {len(projects)} projects..."):
+                st.session_state.all_projects = st.session_state.janai.scan_projects(projects)
+                st.session_state.all_projects_scanned = projects
+        scanned = st.session_state.all_projects
+
+        columns = {
+            'assistants': ['name', 'model', 'created_at'],
+            'vector_stores': ['name', 'usage_bytes', 'created_at', 'last_active_at'],
+            'files': ['filename', 'purpose', 'bytes', 'created_at'],
+        }
+        frames = {}
+        for kind, fields in columns.items():
+            rows = [
+                {'project': name[8:], 'id': obj.id, **{field: getattr(obj, field, None) for field in fields}}
+                for name, inventory in scanned.items() for obj in inventory[kind]
+            ]
+            frames[kind] = pd.DataFrame(rows, columns=['project', 'id', *fields])
+
+        summary = pd.DataFrame({
+            'assistants': frames['assistants'].groupby('project').size(),
+            'vector_stores': frames['vector_stores'].groupby('project').size(),
+            'files': frames['files'].groupby('project').size(),
+            'vector_store_bytes': frames['vector_stores'].groupby('project')['usage_bytes'].sum(),
+            'file_bytes': frames['files'].groupby('project')['bytes'].sum(),
+        }, index=[name[8:] for name in scanned]).fillna(0)
+        for column in ['vector_store_bytes', 'file_bytes']:
+            summary[column] = JanAIUtils.bytes_to_readable_array(summary[column])
+        st.write("### Summary")
+        st.dataframe(summary.astype({'assistants': int, 'vector_stores': int, 'files': int}))
+
+        for kind, tab in zip(columns, st.tabs(["Assistants", "Vector Stores", "Files"])):
+            df = frames[kind]
+            for column in ['created_at', 'last_active_at']:
+                if column in df:
+                    df[JanAIUtils.sort_column(column)] = df[column]
+                    df[column] = JanAIUtils.format_timestamps(df[column])
+            for column in ['usage_bytes', 'bytes']:
+                if column in df:
+                    df[JanAIUtils.sort_column(column)] = df[column]
+                    df[column] = JanAIUtils.bytes_to_readable_array(df[column])
+            with tab:
+                st.write(f"Number of {kind.replace('_', ' ')}: {len(df)}")
+                gb = GridOptionsBuilder.from_dataframe(df)
+                gb.configure_columns([column for column in df.columns if column.startswith(c.SORT_COLUMN_PREFIX)], hide=True)
+                JanAIUtils.show_grid(df, gb.build(), key=f"all_projects_{kind}")
+
     def display_assistant_form(assistant=None):
         # Initialize default values
         default_values = {
@@ -385,7 +1034,7 @@ class JanAIUtils:
 
         if st.session_state.creation_mode:
             if st.button("Create Assistant"):
-                st.session_state.janai.create_assistant(
+                created = st.session_state.janai.create_assistant(
                     model=model,
                     name=name,
                     description=description,
@@ -397,11 +1046,11 @@ class JanAIUtils:
                     response_format=response_format
                 )
                 st.session_state.creation_mode = False
-                JanAIUtils.refresh_assistants()
+                JanAIUtils.apply_changes('assistants', upserted=[created])
         else:
             if st.button("Update Assistant"):
                 tool_str = '';
-                st.session_state.janai.update_assistant(
+                updated = st.session_state.janai.update_assistant(
                     assistant_id=assistant.id,
                     model=model,
                     name=name,
@@ -413,35 +1062,28 @@ class JanAIUtils:
                     top_p=top_p,
                     response_format=response_format
                 )
-                JanAIUtils.refresh_assistants()
+                JanAIUtils.apply_changes('assistants', upserted=[updated])
             
     def display_assistants():
-        assistants_data = [{
-            'id': assistant.id,
-            'created_at': datetime.fromtimestamp(assistant.created_at, timezone.utc).strftime('%d/%m/%y %H:%M'),
-            'instructions': assistant.instructions,
-            'name': assistant.name
-        } for assistant in st.session_state.assistants]
-        
-        df = pd.DataFrame(assistants_data)
-        gb = GridOptionsBuilder.from_dataframe(df)
-        grid_options = gb.build()
-        grid_options['rowSelection'] = 'multiple'
+        from st_aggrid import GridOptionsBuilder
 
-        base_height_per_row = 30
-        header_height = 60
-        dynamic_height = min(max(len(df) * base_height_per_row + header_height, 100), 600)
+        def build(assistants):
+            with profiler.stage('dataframe'):
+                df = JanAIUtils.assistants_frame(assistants)
+            with profiler.stage('grid_options'):
+                gb = GridOptionsBuilder.from_dataframe(df)
+                gb.configure_columns([column for column in df.columns if column.startswith(c.SORT_COLUMN_PREFIX)], hide=True)
+                grid_options = gb.build()
+                grid_options['rowSelection'] = 'multiple'
+            return df, grid_options
+
+        df, grid_options = JanAIUtils.grid_frame('assistants', st.session_state.assistants, build)
 
         # Use the grid_key from session state to force rerendering when needed
-        grid_response = AgGrid(df, gridOptions=grid_options, height=dynamic_height, width='100%', update_mode='MODEL_CHANGED', fit_columns_on_grid_load=True, key=st.session_state.grid_key)
+        grid_response = JanAIUtils.show_grid(df, grid_options, key=st.session_state.grid_key)
         
-        # Check if 'selected_rows' is not None and then if any row is selected
-        if grid_response.get('selected_rows') is not None and len(grid_response['selected_rows']) > 0:
+        # Check if any row is selected
+        if len(grid_response['selected_rows']) > 0:
             st.session_state.creation_mode = False       
             st.session_state.creation_mode = False        
         return grid_response
-
-    def refresh_assistants():
-        st.session_state.assistants = st.session_state.janai.list_assistants(order='asc', limit=100)
-        st.session_state.update_grid = not st.session_state.update_grid
-        st.rerun()